@@ -0,0 +1,51 @@
+"""Cold-start cost of `import pyshovels`.
+
+Each run imports the package in a fresh interpreter and reports the median
+import time. The script fails if importing the package loads a heavy
+optional dependency, which should only be imported when it is used (e.g.,
+pandas when a DataFrame is built), or if the median exceeds the budget.
+
+Usage: python benchmarks/import_time.py [n_runs] [budget_ms]
+"""
+import statistics
+import subprocess
+import sys
+
+# modules that must not be loaded by `import pyshovels`
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "polars", "aiohttp", "orjson", "msgspec")
+
+PROBE = """
+import sys, time
+tic = time.perf_counter()
+import pyshovels
+elapsed = time.perf_counter() - tic
+print(elapsed)
+print(",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+def import_once() -> tuple:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(heavy=HEAVY_MODULES)],
+        check=True, capture_output=True, text=True,
+    ).stdout.splitlines()
+    return float(output[0]), [name for name in output[1].split(",") if name]
+
+if __name__ == "__main__":
+    n_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    budget_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 500
+    timings = []
+    loaded = set()
+    for _ in range(n_runs):
+        seconds, modules = import_once()
+        timings.append(seconds * 1000)
+        loaded.update(modules)
+    median = statistics.median(timings)
+    print(f"import pyshovels: median {median:.0f} ms, min {min(timings):.0f} ms over {n_runs} runs")
+    failed = False
+    if loaded:
+        print(f"FAIL: heavy modules loaded at import: {', '.join(sorted(loaded))}")
+        failed = True
+    if median > budget_ms:
+        print(f"FAIL: median import time above the {budget_ms:.0f} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,70 @@
+"""Per-page JSON parse time of the decoders supported by `get_json_decoder`.
+
+Pages mimic a `search_permits` response: 100 permits with nested addresses,
+tags and dates. `requests` is timed as `Response.json()` does it, decoding the
+bytes to `str` before parsing them with the standard library.
+
+Usage: python benchmarks/json_decoding.py [n_pages]
+"""
+import json
+import random
+import sys
+import timeit
+
+from pyshovels import JSON_DECODERS, get_json_decoder
+
+def make_page(n_items: int = 100, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    tags = ["solar", "hvac", "roofing", "electrical", "plumbing", "new_construction", "addition"]
+    items = []
+    for i in range(n_items):
+        year, month, day = 2024 + i % 2, rng.randint(1, 12), rng.randint(1, 28)
+        items.append({
+            "id": f"{rng.getrandbits(64):016x}",
+            "number": f"BLD{year}-{rng.randint(0, 99999):05d}",
+            "description": " ".join(rng.choice(tags) for _ in range(12)) + " per plans, no structural changes",
+            "jurisdiction": "Los Angeles",
+            "job_value": rng.choice([None, rng.randint(1000, 2_000_000)]),
+            "fees": round(rng.uniform(50, 5000), 2),
+            "type": "building",
+            "subtype": "residential",
+            "status": rng.choice(["active", "final", "inactive", "in_review"]),
+            "file_date": f"{year}-{month:02d}-{day:02d}",
+            "issue_date": f"{year}-{month:02d}-{day:02d}",
+            "final_date": None,
+            "total_duration": rng.randint(1, 400),
+            "approval_duration": rng.randint(1, 120),
+            "construction_duration": rng.choice([None, rng.randint(1, 300)]),
+            "inspection_pass_rate": rng.random(),
+            "property_type": rng.choice(["residential", "commercial"]),
+            "tags": rng.sample(tags, 3),
+            "contractor_id": f"{rng.getrandbits(64):016x}",
+            "address": {
+                "street_no": str(rng.randint(1, 9999)),
+                "street": "Sunset Blvd",
+                "city": "Los Angeles",
+                "county": "Los Angeles",
+                "zip_code": f"9{rng.randint(0, 9999):04d}",
+                "state": "CA",
+                "latlng": [rng.uniform(33, 35), rng.uniform(-119, -117)],
+            },
+        })
+    return json.dumps({"items": items, "size": n_items, "next_cursor": "abc123"}).encode()
+
+if __name__ == "__main__":
+    n_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    page = make_page()
+    print(f"page size: {len(page) / 1024:.1f} KiB, {n_pages} pages per run")
+
+    decoders = {"requests (str + json)": lambda body: json.loads(body.decode("utf-8"))}
+    for name in JSON_DECODERS:
+        try:
+            decoders[name] = get_json_decoder(name)
+        except ImportError:
+            print(f"{name}: not installed")
+
+    baseline = None
+    for name, decode in decoders.items():
+        seconds = min(timeit.repeat(lambda: decode(page), number=n_pages, repeat=5)) / n_pages
+        baseline = baseline or seconds
+        print(f"{name:>22}: {seconds * 1e6:8.1f} us/page  ({baseline / seconds:.1f}x)")
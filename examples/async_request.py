@@ -0,0 +1,18 @@
+from pyshovels import AsyncShovelsAPI, load_env
+import asyncio
+
+async def main():
+    async with AsyncShovelsAPI(max_concurrency=20) as shovels:
+        response = await shovels.search_permits(
+            geo_ids=["CA", "NY", "TX"],
+            params={
+                "permit_from": "2025-04-01",
+                "tag": "solar",
+            },
+            size=100,
+        )
+    print(response)
+
+if __name__ == "__main__":
+    load_env(env_path="./path/to/.env")
+    asyncio.run(main())
@@ -1,3 +1,19 @@
 from .client import *
+from .async_client import *
+from .cache import *
+from .checkpoint import *
+from .coalescing import *
+from .decoding import *
+from .frames import *
+from .harvest import *
+from .mirror import *
+from .paging import *
+from .pooling import *
+from .ratelimit import *
+from .records import *
+from .retry import *
+from .schemas import *
+from .sinks import *
+from .sync import *
 
 __version__ = "0.0.2"
\ No newline at end of file
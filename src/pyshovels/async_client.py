@@ -0,0 +1,1338 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import traceback
+import datetime
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Iterable, List, Sequence
+import os
+
+from .base import OUTPUTS, US_STATES, ClientBase, FanOutResults, PageChain, default_date_range
+from .cache import MISSING, DiskCache, MemoryCache
+from .checkpoint import CheckpointStore
+from .coalescing import AsyncSingleFlight
+from .frames import ColumnarBuilder, SeenIds
+from .mirror import LocalMirror
+from .paging import LAST_RESPONSE, AdaptivePageSize, IncompleteResultsError
+from .pooling import PoolConfig
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .sinks import ParquetSink, SinkManifest
+from .sync import SyncResult, SyncStore
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import polars as pl
+    import pyarrow as pa
+
+__all__ = [
+    "AsyncShovelsAPI",
+]
+
+def _encode_params(params: dict | None) -> List[tuple]:
+    """
+    Encodes request parameters the same way `requests` does.
+
+    `aiohttp` only accepts string and number values, so list values are
+    expanded into repeated keys and None values are dropped.
+
+    Parameters
+    ----------
+    params : dict, optional
+        The parameters to encode.
+
+    Returns
+    -------
+    List[tuple]
+        A list of (key, value) pairs.
+    """
+    encoded: List[tuple] = []
+    for key, value in (params or {}).items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        encoded.extend((key, str(v)) for v in values if v is not None)
+    return encoded
+
+class AsyncShovelsAPI(ClientBase):
+    """
+    Asynchronous Shovels API client.
+
+    Mirrors the methods of `ShovelsAPI` as coroutines. Methods that accept
+    several IDs fetch them concurrently, with at most `max_concurrency`
+    requests in flight at any time. Requires the optional `aiohttp` dependency.
+    Full documentation: https://docs.shovels.ai/api-reference/
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        logger: logging.Logger | None = None,
+        max_concurrency: int = 10,
+        rate_limit: float | RateLimiter | None = None,
+        retry: int | RetryPolicy | None = None,
+        timeout: float | None = None,
+        pool: PoolConfig | None = None,
+        cache: DiskCache | None = None,
+        release_check_interval: float = 3600,
+        reference_cache: MemoryCache | None = MISSING,
+        dtypes: bool = False,
+        flatten: bool | Iterable[str] = False,
+        json_decoder: str | Callable[[bytes], Any] | None = None,
+        output: str = "pandas",
+        mirror: LocalMirror | None = None,
+        coalesce: bool = False,
+        page_size: int | AdaptivePageSize | str | None = "adaptive",
+        **session_kwargs
+    ):
+        """Initialize the asynchronous Shovels API client.
+
+        The underlying `aiohttp.ClientSession` is created lazily on the first
+        request. Use the client as an async context manager, or call `close`,
+        to release its connections.
+
+        Parameters
+        ----------
+        api_key : str, optional
+            API key for the Shovels API. If not provided, it attempts to
+            retrieve it from the `SHOVELS_API_KEY` environment variable.
+        base_url : str, optional
+            Base URL for the Shovels API. If not provided, it attempts to
+            retrieve it from the `SHOVELS_API_URL` environment variable or
+            defaults to `AsyncShovelsAPI.BASE_URL`.
+        logger : logging.Logger, optional
+            A logger instance for logging messages. If not provided, a default
+            logger named after the module (`__name__`) will be used.
+        max_concurrency : int, optional
+            The maximum number of requests in flight at the same time.
+            Default is 10.
+        rate_limit : float | RateLimiter, optional
+            The maximum number of requests per second, or a `RateLimiter`
+            instance shared with other clients. Pauses requested by the server
+            are always honored. Default is None, which does not cap the
+            request rate.
+        retry : int | RetryPolicy, optional
+            The number of times a failed request is retried, or a
+            `RetryPolicy` to also configure the backoff delays. Connection
+            errors, timeouts and HTTP 429 and 5xx responses are retried.
+            A page that still fails makes the call raise
+            `IncompleteResultsError`, holding the results fetched for all the
+            IDs, once the other IDs were fetched.
+            Default is None, which uses `RetryPolicy()` (5 retries).
+        timeout : float, optional
+            The total number of seconds a request may take before it times out
+            and is retried. Default is None, which uses the `aiohttp` default.
+        pool : PoolConfig, optional
+            The HTTP connection pool configuration. Default is None, which
+            uses `PoolConfig()`, keeping up to `max_concurrency` connections
+            (at least 10) open per host.
+        cache : DiskCache, optional
+            A persistent cache for API responses. Cached responses are
+            dropped when Shovels publishes a new data release.
+            Default is None, which disables caching.
+        release_check_interval : float, optional
+            The number of seconds between checks of the data release date
+            when `cache` is set. The release date is requested from the API
+            at each check, regardless of `reference_cache`. Default is 3600.
+        reference_cache : MemoryCache, optional
+            An in-memory cache for the near-static reference lookups
+            (`get_tags`, `get_data_release_date` and `search_location`).
+            Default is `MemoryCache()`, which keeps up to 256 responses for an
+            hour. Pass None to disable it.
+        dtypes : bool, optional
+            Whether to convert the columns of the returned DataFrames to the
+            dtypes of `SCHEMAS` (categoricals, datetimes and nullable numbers)
+            instead of the dtypes inferred by pandas, which are mostly
+            `object`. Default is False.
+        flatten : bool | Iterable[str], optional
+            Whether to expand nested objects into one column per sub-field
+            (e.g., `address` into `address_street`, `address_city`, ...) as
+            pages are received. True flattens the fields in `NESTED_FIELDS`;
+            an iterable gives the field names to flatten. Default is False.
+        json_decoder : str | Callable[[bytes], Any], optional
+            The JSON library used to parse response bodies directly from
+            bytes ("orjson", "msgspec" or "json"), or a parsing function.
+            Default is None, which uses orjson or msgspec when installed and
+            the standard library otherwise.
+        output : str, optional
+            The default result format of the methods returning tabular data:
+            "pandas" (`pandas.DataFrame`), "arrow" (`pyarrow.Table`), "polars"
+            (`polars.DataFrame`), "records" (list of `Permit`, `Contractor` or
+            `Resident` records, or of dicts for other data) or "list" (list of
+            dicts). Arrow and Polars results are built from the columns
+            without going through pandas. Can be overridden per call.
+            Default is "pandas".
+        mirror : LocalMirror, optional
+            A local SQLite copy of the permits, contractors and residents,
+            loaded by passing `mirror.permits`, `mirror.contractors` or
+            `mirror.residents` as the `sink` of a search, and read with
+            `query`. Default is None.
+        coalesce : bool, optional
+            Whether identical requests (same URL and parameters) made
+            concurrently share a single network call and parsed response,
+            which is then shared by the callers (tasks of the same event
+            loop) and must not be modified. Default is False.
+        page_size : int | AdaptivePageSize | str | None, optional
+            The page size of paginated requests that do not set `size`:
+            "adaptive" uses an `AdaptivePageSize`, starting at the maximum of
+            100 items per page and backing off when pages get slow or large;
+            an `AdaptivePageSize` instance sets its thresholds; an integer
+            fixes the size; None uses the server default. The page sizes used
+            are logged with the statistics of each request.
+            Default is "adaptive".
+        **session_kwargs : dict, optional
+            Keyword arguments passed to the `aiohttp.ClientSession` constructor.
+
+        Raises
+        ------
+        AssertionError
+            If `max_concurrency` is lower than 1, `output` is invalid
+            or `page_size` is not between 1 and 100.
+        """
+        assert max_concurrency >= 1, "max_concurrency must be greater than or equal to 1"
+        self._configure(
+            base_url, logger or logging.getLogger(__name__), rate_limit, retry, timeout, cache,
+            release_check_interval, reference_cache, dtypes, flatten, json_decoder, output, mirror, page_size,
+        )
+        self.api_key: str | None = api_key or os.getenv('SHOVELS_API_KEY')
+        self.max_concurrency: int = max_concurrency
+        self.pool: PoolConfig = pool or PoolConfig()
+        self.single_flight: AsyncSingleFlight | None = AsyncSingleFlight() if coalesce else None
+        self._release_lock: asyncio.Lock | None = None
+        self._pool_counters: dict = {"requests": 0, "connections_created": 0, "connections_reused": 0}
+        self._session_kwargs: dict = session_kwargs
+        self._session = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    async def __aenter__(self) -> "AsyncShovelsAPI":
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_session(self):
+        """Return the HTTP session, creating it on first use."""
+        import aiohttp
+        if self._session is None or self._session.closed:
+            session_kwargs = {**self._session_kwargs}
+            headers = {**session_kwargs.pop("headers", {}), 'X-API-Key': self.api_key or ''}
+            maxsize = self.pool.maxsize(self.max_concurrency)
+            connector = aiohttp.TCPConnector(
+                limit=maxsize * (self.pool.pool_connections or 1),
+                limit_per_host=maxsize,
+                force_close=not self.pool.keep_alive,
+                keepalive_timeout=self.pool.keepalive_timeout if self.pool.keep_alive else None,
+            )
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_request_start.append(self._count("requests"))
+            trace_config.on_connection_create_end.append(self._count("connections_created"))
+            trace_config.on_connection_reuseconn.append(self._count("connections_reused"))
+            self._session = aiohttp.ClientSession(
+                headers=headers,
+                connector=session_kwargs.pop("connector", connector),
+                trace_configs=[trace_config, *session_kwargs.pop("trace_configs", [])],
+                **session_kwargs
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    def _count(self, counter: str):
+        """Return a trace callback incrementing one of the pool counters."""
+        async def callback(session, context, params) -> None:
+            self._pool_counters[counter] += 1
+        return callback
+
+    def pool_stats(self) -> dict:
+        """Return usage statistics of the HTTP connection pool.
+
+        Returns
+        -------
+        dict
+            A dictionary with the number of `requests` sent, of
+            `connections_created` to send them, of `connections_reused`
+            (requests sent over an existing connection) and of
+            `requests_coalesced` into an identical request in flight.
+        """
+        stats = {**self._pool_counters}
+        stats["requests_coalesced"] = self.single_flight.coalesced if self.single_flight is not None else 0
+        return stats
+
+    async def _refresh_cache_release(self) -> None:
+        """Clear the cache if a new data release was published since the last check."""
+        if self._release_lock is None:
+            self._release_lock = asyncio.Lock()
+        async with self._release_lock:
+            if time.time() - self._release_checked_at < self.release_check_interval:
+                return
+            self._release_checked_at = time.time()
+            url = f"{self.base_url}/meta/release"
+            try:
+                # sent past the reference cache, which may still hold the previous release
+                content = await self._send_request(url)
+                release = datetime.date.fromisoformat(content["released_at"])
+            except Exception:
+                self.logger.warning("Could not fetch the data release date, keeping cached responses")
+                return
+            if self.reference_cache is not None:
+                self.reference_cache.set(DiskCache.make_key(url), content)
+            if await asyncio.to_thread(self.cache.set_release, release.isoformat()):
+                self.logger.info(f"Data release {release}: cleared the response cache")
+
+    async def _make_request(
+        self,
+        url: str,
+        params: dict | None = None,
+        **kwargs
+    ) -> dict | None:
+        """Make an HTTP GET request to the Shovels API.
+
+        If the client has a `cache`, cached responses are returned without
+        a network call. With `coalesce`, a request identical to one in
+        flight (without extra keyword arguments) waits for its response.
+        Requests wait for the client's rate limiter. Transient failures
+        (connection errors, timeouts, HTTP 429 and 5xx) are retried with the
+        same parameters according to the client's `RetryPolicy`, after the
+        delay requested by the server or an exponential backoff delay.
+
+        Parameters
+        ----------
+        url : str
+            The URL to make the request to.
+        params : dict, optional
+            The parameters to pass to the request. Default is None.
+        **kwargs : dict, optional
+            Additional keyword arguments passed to `aiohttp.ClientSession.get`.
+
+        Returns
+        -------
+        dict | None
+            The JSON response from the Shovels API as a dictionary.
+            Returns None if the request fails.
+
+        Raises
+        ------
+        aiohttp.ClientError | asyncio.TimeoutError
+            If the request still raises a connection error or a timeout
+            after the last retry.
+        """
+        if self.single_flight is not None and not kwargs:
+            return await self.single_flight.do(DiskCache.make_key(url, params), self._send_request, url, params)
+        return await self._send_request(url, params, **kwargs)
+
+    async def _send_request(
+        self,
+        url: str,
+        params: dict | None = None,
+        **kwargs
+    ) -> dict | None:
+        """Make an HTTP GET request, without coalescing. See `_make_request`."""
+        import aiohttp
+        cache_key = None
+        if self.cache is not None and url != f"{self.base_url}/meta/release":
+            await self._refresh_cache_release()
+            cache_key = DiskCache.make_key(url, params)
+            # the SQLite cache is read and written from worker threads, off the event loop
+            body = await asyncio.to_thread(self.cache.get, cache_key)
+            if body is not None:
+                self.logger.debug(f"Cache hit for {url}")
+                return self.decode_json(body)
+        session = await self._get_session()
+        if self.timeout is not None:
+            kwargs.setdefault("timeout", aiohttp.ClientTimeout(total=self.timeout))
+        retryable_exceptions = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+        max_retries = self.retry.max_retries
+        for attempt in range(max_retries + 1):
+            delay = None
+            # a concurrency slot is only held while a request is in flight,
+            # not while waiting to retry it
+            async with self._semaphore:
+                await self.rate_limiter.acquire_async()
+                try:
+                    tic = time.perf_counter()
+                    async with session.get(url, params=_encode_params(params), **kwargs) as response:
+                        paused = self.rate_limiter.update_from_headers(response.headers)
+                        status = response.status
+                        if status == 200:
+                            body = await response.read()
+                            LAST_RESPONSE.set((time.perf_counter() - tic, len(body)))
+                            break
+                        text = await response.text()
+                except retryable_exceptions as e:
+                    if attempt == max_retries:
+                        raise
+                    delay = self.retry.backoff(attempt)
+                    self.logger.warning(f"Error fetching {url}: {e!r}, retrying in {delay:.1f}s ({attempt+1}/{max_retries})")
+            if delay is not None:
+                await asyncio.sleep(delay)
+                continue
+            if not self.retry.is_retryable(status) or attempt == max_retries:
+                self.logger.error(f"Error fetching {url}: HTTP Error {status}: {text}")
+                return
+            if paused is None:
+                delay = self.retry.backoff(attempt)
+                if status == 429:
+                    # hold back every request sharing the limiter, not just this one
+                    self.rate_limiter.pause(delay)
+                else:
+                    await asyncio.sleep(delay)
+            else:
+                delay = paused
+            self.logger.warning(f"Error fetching {url}: HTTP Error {status}, retrying in {delay:.1f}s ({attempt+1}/{max_retries})")
+        result = self.decode_json(body)
+        if cache_key is not None:
+            await asyncio.to_thread(self.cache.set, cache_key, body)
+        self.logger.debug(f"Number of items returned: {result.get('size', 0)}")
+        return result
+
+    async def _make_reference_request(
+        self,
+        url: str,
+        params: dict | None = None
+    ) -> dict | None:
+        """Make a request whose response is memoized in `reference_cache`.
+
+        Failed requests are not memoized. The returned dictionary is a copy
+        of the memoized response, which can be modified.
+
+        Parameters
+        ----------
+        url : str
+            The URL to make the request to.
+        params : dict, optional
+            The parameters to pass to the request. Default is None.
+
+        Returns
+        -------
+        dict | None
+            The JSON response from the Shovels API as a dictionary.
+            Returns None if the request fails.
+        """
+        if self.reference_cache is None:
+            return await self._make_request(url, params)
+        key = DiskCache.make_key(url, params)
+        content = self.reference_cache.get(key)
+        if content is MISSING:
+            content = await self._make_request(url, params)
+            if content is not None:
+                self.reference_cache.set(key, content)
+        # callers get their own copy, so that modifying it does not alter the cache
+        return copy.deepcopy(content)
+
+    async def _iter_pages(
+        self,
+        url: str,
+        params: dict | None = None,
+        page: int | None = None,
+        size: int | None = None,
+        cursor: str | None = None,
+        max_iterations: int | None = None,
+        **kwargs
+    ) -> AsyncIterator[dict]:
+        """Yield the pages of a paginated request to the Shovels API.
+
+        Pages of a single request are fetched sequentially, since each page
+        depends on the cursor or page number returned by the previous one.
+        See `ShovelsAPI._iter_pages` for parameter details.
+
+        Yields
+        ------
+        dict
+            The JSON response for each page, with the page items under `items`.
+
+        Raises
+        ------
+        AssertionError
+            If `page` is not greater than or equal to 1 (if provided).
+        AssertionError
+            If `size` is not between 1 and 100 (if provided).
+        """
+        chain = self._page_chain(params, page, size, cursor, max_iterations)
+        async for content in self._iter_chain(url, chain, **kwargs):
+            yield content
+
+    async def _iter_chain(self, url: str, chain: PageChain, **kwargs) -> AsyncIterator[dict]:
+        """Yield the pages of the paginated request tracked by `chain`. See `_iter_pages`."""
+        try:
+            while True:
+                position = chain.position
+                params = chain.next_params()
+                try:
+                    content = await self._make_request(url, params, **kwargs)
+                except Exception as e:
+                    stack_trace = traceback.format_exc()
+                    self.logger.error(f"Error fetching {position}")
+                    self.logger.error(stack_trace)
+                    raise IncompleteResultsError(f"Error fetching {url} at {position}: results are incomplete", {url: params}) from e
+                if content is None:  # request failed after all retries
+                    self.logger.error(f"Stopping at {position}: results are incomplete")
+                    raise IncompleteResultsError(f"Could not fetch {url} at {position}: results are incomplete", {url: params})
+                has_next = chain.advance(content)
+                yield content
+                if not has_next:
+                    break
+        finally:
+            chain.log_stats()
+
+    async def _make_paginated_request(
+        self,
+        url: str,
+        params: dict | None = None,
+        page: int | None = None,
+        size: int | None = None,
+        cursor: str | None = None,
+        max_iterations: int | None = None,
+        **kwargs
+    ) -> List[dict]:
+        """Make a paginated request to the Shovels API.
+
+        See `ShovelsAPI._iter_pages` for parameter details.
+
+        Returns
+        -------
+        List[dict]
+            A list of all items fetched from the Shovels API across pages.
+        """
+        results: List[dict] = []
+        try:
+            async for content in self._iter_pages(url, params, page, size, cursor, max_iterations, **kwargs):
+                results.extend(content.get("items", []))
+        except IncompleteResultsError as e:
+            e.result = results
+            raise
+        return results
+
+    async def _collect_paginated(
+        self,
+        url: str,
+        params: dict | None = None,
+        page: int | None = None,
+        size: int | None = None,
+        cursor: str | None = None,
+        max_iterations: int | None = None,
+        sink: ParquetSink | None = None,
+        partition: dict | None = None,
+        seen: SeenIds | None = None,
+        checkpoint: CheckpointStore | None = None,
+        resume: bool = False,
+        **kwargs
+    ) -> ColumnarBuilder:
+        """Make a paginated request, accumulating the items column by column.
+
+        If `sink` is given, each page is written to it from a worker thread as
+        soon as it is received instead, and the returned builder is empty.
+        With `seen`, items already returned for another ID of the same
+        call are dropped as pages are received.
+        With `checkpoint`, every page is recorded with the position of the
+        next one. If `resume` is True, the checkpointed pages are restored
+        and the request continues from the next page, or is skipped if it
+        had completed; otherwise its checkpoint is reset.
+
+        See `ShovelsAPI._iter_pages` for parameter details.
+
+        Returns
+        -------
+        ColumnarBuilder
+            The items fetched from the Shovels API across pages.
+        """
+        collector = self._page_collector(url, params, sink, partition, seen, checkpoint, resume)
+        state = collector.restore(resume)
+        if state is not None:
+            if state["done"]:
+                return collector.builder
+            cursor = state["cursor"] or cursor
+            page = state["page"] or page
+            # page numbers are offsets in units of the page size of the interrupted run
+            if state["page"]:
+                size = state["size"] or size
+        chain = self._page_chain(params, page, size, cursor, max_iterations)
+        try:
+            async for content in self._iter_chain(url, chain, **kwargs):
+                kept = collector.add(content)
+                files = None
+                if sink is not None:
+                    files = await asyncio.to_thread(sink.write_files, kept, partition or {})
+                if checkpoint is not None:
+                    await asyncio.to_thread(collector.save, content, chain.size, files)
+        except IncompleteResultsError as e:
+            e.result = collector.builder
+            raise
+        return collector.builder
+
+    async def _fan_out(
+        self,
+        ids: List[str],
+        fetch: Callable[[str], Awaitable[Any]],
+        description: str
+    ) -> list:
+        """Run `fetch` concurrently for every ID and collect the results.
+
+        Results are returned in the order of `ids`. A failure for one ID is
+        logged without affecting the others.
+
+        Parameters
+        ----------
+        ids : List[str]
+            The IDs to fetch.
+        fetch : Callable[[str], Awaitable[Any]]
+            A coroutine function returning the result for a single ID
+            (e.g., a `ColumnarBuilder` or a list of items).
+        description : str
+            A description of the fetched data used in log messages
+            (e.g., "permits for geo_id").
+
+        Returns
+        -------
+        FanOutResults
+            The result of `fetch` for each ID, with the IDs whose fetch
+            failed in `failed`. The result of a failed ID is the partial
+            result of its `IncompleteResultsError`, or None.
+        """
+        failed = {}
+
+        async def _fetch_one(i: int, _id: str):
+            self.logger.info(f"Fetching {description}: {_id} ({i+1}/{len(ids)})")
+            try:
+                return await fetch(_id)
+            except Exception as e:
+                stack_trace = traceback.format_exc()
+                self.logger.error(f"Error fetching {description}: {_id}")
+                self.logger.error(stack_trace)
+                return self._fetch_failed(failed, _id, e)
+
+        self.logger.info('--------------------------------')
+        self.logger.info(f"Fetching {description} for {len(ids)} IDs: {ids}")
+        chunks = await asyncio.gather(*(_fetch_one(i, _id) for i, _id in enumerate(ids)))
+        self.logger.info('--------------------------------')
+        return FanOutResults(chunks, failed)
+
+    async def _collect_by_ids(
+        self,
+        url: str,
+        ids: Iterable[str] | str,
+        description: str,
+        **kwargs
+    ) -> tuple:
+        """Fetch items by ID from a by-ID endpoint, in chunks of `MAX_IDS_PER_REQUEST`.
+
+        Chunks are fetched concurrently. See `ShovelsAPI._collect_by_ids` for
+        parameter details.
+
+        Returns
+        -------
+        ColumnarBuilder
+            The items fetched from the Shovels API, in the order of `ids`.
+        """
+        unique_ids, chunks = self._id_chunks(ids)
+
+        async def fetch(chunk: str) -> List[dict]:
+            return await self._make_paginated_request(url, {"id": chunks[chunk]}, **kwargs)
+
+        results = await self._fan_out(list(chunks), fetch, description)
+        return self._order_by_ids(unique_ids, results), results
+
+    # region: location & residents
+    async def search_location(self, query: str, level: str) -> List[dict]:
+        """Fetch location basic info for a given location query.
+
+        See `ShovelsAPI.search_location` for parameter details.
+
+        Returns
+        -------
+        List[dict]
+            A list of locations matching the query. Returns an empty list if
+            no matches are found or an error occurs.
+        """
+        url = f"{self.base_url}/{level}/search"
+        params = {"q": query}
+        content = await self._make_reference_request(url, params)
+        if content is None:
+            return []
+        return content.get("items", [])
+
+    async def get_location_monthly_metrics(
+        self,
+        geo_ids: Iterable[str] | str,
+        level: str,
+        params: dict,
+        sink: ParquetSink | None = None,
+        output: str | None = None,
+        **kwargs
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list | SinkManifest:
+        """Get monthly metrics for specific locations by their Geo IDs.
+
+        See `ShovelsAPI.get_location_monthly_metrics` for parameter details.
+
+        Returns
+        -------
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list | SinkManifest
+            A DataFrame containing the monthly metrics for the specified
+            locations.
+            In the format given by `output`.
+            If `sink` is given, the manifest of the files written instead.
+
+        Raises
+        ------
+        AssertionError
+            If `property_type` or `tag` is not provided in the `params` argument.
+        """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        if sink is not None:
+            sink.bind("metrics")
+        if isinstance(geo_ids, str):
+            geo_ids = [geo_ids]
+        _params = {**params} if params else {}
+        _params = default_date_range(_params, "metric_from", "metric_to")
+        assert "property_type" in _params, "property_type is required for monthly metrics"
+        assert "tag" in _params, "tag is required for monthly metrics"
+
+        async def fetch(geo_id: str) -> ColumnarBuilder:
+            url = f"{self.base_url}/{level}/{geo_id}/metrics/monthly"
+            return await self._collect_paginated(url, _params, sink=sink, partition={"geo_id": geo_id}, **kwargs)
+
+        builders = await self._fan_out(list(geo_ids), fetch, "monthly metrics for geo ID")
+        if sink is not None:
+            return self._complete(builders, sink.manifest())
+        return self._complete(builders, self._build(ColumnarBuilder.concat(builders), "metrics", output))
+
+    async def get_location_current_metrics(
+        self,
+        geo_ids: Iterable[str] | str,
+        level: str,
+        params: dict,
+        sink: ParquetSink | None = None,
+        output: str | None = None,
+        **kwargs
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list | SinkManifest:
+        """Get current metrics for specific locations by their Geo IDs.
+
+        See `ShovelsAPI.get_location_current_metrics` for parameter details.
+
+        Returns
+        -------
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list | SinkManifest
+            A DataFrame containing the current metrics for the specified
+            locations.
+            In the format given by `output`.
+            If `sink` is given, the manifest of the files written instead.
+
+        Raises
+        ------
+        AssertionError
+            If `property_type` or `tag` is not provided in the `params` argument.
+        """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        if sink is not None:
+            sink.bind("metrics")
+        if isinstance(geo_ids, str):
+            geo_ids = [geo_ids]
+        _params = {**params} if params else {}
+        assert "property_type" in _params, "property_type is required for current metrics"
+        assert "tag" in _params, "tag is required for current metrics"
+
+        async def fetch(geo_id: str) -> ColumnarBuilder:
+            url = f"{self.base_url}/{level}/{geo_id}/metrics/current"
+            return await self._collect_paginated(url, _params, sink=sink, partition={"geo_id": geo_id}, **kwargs)
+
+        builders = await self._fan_out(list(geo_ids), fetch, "current metrics for geo ID")
+        if sink is not None:
+            return self._complete(builders, sink.manifest())
+        return self._complete(builders, self._build(ColumnarBuilder.concat(builders), "metrics", output))
+
+    async def get_location_details(
+        self,
+        geo_ids: Iterable[str] | str,
+        level: str,
+        **kwargs
+    ) -> List[dict]:
+        """Get details for specific locations by their Geo IDs.
+
+        See `ShovelsAPI.get_location_details` for parameter details.
+
+        Returns
+        -------
+        List[dict]
+            A list of dictionaries containing the location details.
+        """
+        assert level != 'addresses', 'For addresses, use the get_residents method.'
+        if isinstance(geo_ids, str):
+            geo_ids = [geo_ids]
+        url = f"{self.base_url}/{level}"
+
+        async def fetch(geo_id: str) -> List[dict]:
+            return await self._make_paginated_request(url, {"geo_id": geo_id}, **kwargs)
+
+        chunks = await self._fan_out(list(geo_ids), fetch, "details for geo ID")
+        return self._complete(chunks, [item for chunk in chunks if chunk for item in chunk])
+
+    async def get_residents(
+        self,
+        geo_ids: Iterable[str] | str,
+        sink: ParquetSink | None = None,
+        checkpoint: CheckpointStore | None = None,
+        resume: bool = False,
+        output: str | None = None,
+        **kwargs
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list | SinkManifest:
+        """Fetch residents for given geographical IDs (typically address IDs).
+
+        See `ShovelsAPI.get_residents` for parameter details.
+
+        Returns
+        -------
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list | SinkManifest
+            A DataFrame containing resident data for all specified geo_ids.
+            In the format given by `output`.
+            If `sink` is given, the manifest of the files written instead.
+        """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        if sink is not None:
+            sink.bind("residents")
+        self._resolve_call(f"{self.base_url}/addresses/{{geo_id}}/residents", None, {}, checkpoint, resume)
+        if isinstance(geo_ids, str):
+            geo_ids = [geo_ids]
+
+        async def fetch(geo_id: str) -> ColumnarBuilder:
+            url = f"{self.base_url}/addresses/{geo_id}/residents"
+            return await self._collect_paginated(url, None, sink=sink, checkpoint=checkpoint, resume=resume, partition={"geo_id": geo_id}, **kwargs)
+
+        builders = await self._fan_out(list(geo_ids), fetch, "residents for geo_id")
+        if sink is not None:
+            return self._complete(builders, sink.manifest())
+        return self._complete(builders, self._build(ColumnarBuilder.concat(builders), "residents", output))
+    # endregion: location & residents
+
+    # region: contractor
+    async def search_contractors(
+        self,
+        geo_ids: Iterable[str] | str | None = None,
+        params: dict | None = None,
+        dedupe: bool | str = False,
+        sink: ParquetSink | None = None,
+        checkpoint: CheckpointStore | None = None,
+        resume: bool = False,
+        output: str | None = None,
+        **kwargs
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list | SinkManifest:
+        """Search for contractors based on specified criteria.
+
+        See `ShovelsAPI.search_contractors` for parameter details.
+
+        Returns
+        -------
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list | SinkManifest
+            A DataFrame containing the search results with contractor data.
+            In the format given by `output`.
+            If `sink` is given, the manifest of the files written instead.
+        """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        if sink is not None:
+            sink.bind("contractors")
+        assert not (dedupe == "merge" and sink is not None), "dedupe='merge' cannot be used with a sink"
+        seen = self._seen_ids(dedupe, "geo_id")
+        url = f"{self.base_url}/contractors/search"
+        if geo_ids is None:
+            geo_ids = US_STATES
+        if isinstance(geo_ids, str):
+            geo_ids = [geo_ids]
+        _params = {**params} if params else {}
+        _params = default_date_range(_params, "permit_from", "permit_to")
+        _params = self._resolve_call(url, params, _params, checkpoint, resume)
+
+        async def fetch(geo_id: str) -> ColumnarBuilder:
+            return await self._collect_paginated(url, {**_params, "geo_id": geo_id}, sink=sink, checkpoint=checkpoint, resume=resume, partition={"geo_id": geo_id}, seen=seen, **kwargs)
+
+        builders = await self._fan_out(list(geo_ids), fetch, "contractors for geo_id")
+        if seen is not None:
+            self.logger.info(f"Dropped {seen.dropped} duplicate items")
+        if sink is not None:
+            return self._complete(builders, sink.manifest())
+        return self._complete(builders, self._build(ColumnarBuilder.concat(builders), "contractors", output))
+
+    async def get_contractors_by_id(
+        self,
+        contractor_ids: Iterable[str] | str,
+        output: str | None = None,
+        **kwargs
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list:
+        """Retrieve detailed information for specific contractors by their IDs.
+
+        See `ShovelsAPI.get_contractors_by_id` for parameter details.
+
+        Returns
+        -------
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list
+            A DataFrame containing the data for the specified contractor IDs,
+            in the order of `contractor_ids`.
+            In the format given by `output`.
+        """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        url = f"{self.base_url}/contractors"
+        builder, results = await self._collect_by_ids(url, contractor_ids, "contractors by ID", **kwargs)
+        return self._complete(results, self._build(builder, "contractors", output))
+
+    async def get_permits_by_contractor_id(
+        self,
+        contractor_ids: Iterable[str] | str,
+        dedupe: bool | str = False,
+        sink: ParquetSink | None = None,
+        checkpoint: CheckpointStore | None = None,
+        resume: bool = False,
+        output: str | None = None,
+        **kwargs
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list | SinkManifest:
+        """Fetch permits associated with given contractor IDs.
+
+        See `ShovelsAPI.get_permits_by_contractor_id` for parameter details.
+
+        Returns
+        -------
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list | SinkManifest
+            A DataFrame containing permit data for all specified contractor IDs.
+            In the format given by `output`.
+            If `sink` is given, the manifest of the files written instead.
+        """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        if sink is not None:
+            sink.bind("permits")
+        assert not (dedupe == "merge" and sink is not None), "dedupe='merge' cannot be used with a sink"
+        seen = self._seen_ids(dedupe, "contractor_id")
+        self._resolve_call(f"{self.base_url}/contractors/{{contractor_id}}/permits", None, {}, checkpoint, resume)
+        if isinstance(contractor_ids, str):
+            contractor_ids = [contractor_ids]
+
+        async def fetch(cid: str) -> ColumnarBuilder:
+            url = f"{self.base_url}/contractors/{cid}/permits"
+            return await self._collect_paginated(url, None, sink=sink, checkpoint=checkpoint, resume=resume, partition={"contractor_id": cid}, seen=seen, **kwargs)
+
+        builders = await self._fan_out(list(contractor_ids), fetch, "permits for contractor ID")
+        if seen is not None:
+            self.logger.info(f"Dropped {seen.dropped} duplicate items")
+        if sink is not None:
+            return self._complete(builders, sink.manifest())
+        return self._complete(builders, self._build(ColumnarBuilder.concat(builders), "permits", output))
+
+    async def get_filtered_metrics_by_contractor_id(
+        self,
+        contractor_ids: List[str] | str,
+        params: dict,
+        sink: ParquetSink | None = None,
+        output: str | None = None,
+        **kwargs
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list | SinkManifest:
+        """Get monthly filtered metrics for specific contractors by their IDs.
+
+        See `ShovelsAPI.get_filtered_metrics_by_contractor_id` for parameter details.
+
+        Returns
+        -------
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list | SinkManifest
+            A DataFrame containing the filtered metrics for the specified
+            contractor IDs.
+            In the format given by `output`.
+            If `sink` is given, the manifest of the files written instead.
+
+        Raises
+        ------
+        AssertionError
+            If `property_type` or `tag` is not provided in the `params` argument.
+        """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        if sink is not None:
+            sink.bind("metrics")
+        if isinstance(contractor_ids, str):
+            contractor_ids = [contractor_ids]
+        _params = {**params} if params else {}
+        _params = default_date_range(_params, "metric_from", "metric_to")
+        assert "property_type" in _params, "property_type is required for filtered metrics"
+        assert "tag" in _params, "tag is required for filtered metrics"
+
+        async def fetch(contractor_id: str) -> ColumnarBuilder:
+            url = f"{self.base_url}/contractors/{contractor_id}/metrics"
+            return await self._collect_paginated(url, _params, sink=sink, partition={"contractor_id": contractor_id}, **kwargs)
+
+        builders = await self._fan_out(list(contractor_ids), fetch, "metrics for contractor ID")
+        if sink is not None:
+            return self._complete(builders, sink.manifest())
+        return self._complete(builders, self._build(ColumnarBuilder.concat(builders), "metrics", output))
+
+    async def list_contractor_employees(
+        self,
+        contractor_ids: List[str] | str,
+        sink: ParquetSink | None = None,
+        output: str | None = None,
+        **kwargs
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list | SinkManifest:
+        """List employees for specific contractors by their IDs.
+
+        See `ShovelsAPI.list_contractor_employees` for parameter details.
+
+        Returns
+        -------
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list | SinkManifest
+            A DataFrame containing employee data for the specified
+            contractor IDs.
+            In the format given by `output`.
+            If `sink` is given, the manifest of the files written instead.
+        """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        if sink is not None:
+            sink.bind("employees")
+        if isinstance(contractor_ids, str):
+            contractor_ids = [contractor_ids]
+
+        async def fetch(contractor_id: str) -> ColumnarBuilder:
+            url = f"{self.base_url}/contractors/{contractor_id}/employees"
+            return await self._collect_paginated(url, None, sink=sink, partition={"contractor_id": contractor_id}, **kwargs)
+
+        builders = await self._fan_out(list(contractor_ids), fetch, "employees for contractor ID")
+        if sink is not None:
+            return self._complete(builders, sink.manifest())
+        return self._complete(builders, self._build(ColumnarBuilder.concat(builders), "employees", output))
+    # endregion: contractor
+
+    # region: permit
+    async def search_permits(
+        self,
+        geo_ids: Iterable[str] | str | None = None,
+        params: dict | None = None,
+        split_windows: str | None = None,
+        dedupe: bool | str = False,
+        sink: ParquetSink | None = None,
+        checkpoint: CheckpointStore | None = None,
+        resume: bool = False,
+        output: str | None = None,
+        **kwargs
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list | SinkManifest:
+        """Search for permits based on specified criteria.
+
+        See `ShovelsAPI.search_permits` for parameter details. With
+        `split_windows`, the windows are fetched concurrently, up to
+        `max_concurrency` requests at a time, and "equal" splits the date
+        range into 4 windows of equal length per `max_concurrency` slot.
+
+        Returns
+        -------
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list | SinkManifest
+            A DataFrame containing the search results with permit data.
+            In the format given by `output`.
+            If `sink` is given, the manifest of the files written instead.
+        """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        if sink is not None:
+            sink.bind("permits")
+        assert not (dedupe == "merge" and sink is not None), "dedupe='merge' cannot be used with a sink"
+        seen = self._seen_ids(dedupe, "geo_id")
+        url = f"{self.base_url}/permits/search"
+        if geo_ids is None:
+            geo_ids = US_STATES
+        if isinstance(geo_ids, str):
+            geo_ids = [geo_ids]
+        _params = {**params} if params else {}
+        _params = default_date_range(_params, "permit_from", "permit_to")
+        _params = self._resolve_call(url, params, _params, checkpoint, resume)
+        if split_windows is not None:
+            tasks = self._window_tasks(list(geo_ids), _params, split_windows, self.max_concurrency * 4)
+
+            async def fetch_window(task: str) -> ColumnarBuilder:
+                geo_id, window_params = tasks[task]
+                return await self._collect_paginated(url, window_params, sink=sink, checkpoint=checkpoint, resume=resume, partition={"geo_id": geo_id}, seen=seen, **kwargs)
+
+            builders = await self._fan_out(list(tasks), fetch_window, "permits for geo_id and window")
+            if seen is not None:
+                self.logger.info(f"Dropped {seen.dropped} duplicate items")
+            if sink is not None:
+                return self._complete(builders, sink.manifest())
+            return self._complete(builders, self._build(self._stitch_windows(tasks, builders), "permits", output))
+
+        async def fetch(geo_id: str) -> ColumnarBuilder:
+            return await self._collect_paginated(url, {**_params, "geo_id": geo_id}, sink=sink, checkpoint=checkpoint, resume=resume, partition={"geo_id": geo_id}, seen=seen, **kwargs)
+
+        builders = await self._fan_out(list(geo_ids), fetch, "permits for geo_id")
+        if seen is not None:
+            self.logger.info(f"Dropped {seen.dropped} duplicate items")
+        if sink is not None:
+            return self._complete(builders, sink.manifest())
+        return self._complete(builders, self._build(ColumnarBuilder.concat(builders), "permits", output))
+
+    async def get_permits_by_id(
+        self,
+        permit_ids: Iterable[str] | str,
+        output: str | None = None,
+        **kwargs
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list:
+        """Retrieve detailed information for specific permits by their IDs.
+
+        See `ShovelsAPI.get_permits_by_id` for parameter details.
+
+        Returns
+        -------
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list
+            A DataFrame containing the data for the specified permit IDs,
+            in the order of `permit_ids`.
+            In the format given by `output`.
+        """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        url = f"{self.base_url}/permits"
+        builder, results = await self._collect_by_ids(url, permit_ids, "permits by ID", **kwargs)
+        return self._complete(results, self._build(builder, "permits", output))
+
+    async def sync_permits(
+        self,
+        store: SyncStore,
+        geo_ids: Iterable[str] | str | None = None,
+        params: dict | None = None,
+        lookback_days: int = 7,
+        **kwargs
+    ) -> SyncResult:
+        """Incrementally sync permits into a local store.
+
+        See `ShovelsAPI.sync_permits` for parameter details. Geo IDs are
+        synced concurrently and pages are written to `store` from a worker
+        thread.
+
+        Returns
+        -------
+        SyncResult
+            The windows queried, the number of permits fetched, the new
+            watermarks and the geo IDs whose sync failed.
+        """
+        url = f"{self.base_url}/permits/search"
+        if geo_ids is None:
+            geo_ids = US_STATES
+        if isinstance(geo_ids, str):
+            geo_ids = [geo_ids]
+        geo_ids = list(geo_ids)
+        _params = {**params} if params else {}
+        _params = default_date_range(_params, "permit_from", "permit_to")
+        result = SyncResult()
+
+        async def sync(geo_id: str) -> bool:
+            state = self._start_sync(store, geo_id, _params, lookback_days, result)
+            async for content in self._iter_pages(url, state["params"], **kwargs):
+                latest = await asyncio.to_thread(store.upsert, geo_id, content.get("items", []))
+                self._sync_page(state, content, latest)
+            return self._finish_sync(store, geo_id, _params, state, result)
+
+        synced = await self._fan_out(geo_ids, sync, "permit sync for geo_id")
+        return self._sync_summary(geo_ids, synced, result)
+    # endregion: permit
+
+    # region: streaming
+    async def _iter_fan_out(
+        self,
+        ids: List[str],
+        pages: Callable[[str], AsyncIterator[dict]],
+        description: str
+    ) -> AsyncIterator[dict]:
+        """Yield the pages returned by `pages` for every ID, one ID at a time.
+
+        A failure for one ID is logged without affecting the others, and
+        `IncompleteResultsError` is raised once all the IDs were streamed.
+        See `ShovelsAPI._iter_fan_out` for parameter details.
+        """
+        self.logger.info('--------------------------------')
+        self.logger.info(f"Streaming {description} for {len(ids)} IDs: {ids}")
+        failed = {}
+        for i, _id in enumerate(ids):
+            self.logger.info(f"Fetching {description}: {_id} ({i+1}/{len(ids)})")
+            try:
+                async for content in pages(_id):
+                    yield content
+            except Exception as e:
+                stack_trace = traceback.format_exc()
+                self.logger.error(f"Error fetching {description}: {_id}")
+                self.logger.error(stack_trace)
+                self._fetch_failed(failed, _id, e)
+                continue
+        self.logger.info('--------------------------------')
+        if failed:
+            raise IncompleteResultsError(f"Results are incomplete: fetching {len(failed)} of {len(ids)} IDs failed: {list(failed)}", failed)
+
+    async def iter_pages(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+        **kwargs
+    ) -> AsyncIterator[dict]:
+        """Lazily fetch the pages of any paginated endpoint.
+
+        See `ShovelsAPI.iter_pages` for parameter details.
+
+        Yields
+        ------
+        dict
+            The JSON response for each page, with the page items under `items`.
+        """
+        url = endpoint if endpoint.startswith(("http://", "https://")) else f"{self.base_url}/{endpoint.lstrip('/')}"
+        async for content in self._iter_pages(url, params, **kwargs):
+            yield content
+
+    async def iter_permits(
+        self,
+        geo_ids: Iterable[str] | str | None = None,
+        params: dict | None = None,
+        dedupe: bool = False,
+        **kwargs
+    ) -> AsyncIterator[dict]:
+        """Lazily search for permits, yielding them as pages arrive.
+
+        See `ShovelsAPI.iter_permits` for parameter details.
+
+        Yields
+        ------
+        dict
+            One permit at a time.
+        """
+        seen = SeenIds() if dedupe else None
+        url = f"{self.base_url}/permits/search"
+        if geo_ids is None:
+            geo_ids = US_STATES
+        if isinstance(geo_ids, str):
+            geo_ids = [geo_ids]
+        _params = {**params} if params else {}
+        _params = default_date_range(_params, "permit_from", "permit_to")
+
+        def pages(geo_id: str) -> AsyncIterator[dict]:
+            return self._iter_pages(url, {**_params, "geo_id": geo_id}, **kwargs)
+
+        async for content in self._iter_fan_out(list(geo_ids), pages, "permits for geo_id"):
+            items = content.get("items", [])
+            for item in (seen.filter(items) if seen is not None else items):
+                yield item
+
+    async def iter_contractors(
+        self,
+        geo_ids: Iterable[str] | str | None = None,
+        params: dict | None = None,
+        dedupe: bool = False,
+        **kwargs
+    ) -> AsyncIterator[dict]:
+        """Lazily search for contractors, yielding them as pages arrive.
+
+        See `ShovelsAPI.iter_contractors` for parameter details.
+
+        Yields
+        ------
+        dict
+            One contractor at a time.
+        """
+        seen = SeenIds() if dedupe else None
+        url = f"{self.base_url}/contractors/search"
+        if geo_ids is None:
+            geo_ids = US_STATES
+        if isinstance(geo_ids, str):
+            geo_ids = [geo_ids]
+        _params = {**params} if params else {}
+        _params = default_date_range(_params, "permit_from", "permit_to")
+
+        def pages(geo_id: str) -> AsyncIterator[dict]:
+            return self._iter_pages(url, {**_params, "geo_id": geo_id}, **kwargs)
+
+        async for content in self._iter_fan_out(list(geo_ids), pages, "contractors for geo_id"):
+            items = content.get("items", [])
+            for item in (seen.filter(items) if seen is not None else items):
+                yield item
+
+    async def iter_residents(
+        self,
+        geo_ids: Iterable[str] | str,
+        **kwargs
+    ) -> AsyncIterator[dict]:
+        """Lazily fetch residents, yielding them as pages arrive.
+
+        See `ShovelsAPI.iter_residents` for parameter details.
+
+        Yields
+        ------
+        dict
+            One resident at a time.
+        """
+        if isinstance(geo_ids, str):
+            geo_ids = [geo_ids]
+
+        def pages(geo_id: str) -> AsyncIterator[dict]:
+            return self._iter_pages(f"{self.base_url}/addresses/{geo_id}/residents", None, **kwargs)
+
+        async for content in self._iter_fan_out(list(geo_ids), pages, "residents for geo_id"):
+            for item in content.get("items", []):
+                yield item
+
+    async def iter_permits_by_contractor_id(
+        self,
+        contractor_ids: Iterable[str] | str,
+        dedupe: bool = False,
+        **kwargs
+    ) -> AsyncIterator[dict]:
+        """Lazily fetch the permits of given contractors, yielding them as pages arrive.
+
+        See `ShovelsAPI.iter_permits_by_contractor_id` for parameter details.
+
+        Yields
+        ------
+        dict
+            One permit at a time.
+        """
+        seen = SeenIds() if dedupe else None
+        if isinstance(contractor_ids, str):
+            contractor_ids = [contractor_ids]
+
+        def pages(cid: str) -> AsyncIterator[dict]:
+            return self._iter_pages(f"{self.base_url}/contractors/{cid}/permits", None, **kwargs)
+
+        async for content in self._iter_fan_out(list(contractor_ids), pages, "permits for contractor ID"):
+            items = content.get("items", [])
+            for item in (seen.filter(items) if seen is not None else items):
+                yield item
+    # endregion: streaming
+
+    async def query(
+        self,
+        sql: str,
+        parameters: Sequence | dict = (),
+        output: str | None = None
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list:
+        """Run a SQL query against the client's local mirror.
+
+        See `ShovelsAPI.query` for parameter details. The query runs in a
+        worker thread.
+
+        Returns
+        -------
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list
+            The rows of the result, in the format given by `output`.
+        """
+        assert self.mirror is not None, "query requires a client created with a mirror"
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        return self._build_rows(await asyncio.to_thread(self.mirror.query, sql, parameters), output)
+
+    async def get_tags(self) -> List[dict]:
+        """Get all available permit tags.
+
+        Returns
+        -------
+        List[dict]
+            A list of tag objects. Each object contains tag details.
+        """
+        url = f"{self.base_url}/list/tags"
+        content = await self._make_reference_request(url, params={"size": 100})
+        return content["items"]
+
+    async def get_data_release_date(self) -> datetime.date:
+        """Get the data release date information from the Shovels API.
+
+        Returns
+        -------
+        datetime.date
+            The data release date.
+        """
+        url = f"{self.base_url}/meta/release"
+        response = await self._make_reference_request(url)
+        return datetime.date.fromisoformat(response["released_at"])
@@ -0,0 +1,689 @@
+from __future__ import annotations
+
+import datetime
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List
+
+from .cache import MISSING, MemoryCache
+from .checkpoint import CheckpointStore
+from .decoding import get_json_decoder
+from .frames import ColumnarBuilder, SeenIds
+from .paging import LAST_RESPONSE, MAX_PAGE_SIZE, AdaptivePageSize, IncompleteResultsError
+from .ratelimit import RateLimiter
+from .records import RECORD_TYPES
+from .retry import RetryPolicy
+from .schemas import NESTED_FIELDS, SCHEMAS
+
+if TYPE_CHECKING:
+    from .cache import DiskCache
+    from .mirror import LocalMirror
+    from .sinks import ParquetSink
+    from .sync import SyncResult, SyncStore
+
+__all__ = [
+    "ClientBase",
+    "PageChain",
+    "PageCollector",
+]
+
+# result formats of the methods returning tabular data (see `ShovelsAPI.__init__`)
+OUTPUTS = ("pandas", "arrow", "polars", "records", "list")
+
+# maximum number of IDs accepted by the by-ID endpoints in a single request
+MAX_IDS_PER_REQUEST = 50
+
+# minimum number of threads fetching the date windows of a split permit search
+WINDOW_WORKERS = 4
+
+US_STATES = [
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
+    "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
+    "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
+    "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
+    "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"
+]
+
+def elapsed_time_str(elapsed_seconds: float) -> str:
+    """
+    Converts a number of seconds into a string of hours, minutes, and seconds.
+
+    Parameters
+    ----------
+    elapsed_seconds : float
+        The number of seconds to convert.
+
+    Returns
+    -------
+    str
+        The string of hours, minutes, and seconds.
+    """
+    hours = elapsed_seconds // (60**2)
+    left = elapsed_seconds % (60**2)
+    minutes = left // 60
+    seconds = elapsed_seconds % 60
+    hours_str = f'{hours:.0f}h ' if hours > 0 else ''
+    minutes_str = f'{minutes:.0f}min ' if minutes > 0 else ''
+    seconds_str = f'{seconds:.1f}s' if seconds > 0 else ''
+    return (hours_str + minutes_str + seconds_str).strip()
+
+def default_date_range(
+    params: dict,
+    from_key: str,
+    to_key: str,
+    days: int = 180
+) -> dict:
+    """
+    Fills in missing date range bounds in a parameters dictionary.
+
+    Parameters
+    ----------
+    params : dict
+        The request parameters. This dictionary is not modified.
+    from_key : str
+        The key of the start date (e.g., "permit_from", "metric_from").
+        Defaults to `days` days ago if not set.
+    to_key : str
+        The key of the end date (e.g., "permit_to", "metric_to").
+        Defaults to today if not set.
+    days : int, optional
+        The length of the default range in days. Default is 180.
+
+    Returns
+    -------
+    dict
+        A copy of `params` with both date bounds set.
+    """
+    today = datetime.date.today()
+    _params = {**params}
+    _params[from_key] = _params.get(from_key) or (today - datetime.timedelta(days=days)).strftime("%Y-%m-%d")
+    _params[to_key] = _params.get(to_key) or today.strftime("%Y-%m-%d")
+    return _params
+
+def split_date_range(
+    date_from: str,
+    date_to: str,
+    freq: str,
+    n_windows: int = 1
+) -> List[tuple]:
+    """
+    Splits an inclusive date range into consecutive, non-overlapping windows.
+
+    Parameters
+    ----------
+    date_from : str
+        The first date of the range, in "YYYY-MM-DD" format.
+    date_to : str
+        The last date of the range, in "YYYY-MM-DD" format.
+    freq : str
+        How to split the range. Options: "monthly" (calendar months),
+        "weekly" (7-day windows) or "equal" (`n_windows` windows of equal
+        length). Windows are fixed in advance, regardless of how many items
+        each one holds: a dense window is not split any further.
+    n_windows : int, optional
+        The number of windows for the "equal" frequency. Default is 1.
+
+    Returns
+    -------
+    List[tuple]
+        A list of (window_from, window_to) tuples in "YYYY-MM-DD" format,
+        covering the range in order.
+
+    Raises
+    ------
+    AssertionError
+        If `freq` is not a valid option or `date_from` is after `date_to`.
+    """
+    assert freq in ("monthly", "weekly", "equal"), 'freq must be one of "monthly", "weekly", "equal"'
+    start = datetime.date.fromisoformat(date_from)
+    end = datetime.date.fromisoformat(date_to)
+    assert start <= end, "date_from must not be after date_to"
+    if freq == "equal":
+        n_days = (end - start).days + 1
+        window_days = max(-(-n_days // max(n_windows, 1)), 1)
+    windows: List[tuple] = []
+    window_start = start
+    while window_start <= end:
+        if freq == "monthly":
+            next_start = (window_start.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+        elif freq == "weekly":
+            next_start = window_start + datetime.timedelta(days=7)
+        else:
+            next_start = window_start + datetime.timedelta(days=window_days)
+        window_end = min(next_start - datetime.timedelta(days=1), end)
+        windows.append((window_start.isoformat(), window_end.isoformat()))
+        window_start = next_start
+    return windows
+
+def is_last_page(content: dict) -> bool:
+    """Whether a paginated response has no next cursor or page."""
+    if "next_cursor" in content:
+        return content["next_cursor"] is None
+    return content.get("next_page") is None
+
+class FanOutResults(list):
+    """The results of a fan-out, in the order of the IDs, and the IDs whose fetch failed."""
+
+    def __init__(self, results: Iterable = (), failed: dict | None = None):
+        super().__init__(results)
+        # parameters of the missing page (or None), by ID (see `IncompleteResultsError.failed`)
+        self.failed: dict = failed if failed is not None else {}
+
+class PageChain:
+    """
+    Position and statistics of a paginated request.
+
+    Holds the cursor or page number and the page size of the next request,
+    moves to the next page from each response and logs the statistics of
+    the request once done. The requests themselves are sent by the client,
+    so that the same bookkeeping serves `ShovelsAPI` and `AsyncShovelsAPI`.
+    """
+
+    def __init__(
+        self,
+        params: dict | None = None,
+        page: int | None = None,
+        size: int | None = None,
+        cursor: str | None = None,
+        max_iterations: int | None = None,
+        page_size: int | AdaptivePageSize | None = None,
+        logger: logging.Logger | None = None
+    ):
+        """Initialize the chain.
+
+        Parameters
+        ----------
+        params : dict, optional
+            The parameters of the request. This dictionary is not modified.
+        page : int, optional
+            The first page number for page-based pagination. Default is None.
+        size : int, optional
+            The number of items per page. Default is None.
+        cursor : str, optional
+            The first cursor for cursor-based pagination. Default is None.
+        max_iterations : int, optional
+            The maximum number of pages to fetch. Default is None.
+        page_size : int | AdaptivePageSize, optional
+            The client's page size, used if `size` is None. Default is None.
+        logger : logging.Logger, optional
+            The logger of the client. Default is the module logger.
+
+        Raises
+        ------
+        AssertionError
+            If `page` is lower than 1 or `size` is not between 1 and 100.
+        """
+        assert page is None or page >= 1, "page must be greater than or equal to 1"
+        assert size is None or 1 <= size <= MAX_PAGE_SIZE, f"size must be between 1 and {MAX_PAGE_SIZE}"
+        self.params: dict = {**params} if params else {}
+        self.page: int | None = page
+        self.cursor: str | None = cursor
+        # the client's adaptive page size applies when the caller does not set one
+        self.sizer: AdaptivePageSize | None = page_size if size is None and isinstance(page_size, AdaptivePageSize) else None
+        if size is None and isinstance(page_size, int):
+            size = page_size
+        self.size: int | None = size
+        if page is not None:
+            self._pin_size()
+        self.max_iterations: int | None = max_iterations
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self.sizes: List[int] = []
+        self.n_items: int = 0
+        self.n_requests: int = 0
+        self.logger.info(f"Request params: {self.params}" if self.params else "No params")
+        self._tic: float = time.time()
+
+    @property
+    def position(self) -> str:
+        """The cursor or page of the next request, for log messages."""
+        if self.cursor:
+            return f"cursor {self.cursor}"
+        return f"page {self.page}" if self.page else "first page"
+
+    def next_params(self) -> dict:
+        """Return the parameters of the next request."""
+        self.n_requests += 1
+        if self.cursor:
+            self.params["cursor"] = self.cursor
+        if self.page:
+            self.params["page"] = self.page
+        if self.sizer is not None:
+            self.size = self.sizer.size
+        if self.size:
+            self.params["size"] = self.size
+            self.sizes.append(self.size)
+        self.logger.debug(f"Iteration {self.n_requests}: Page {self.page}, Cursor {self.cursor}, Size {self.size}")
+        LAST_RESPONSE.set(None)
+        return {**self.params}
+
+    def advance(self, content: dict) -> bool:
+        """Record a received page and move to the next one.
+
+        Parameters
+        ----------
+        content : dict
+            The JSON response of the last request.
+
+        Returns
+        -------
+        bool
+            Whether there is a next page to fetch.
+        """
+        self.n_items += len(content.get("items", []))
+        response = LAST_RESPONSE.get()
+        if "next_page" in content:
+            self._pin_size()
+        elif self.sizer is not None and response is not None:
+            self.sizer.update(*response)
+        if self.max_iterations is not None and self.n_requests == self.max_iterations:
+            return False
+        if "next_cursor" in content:
+            self.cursor = content["next_cursor"]
+            return self.cursor is not None
+        if "next_page" in content:
+            if content["next_page"] is None:
+                return False
+            self.page = content["next_page"]
+            return True
+        return False
+
+    def _pin_size(self) -> None:
+        """Keep the current page size for the rest of a page-based chain."""
+        # page numbers are offsets in units of the page size
+        if self.sizer is not None:
+            self.size = self.sizer.size
+            self.sizer = None
+
+    def log_stats(self) -> None:
+        """Log the duration, number of items and requests and page sizes of the request."""
+        self.logger.info(f"Time to complete request: {elapsed_time_str(time.time() - self._tic)}")
+        self.logger.info(f"Total number of items returned: {self.n_items}")
+        self.logger.info(f"Number of individual requests made: {self.n_requests}")
+        sizes = self.sizes
+        if sizes:
+            self.logger.info(f"Page size: {sizes[-1]}" if min(sizes) == max(sizes) else f"Page size: {sizes[0]} to {sizes[-1]} (min {min(sizes)})")
+
+class PageCollector:
+    """
+    Accumulator of the pages of a paginated request.
+
+    Drops the items already returned for another ID (with `seen`), keeps
+    the others column by column unless they go to a `sink`, and records
+    every page in `checkpoint`. Writing to the sink is left to the client,
+    which may do it from a worker thread.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        params: dict | None = None,
+        flatten: Iterable[str] = (),
+        sink: ParquetSink | None = None,
+        partition: dict | None = None,
+        seen: SeenIds | None = None,
+        checkpoint: CheckpointStore | None = None,
+        logger: logging.Logger | None = None
+    ):
+        """Initialize the collector. See `ShovelsAPI._collect_paginated` for parameter details."""
+        self.url: str = url
+        self.params: dict | None = params
+        self.builder: ColumnarBuilder = ColumnarBuilder(flatten)
+        self.sink: ParquetSink | None = sink
+        self.partition: dict = partition or {}
+        self.group = next(iter(self.partition.values()), None)
+        self.seen: SeenIds | None = seen
+        self.checkpoint: CheckpointStore | None = checkpoint
+        self.key: str | None = checkpoint.task_key(url, params) if checkpoint is not None else None
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+
+    def restore(self, resume: bool) -> dict | None:
+        """Reset the checkpoint of the request, or restore its pages if `resume` is True.
+
+        Parameters
+        ----------
+        resume : bool
+            Whether to restore the checkpointed pages.
+
+        Returns
+        -------
+        dict | None
+            The checkpoint state to continue from (see `CheckpointStore.get`),
+            or None to start from the first page.
+        """
+        if self.checkpoint is None:
+            return None
+        state = self.checkpoint.get(self.key) if resume else None
+        if state is None:
+            self.checkpoint.reset(self.key)
+            return None
+        for items in self.checkpoint.iter_pages(self.key):
+            kept = self.filter(items)
+            if self.sink is None:
+                self.builder.extend(kept)
+        if self.sink is not None:
+            for files in self.checkpoint.iter_files(self.key):
+                self.sink.restore(files)
+        if state["done"]:
+            self.logger.info(f"Skipping completed request: {state['rows']} items restored from checkpoint")
+        else:
+            self.logger.info(f"Resuming request after {state['pages']} checkpointed pages")
+        return state
+
+    def filter(self, items: List[dict]) -> List[dict]:
+        """Return the items not returned for another ID yet."""
+        return self.seen.filter(items, self.group) if self.seen is not None else items
+
+    def add(self, content: dict) -> List[dict]:
+        """Keep the new items of a page, and return them."""
+        kept = self.filter(content.get("items", []))
+        if self.sink is None:
+            self.builder.extend(kept)
+        return kept
+
+    def save(self, content: dict, size: int | None = None, files: List[dict] | None = None) -> None:
+        """Record a page, requested with `size` items per page and written to `files` of the sink, in the checkpoint if any."""
+        if self.checkpoint is None:
+            return
+        items = content.get("items", [])
+        self.checkpoint.save_page(
+            self.key, self.url, self.params, None if self.sink is not None else items, len(items),
+            content.get("next_cursor"), content.get("next_page"), is_last_page(content), size, files,
+        )
+
+class ClientBase:
+    """
+    Logic shared by `ShovelsAPI` and `AsyncShovelsAPI`.
+
+    Holds the client options and everything that does not depend on how
+    requests are sent: building results, deduplicating, splitting date
+    windows, chunking IDs and the sync bookkeeping. The clients only
+    implement the I/O.
+    """
+    BASE_URL = "https://api.shovels.ai/v2"
+
+    def _configure(
+        self,
+        base_url: str | None,
+        logger: logging.Logger,
+        rate_limit: float | RateLimiter | None,
+        retry: int | RetryPolicy | None,
+        timeout: float | None,
+        cache: DiskCache | None,
+        release_check_interval: float,
+        reference_cache: MemoryCache | None,
+        dtypes: bool,
+        flatten: bool | Iterable[str],
+        json_decoder: str | Callable[[bytes], Any] | None,
+        output: str,
+        mirror: LocalMirror | None,
+        page_size: int | AdaptivePageSize | str | None
+    ) -> None:
+        """Validate and set the options common to both clients. See `ShovelsAPI.__init__`."""
+        assert output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        assert (
+            page_size is None or page_size == "adaptive" or isinstance(page_size, AdaptivePageSize)
+            or 1 <= page_size <= MAX_PAGE_SIZE
+        ), f"page_size must be 'adaptive', an AdaptivePageSize, None or an integer between 1 and {MAX_PAGE_SIZE}"
+        self.base_url: str = base_url or os.getenv('SHOVELS_API_URL') or self.BASE_URL
+        self.logger: logging.Logger = logger
+        if not isinstance(rate_limit, RateLimiter):
+            rate_limit = RateLimiter(rate_limit)
+        self.rate_limiter: RateLimiter = rate_limit
+        if not isinstance(retry, RetryPolicy):
+            retry = RetryPolicy() if retry is None else RetryPolicy(max_retries=retry)
+        self.retry: RetryPolicy = retry
+        self.timeout: float | None = timeout
+        self.cache: DiskCache | None = cache
+        self.release_check_interval: float = release_check_interval
+        self._release_checked_at: float = 0.0
+        self.reference_cache: MemoryCache | None = MemoryCache() if reference_cache is MISSING else reference_cache
+        self.dtypes: bool = dtypes
+        self.flatten: tuple = NESTED_FIELDS if flatten is True else tuple(flatten or ())
+        self.decode_json: Callable[[bytes], Any] = get_json_decoder(json_decoder)
+        self.output: str = output
+        self.mirror: LocalMirror | None = mirror
+        if page_size == "adaptive":
+            page_size = AdaptivePageSize()
+        self.page_size: int | AdaptivePageSize | None = page_size
+
+    def _page_chain(
+        self,
+        params: dict | None = None,
+        page: int | None = None,
+        size: int | None = None,
+        cursor: str | None = None,
+        max_iterations: int | None = None
+    ) -> PageChain:
+        """Return the bookkeeping of a paginated request using the client's page size."""
+        return PageChain(params, page, size, cursor, max_iterations, self.page_size, self.logger)
+
+    def _page_collector(
+        self,
+        url: str,
+        params: dict | None = None,
+        sink: ParquetSink | None = None,
+        partition: dict | None = None,
+        seen: SeenIds | None = None,
+        checkpoint: CheckpointStore | None = None,
+        resume: bool = False
+    ) -> PageCollector:
+        """Return the accumulator of a paginated request. See `ShovelsAPI._collect_paginated`."""
+        assert not resume or checkpoint is not None, "resume requires a checkpoint"
+        return PageCollector(url, params, self.flatten, sink, partition, seen, checkpoint, self.logger)
+
+    @staticmethod
+    def _fetch_failed(failed: dict, _id: str, error: Exception) -> Any:
+        """Record the failure of the fetch of an ID, and return its partial result if any."""
+        if isinstance(error, IncompleteResultsError):
+            failed[_id] = next(iter(error.failed.values()), None)
+            return error.result
+        failed[_id] = None
+        return None
+
+    @staticmethod
+    def _complete(results: FanOutResults, value: Any) -> Any:
+        """Return `value`, built from the `results` of a fan-out, unless some IDs failed.
+
+        Raises
+        ------
+        IncompleteResultsError
+            If the fetch of some IDs failed, with `value` as its result.
+        """
+        if results.failed:
+            raise IncompleteResultsError(
+                f"Results are incomplete: fetching {len(results.failed)} of {len(results)} IDs failed: {list(results.failed)}",
+                results.failed, value,
+            )
+        return value
+
+    def _seen_ids(self, dedupe: bool | str, key: str) -> SeenIds | None:
+        """Return the duplicate filter of a fan-out over `key` values, or None if `dedupe` is off."""
+        assert dedupe in (False, True, "merge"), "dedupe must be True, False or 'merge'"
+        if not dedupe:
+            return None
+        return SeenIds(merge_column=f"query_{key}s" if dedupe == "merge" else None)
+
+    def _schema(self, entity: str) -> dict | None:
+        """Return the column dtypes of `entity` frames, or None if `dtypes` is off."""
+        return SCHEMAS.get(entity) if self.dtypes else None
+
+    def _build(self, builder: ColumnarBuilder, entity: str, output: str | None = None):
+        """Turn the accumulated `entity` items into the `output` format (the client's by default)."""
+        output = output or self.output
+        if output == "records":
+            record_cls = RECORD_TYPES.get(entity)
+            return builder.to_records(record_cls) if record_cls else builder.to_dicts()
+        if output == "list":
+            return builder.to_dicts()
+        if output == "arrow":
+            return builder.to_arrow(self._schema(entity))
+        if output == "polars":
+            return builder.to_polars(self._schema(entity))
+        return builder.to_frame(self._schema(entity))
+
+    def _build_rows(self, rows: List[dict], output: str | None = None):
+        """Turn the rows of a mirror query into the `output` format (the client's by default)."""
+        builder = ColumnarBuilder()
+        builder.extend(rows)
+        return self._build(builder, "query", output)
+
+    def _window_tasks(
+        self,
+        geo_ids: List[str],
+        params: dict,
+        split_windows: str,
+        n_windows: int
+    ) -> dict:
+        """Split the `permit_from`/`permit_to` range of every geo ID into date windows.
+
+        Returns
+        -------
+        dict
+            The `(geo_id, params)` of each window, keyed by a label like
+            "CA 2025-01-01..2025-01-31", windows of the same geo ID being
+            consecutive.
+        """
+        windows = split_date_range(params["permit_from"], params["permit_to"], split_windows, n_windows)
+        return {
+            f"{geo_id} {start}..{end}": (geo_id, {**params, "geo_id": geo_id, "permit_from": start, "permit_to": end})
+            for geo_id in geo_ids for start, end in windows
+        }
+
+    @staticmethod
+    def _stitch_windows(tasks: dict, builders: List[ColumnarBuilder | None]) -> ColumnarBuilder:
+        """Concatenate the windows of `_window_tasks`, deduplicating permits within each geo ID."""
+        per_geo = {}
+        for (geo_id, _), builder in zip(tasks.values(), builders):
+            if builder is not None:
+                per_geo.setdefault(geo_id, []).append(builder)
+        geo_builders = [ColumnarBuilder.concat(parts) for parts in per_geo.values()]
+        for builder in geo_builders:
+            builder.dedupe("id")
+        return ColumnarBuilder.concat(geo_builders)
+
+    def _resolve_call(
+        self,
+        url: str,
+        params: dict | None,
+        resolved: dict,
+        checkpoint: CheckpointStore | None = None,
+        resume: bool = False
+    ) -> dict:
+        """Return the parameters of a call, as resolved by the call being resumed if any.
+
+        Parameters
+        ----------
+        url : str
+            The endpoint of the call.
+        params : dict | None
+            The parameters given by the caller, which identify the call.
+        resolved : dict
+            The parameters completed by this call (e.g., with a default date
+            range), recorded in `checkpoint` unless an earlier run is resumed.
+        checkpoint : CheckpointStore, optional
+            The checkpoint of the call. Default is None.
+        resume : bool, optional
+            Whether to resume an earlier run of the call. Default is False.
+
+        Returns
+        -------
+        dict
+            The parameters recorded by the resumed run, or `resolved`.
+
+        Raises
+        ------
+        AssertionError
+            If `resume` is True without a `checkpoint`.
+        """
+        assert not resume or checkpoint is not None, "resume requires a checkpoint"
+        if checkpoint is None:
+            return resolved
+        key = checkpoint.call_key(url, params)
+        if resume:
+            recorded = checkpoint.get_call(key)
+            if recorded is not None:
+                return recorded
+            self.logger.warning(f"No checkpoint matches this call to {url}: starting from the first page")
+        checkpoint.save_call(key, url, resolved)
+        return resolved
+
+    @staticmethod
+    def _id_chunks(ids: Iterable[str] | str) -> tuple:
+        """Drop duplicate IDs and split them into chunks of `MAX_IDS_PER_REQUEST`.
+
+        Returns
+        -------
+        tuple
+            The unique IDs in input order, and the chunks keyed by a label
+            like "1-50".
+        """
+        unique_ids = list(dict.fromkeys([ids] if isinstance(ids, str) else ids))
+        chunks = {
+            f"{start + 1}-{min(start + MAX_IDS_PER_REQUEST, len(unique_ids))}": unique_ids[start:start + MAX_IDS_PER_REQUEST]
+            for start in range(0, len(unique_ids), MAX_IDS_PER_REQUEST)
+        }
+        return unique_ids, chunks
+
+    def _order_by_ids(self, unique_ids: List[str], results: List[List[dict] | None]) -> ColumnarBuilder:
+        """Merge the items of the chunks of `_id_chunks` in the order of their ID in `unique_ids`."""
+        position = {_id: i for i, _id in enumerate(unique_ids)}
+        items = sorted(
+            (item for result in results if result for item in result),
+            key=lambda item: position.get(item.get("id"), len(position)),
+        )
+        n_missing = len(unique_ids) - len({item.get("id") for item in items} & position.keys())
+        if n_missing:
+            self.logger.warning(f"{n_missing} of {len(unique_ids)} IDs were not returned")
+        builder = ColumnarBuilder(self.flatten)
+        builder.extend(items)
+        return builder
+
+    @staticmethod
+    def _start_sync(
+        store: SyncStore,
+        geo_id: str,
+        params: dict,
+        lookback_days: int,
+        result: SyncResult
+    ) -> dict:
+        """Return the state of the sync of a geo ID, with the `params` of its window."""
+        start, end = store.window(geo_id, params, lookback_days)
+        result.windows[geo_id] = (start, end)
+        return {
+            "params": {**params, "geo_id": geo_id, "permit_from": start, "permit_to": end},
+            "watermark": store.get_watermark(geo_id, params),
+            "items": 0,
+            "complete": False,
+        }
+
+    @staticmethod
+    def _sync_page(state: dict, content: dict, latest: str | None) -> None:
+        """Record a page upserted by a sync, whose latest `file_date` is `latest`."""
+        if latest is not None and (state["watermark"] is None or latest > state["watermark"]):
+            state["watermark"] = latest
+        state["items"] += len(content.get("items", []))
+        state["complete"] = is_last_page(content)
+
+    def _finish_sync(
+        self,
+        store: SyncStore,
+        geo_id: str,
+        params: dict,
+        state: dict,
+        result: SyncResult
+    ) -> bool:
+        """Move the watermark of a geo ID forward if its sync completed, and return whether it did."""
+        result.items[geo_id] = state["items"]
+        if not state["complete"]:
+            self.logger.error(f"Sync of geo_id {geo_id} is incomplete, keeping its watermark")
+            return False
+        store.set_watermark(geo_id, params, state["watermark"])
+        result.watermarks[geo_id] = state["watermark"]
+        return True
+
+    def _sync_summary(self, geo_ids: List[str], synced: List[bool | None], result: SyncResult) -> SyncResult:
+        """Record the geo IDs whose sync failed and log the totals."""
+        result.failed = [geo_id for geo_id, ok in zip(geo_ids, synced) if not ok]
+        self.logger.info(f"Synced {result.total} permits for {len(geo_ids) - len(result.failed)}/{len(geo_ids)} geo_ids")
+        return result
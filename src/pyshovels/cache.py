@@ -0,0 +1,286 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable
+
+__all__ = [
+    "DiskCache",
+    "MemoryCache",
+]
+
+# sentinel returned by `MemoryCache.get` for missing keys, since None is a valid value
+MISSING = object()
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "pyshovels" / "http_cache.sqlite"
+
+def connect_sqlite(path: Path) -> sqlite3.Connection:
+    """
+    Opens a SQLite database that can be shared between threads and processes.
+
+    Parameters
+    ----------
+    path : Path
+        The path to the database file. Parent directories are created.
+
+    Returns
+    -------
+    sqlite3.Connection
+        A connection in autocommit mode, using write-ahead logging and
+        waiting up to 30 seconds for locks held by other connections.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+class DiskCache:
+    """
+    Persistent HTTP response cache backed by SQLite.
+
+    Responses are keyed by URL and normalized parameters, expire after `ttl`
+    seconds and are evicted least recently used first once the cache grows
+    beyond `max_size` bytes. The database can be shared by several threads
+    and processes. All entries are dropped when the Shovels data release date
+    changes (see `set_release`).
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        ttl: float | None = 7 * 24 * 3600,
+        max_size: int | None = 1024 ** 3
+    ):
+        """Initialize the cache.
+
+        Parameters
+        ----------
+        path : str | Path, optional
+            The path to the SQLite database file. Default is None, which uses
+            `~/.cache/pyshovels/http_cache.sqlite`.
+        ttl : float, optional
+            The number of seconds a response stays valid. Default is 7 days.
+            If None, responses only expire on a new data release.
+        max_size : int, optional
+            The maximum total size of the cached responses, in bytes.
+            Default is 1 GiB. If None, the size is not bounded.
+        """
+        self.path: Path = Path(path) if path else DEFAULT_CACHE_PATH
+        self.ttl: float | None = ttl
+        self.max_size: int | None = max_size
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, body BLOB NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def __reduce__(self):
+        return (DiskCache, (self.path, self.ttl, self.max_size))
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the connection of the calling thread, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = connect_sqlite(self.path)
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def make_key(url: str, params: dict | None = None) -> str:
+        """Return the cache key of a request.
+
+        Parameters are sorted by name, so that the same request made with
+        differently ordered parameters hits the same entry.
+
+        Parameters
+        ----------
+        url : str
+            The request URL.
+        params : dict, optional
+            The request parameters.
+
+        Returns
+        -------
+        str
+            A hexadecimal SHA-256 digest.
+        """
+        normalized = sorted(
+            (key, [str(v) for v in value] if isinstance(value, (list, tuple)) else str(value))
+            for key, value in (params or {}).items()
+            if value is not None
+        )
+        payload = json.dumps([url, normalized], separators=(",", ":"))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached response body for `key`, or None if missing or expired."""
+        connection = self._connection()
+        row = connection.execute("SELECT body, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        body, created_at = row
+        now = time.time()
+        if self.ttl is not None and created_at + self.ttl < now:
+            connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+        connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return body
+
+    def set(self, key: str, body: bytes) -> None:
+        """Store the response body `body` under `key`."""
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO responses (key, body, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (key, body, len(body), now, now),
+        )
+        with self._writes_lock:
+            self._writes += 1
+            check_size = self._writes % 100 == 1
+        if check_size:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries, then the least recently used ones above `max_size`.
+
+        Returns
+        -------
+        int
+            The number of entries dropped.
+        """
+        connection = self._connection()
+        dropped = 0
+        if self.ttl is not None:
+            dropped += connection.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,)
+            ).rowcount
+        if self.max_size is not None:
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_size:
+                excess = total - self.max_size
+                rows = connection.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+                keys = []
+                for key, size in rows:
+                    if excess <= 0:
+                        break
+                    keys.append((key,))
+                    excess -= size
+                connection.executemany("DELETE FROM responses WHERE key = ?", keys)
+                dropped += len(keys)
+        return dropped
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        self._connection().execute("DELETE FROM responses")
+
+    def set_release(self, release: str) -> bool:
+        """Record the current data release, dropping all entries if it changed.
+
+        Parameters
+        ----------
+        release : str
+            An identifier of the current data release (e.g., its date).
+
+        Returns
+        -------
+        bool
+            True if the release changed (or was not recorded yet) and the
+            cache was cleared.
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'release'").fetchone()
+            changed = row is None or row[0] != release
+            if changed:
+                connection.execute("DELETE FROM responses")
+            connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('release', ?)", (release,))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return changed
+
+    def stats(self) -> dict:
+        """Return the number of cached `entries` and their total `size` in bytes."""
+        entries, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        return {"entries": entries, "size": size}
+
+class MemoryCache:
+    """
+    Bounded in-process LRU cache with per-entry expiration.
+
+    Used to memoize near-static reference lookups (tags, data release date,
+    location search). Thread-safe, and keeps hit and miss counters.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float | None = 3600):
+        """Initialize the cache.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            The maximum number of entries. The least recently used entry is
+            dropped when the cache is full. Default is 256.
+        ttl : float, optional
+            The number of seconds an entry stays valid. Default is 3600.
+            If None, entries never expire.
+
+        Raises
+        ------
+        AssertionError
+            If `maxsize` is lower than 1.
+        """
+        assert maxsize >= 1, "maxsize must be greater than or equal to 1"
+        self.maxsize: int = maxsize
+        self.ttl: float | None = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Return the value cached under `key`, or `default` if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache `value` under `key`, dropping the least recently used entry if full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        """Return the `hits`, `misses`, current `size` and `maxsize` of the cache."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
@@ -0,0 +1,250 @@
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+from .cache import DiskCache, connect_sqlite
+
+__all__ = [
+    "CheckpointStore",
+]
+
+class CheckpointStore:
+    """
+    Persistent progress of paginated requests, to resume interrupted runs.
+
+    Every paginated request of a call (e.g., one geo ID of `search_permits`)
+    is a task, keyed by its URL and parameters. After each page, the store
+    records the cursor or page number of the next page and whether the task
+    is complete, in the same transaction as the items of the page. For pages
+    written to a sink, the files written are recorded instead of the items,
+    so that the sink manifest of a resumed call lists them. Rerunning the
+    same call with `resume=True` restores the pages of completed and
+    in-flight tasks and continues each in-flight task from its next page. Each call also records the parameters it resolved (e.g., the
+    default date range of a search), which are reused when it is resumed,
+    so that resuming on another day continues the same tasks. The database
+    can be shared by several threads and processes.
+    """
+
+    def __init__(self, path: str | Path):
+        """Initialize the store.
+
+        Parameters
+        ----------
+        path : str | Path
+            The path to the SQLite database file. It is created if it does
+            not exist.
+        """
+        self.path: Path = Path(path)
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "key TEXT PRIMARY KEY, url TEXT NOT NULL, params TEXT NOT NULL, done INTEGER NOT NULL, "
+            "cursor TEXT, page INTEGER, size INTEGER, pages INTEGER NOT NULL, rows INTEGER NOT NULL, updated_at REAL NOT NULL)"
+        )
+        # stores created before page sizes were recorded
+        if "size" not in {row[1] for row in connection.execute("PRAGMA table_info(tasks)")}:
+            connection.execute("ALTER TABLE tasks ADD COLUMN size INTEGER")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "key TEXT NOT NULL, n INTEGER NOT NULL, items TEXT, files TEXT, PRIMARY KEY (key, n))"
+        )
+        # stores created before the files written to sinks were recorded
+        if "files" not in {row[1] for row in connection.execute("PRAGMA table_info(pages)")}:
+            connection.execute("ALTER TABLE pages ADD COLUMN files TEXT")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS calls ("
+            "key TEXT PRIMARY KEY, url TEXT NOT NULL, params TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def __reduce__(self):
+        return (CheckpointStore, (self.path,))
+
+    def _connection(self):
+        """Return the connection of the calling thread, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = connect_sqlite(self.path)
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def task_key(url: str, params: dict | None = None) -> str:
+        """Return the key of the paginated request to `url` with `params`."""
+        return DiskCache.make_key(url, {key: value for key, value in (params or {}).items() if key not in ("cursor", "page")})
+
+    @staticmethod
+    def call_key(url: str, params: dict | None = None) -> str:
+        """Return the key of a call to the endpoint `url` with the parameters given by the caller."""
+        return DiskCache.make_key(url, params)
+
+    def get_call(self, key: str) -> dict | None:
+        """Return the parameters resolved by a call, or None if it has no checkpoint.
+
+        Parameters
+        ----------
+        key : str
+            The call key (see `call_key`).
+
+        Returns
+        -------
+        dict | None
+            The request parameters, as completed by the call.
+        """
+        row = self._connection().execute("SELECT params FROM calls WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def save_call(self, key: str, url: str, params: dict) -> None:
+        """Record the parameters resolved by a call.
+
+        Parameters
+        ----------
+        key : str
+            The call key (see `call_key`).
+        url : str
+            The endpoint URL, stored for inspection.
+        params : dict
+            The request parameters, as completed by the call.
+        """
+        self._connection().execute(
+            "INSERT INTO calls (key, url, params, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET params = excluded.params, updated_at = excluded.updated_at",
+            (key, url, json.dumps(params, default=str), time.time()),
+        )
+
+    def get(self, key: str) -> dict | None:
+        """Return the progress of a task, or None if it has no checkpoint.
+
+        Parameters
+        ----------
+        key : str
+            The task key (see `task_key`).
+
+        Returns
+        -------
+        dict | None
+            The `done` flag, the `cursor` or `page` of the next page, the page
+            `size` of the last page, and the number of `pages` and `rows`
+            checkpointed.
+        """
+        row = self._connection().execute(
+            "SELECT done, cursor, page, size, pages, rows FROM tasks WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"done": bool(row[0]), "cursor": row[1], "page": row[2], "size": row[3], "pages": row[4], "rows": row[5]}
+
+    def save_page(
+        self,
+        key: str,
+        url: str,
+        params: dict | None,
+        items: List[dict] | None,
+        n_rows: int,
+        cursor: str | None,
+        page: int | None,
+        done: bool,
+        size: int | None = None,
+        files: List[dict] | None = None
+    ) -> None:
+        """Record a page of a task.
+
+        Parameters
+        ----------
+        key : str
+            The task key (see `task_key`).
+        url : str
+            The request URL, stored for inspection.
+        params : dict | None
+            The request parameters, stored for inspection.
+        items : List[dict] | None
+            The items of the page, or None if they were written to a sink.
+        n_rows : int
+            The number of items of the page.
+        cursor : str | None
+            The cursor of the next page, for cursor-based pagination.
+        page : int | None
+            The number of the next page, for page-based pagination.
+        done : bool
+            Whether this was the last page of the task.
+        size : int, optional
+            The page size the page was requested with, which page-based
+            tasks must keep when resumed. Default is None.
+        files : List[dict], optional
+            The manifest entries of the files the page was written to, if
+            it was written to a sink (see `SinkManifest.files`).
+            Default is None.
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT pages FROM tasks WHERE key = ?", (key,)).fetchone()
+            n_pages = row[0] if row else 0
+            connection.execute(
+                "INSERT INTO pages (key, n, items, files) VALUES (?, ?, ?, ?)",
+                (
+                    key, n_pages, None if items is None else json.dumps(items, default=str),
+                    None if files is None else json.dumps(files, default=str),
+                ),
+            )
+            connection.execute(
+                "INSERT INTO tasks (key, url, params, done, cursor, page, size, pages, rows, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET done = excluded.done, cursor = excluded.cursor, "
+                "page = excluded.page, size = excluded.size, pages = pages + 1, rows = rows + excluded.rows, "
+                "updated_at = excluded.updated_at",
+                (key, url, json.dumps(params or {}, default=str), int(done), cursor, page, size, n_rows, time.time()),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def iter_pages(self, key: str) -> Iterator[List[dict]]:
+        """Yield the items of the checkpointed pages of a task, in page order.
+
+        Pages written to a sink are skipped, since their items are not stored.
+        """
+        cursor = self._connection().execute(
+            "SELECT items FROM pages WHERE key = ? AND items IS NOT NULL ORDER BY n", (key,)
+        )
+        for (items,) in cursor:
+            yield json.loads(items)
+
+    def iter_files(self, key: str) -> Iterator[List[dict]]:
+        """Yield the files written to a sink by the checkpointed pages of a task, in page order.
+
+        Yields
+        ------
+        List[dict]
+            The manifest entries of the files of a page, with their `path`,
+            `partition` values and number of `rows`.
+        """
+        cursor = self._connection().execute(
+            "SELECT files FROM pages WHERE key = ? AND files IS NOT NULL ORDER BY n", (key,)
+        )
+        for (files,) in cursor:
+            yield [{**entry, "path": Path(entry["path"])} for entry in json.loads(files)]
+
+    def reset(self, key: str) -> None:
+        """Delete the checkpoint of a task."""
+        connection = self._connection()
+        connection.execute("DELETE FROM pages WHERE key = ?", (key,))
+        connection.execute("DELETE FROM tasks WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Delete all checkpoints."""
+        connection = self._connection()
+        connection.execute("DELETE FROM pages")
+        connection.execute("DELETE FROM tasks")
+        connection.execute("DELETE FROM calls")
+
+    def stats(self) -> dict:
+        """Return the number of completed and in-flight tasks, and of checkpointed pages and rows."""
+        done, in_flight, pages, rows = self._connection().execute(
+            "SELECT COALESCE(SUM(done), 0), COALESCE(SUM(1 - done), 0), "
+            "COALESCE(SUM(pages), 0), COALESCE(SUM(rows), 0) FROM tasks"
+        ).fetchone()
+        return {"done": done, "in_flight": in_flight, "pages": pages, "rows": rows}
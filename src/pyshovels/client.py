@@ -1,49 +1,49 @@
+from __future__ import annotations
+
+import copy
 import logging
 import traceback
 import requests
-import pandas as pd
 import datetime
+import threading
 import time
-from typing import Iterable, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Sequence
 from pathlib import Path
 import os
 
+from .base import OUTPUTS, US_STATES, WINDOW_WORKERS, ClientBase, FanOutResults, PageChain, default_date_range
+from .cache import MISSING, DiskCache, MemoryCache
+from .checkpoint import CheckpointStore
+from .coalescing import SingleFlight
+from .frames import ColumnarBuilder, SeenIds
+from .mirror import LocalMirror
+from .paging import LAST_RESPONSE, AdaptivePageSize, IncompleteResultsError
+from .pooling import PoolConfig, PoolStatsAdapter
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .sinks import ParquetSink, SinkManifest
+from .sync import SyncResult, SyncStore
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import polars as pl
+    import pyarrow as pa
+
+    from .harvest import HarvestResult
+
 __all__ = [
     "US_STATES", 
     "load_env",
     "ShovelsAPI",
 ]
 
-US_STATES = [
-    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
-    "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
-    "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
-    "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
-    "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"
-]
-
-def elapsed_time_str(elapsed_seconds: float) -> str:
-    """
-    Converts a number of seconds into a string of hours, minutes, and seconds.
-
-    Parameters
-    ----------
-    elapsed_seconds : float
-        The number of seconds to convert.
-
-    Returns
-    -------
-    str
-        The string of hours, minutes, and seconds.
-    """
-    hours = elapsed_seconds // (60**2)
-    left = elapsed_seconds % (60**2)
-    minutes = left // 60
-    seconds = elapsed_seconds % 60
-    hours_str = f'{hours:.0f}h ' if hours > 0 else ''
-    minutes_str = f'{minutes:.0f}min ' if minutes > 0 else ''
-    seconds_str = f'{seconds:.1f}s' if seconds > 0 else ''
-    return (hours_str + minutes_str + seconds_str).strip()
+# request errors worth retrying, as opposed to e.g. invalid URLs
+RETRYABLE_EXCEPTIONS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
 
 def load_env(env_name: str | None = None, env_path: str | None = None):
     """
@@ -68,18 +68,32 @@ def load_env(env_name: str | None = None, env_path: str | None = None):
     assert _env_path.exists(), f"Environment file {_env_path} does not exist"
     load_dotenv(_env_path)
 
-class ShovelsAPI:
+class ShovelsAPI(ClientBase):
     """
     Shovels API client.
     Full documentation: https://docs.shovels.ai/api-reference/
     """
-    BASE_URL = "https://api.shovels.ai/v2"
 
     def __init__(
         self,
         api_key: str | None = None,
         base_url: str | None = None,
         logger: logging.Logger | None = None,
+        max_workers: int = 1,
+        rate_limit: float | RateLimiter | None = None,
+        retry: int | RetryPolicy | None = None,
+        timeout: float | None = None,
+        pool: PoolConfig | None = None,
+        cache: DiskCache | None = None,
+        release_check_interval: float = 3600,
+        reference_cache: MemoryCache | None = MISSING,
+        dtypes: bool = False,
+        flatten: bool | Iterable[str] = False,
+        json_decoder: str | Callable[[bytes], Any] | None = None,
+        output: str = "pandas",
+        mirror: LocalMirror | None = None,
+        coalesce: bool = False,
+        page_size: int | AdaptivePageSize | str | None = "adaptive",
         **session_kwargs
     ):
         """Initialize the Shovels API client.
@@ -96,13 +110,153 @@ class ShovelsAPI:
         logger : logging.Logger, optional
             A logger instance for logging messages. If not provided, a default
             logger named after the module (`__name__`) will be used.
+        max_workers : int, optional
+            The number of threads used by methods that accept several IDs to
+            fetch them in parallel. Results are always merged in the order of
+            the input IDs. Default is 1, which fetches IDs sequentially.
+        rate_limit : float | RateLimiter, optional
+            The maximum number of requests per second, or a `RateLimiter`
+            instance to share a quota between several clients (use
+            `RateLimiter(..., shared=True)` to also share it with worker
+            processes). Pauses requested by the server through `Retry-After`
+            or rate-limit headers are always honored. Default is None, which
+            does not cap the request rate.
+        retry : int | RetryPolicy, optional
+            The number of times a failed request is retried, or a
+            `RetryPolicy` to also configure the backoff delays. Connection
+            errors, timeouts and HTTP 429 and 5xx responses are retried.
+            A page that still fails makes the call raise
+            `IncompleteResultsError`, holding the results fetched for all the
+            IDs, once the other IDs were fetched.
+            Default is None, which uses `RetryPolicy()` (5 retries).
+        timeout : float, optional
+            The number of seconds to wait for the server before the request
+            times out and is retried. Default is None, which waits forever.
+        pool : PoolConfig, optional
+            The HTTP connection pool configuration. Default is None, which
+            uses `PoolConfig()`, keeping up to `max_workers` connections
+            (at least 10) open per host.
+        cache : DiskCache, optional
+            A persistent cache for API responses. Cached responses are
+            dropped when Shovels publishes a new data release.
+            Default is None, which disables caching.
+        release_check_interval : float, optional
+            The number of seconds between checks of the data release date
+            when `cache` is set. The release date is requested from the API
+            at each check, regardless of `reference_cache`. Default is 3600.
+        reference_cache : MemoryCache, optional
+            An in-memory cache for the near-static reference lookups
+            (`get_tags`, `get_data_release_date` and `search_location`).
+            Default is `MemoryCache()`, which keeps up to 256 responses for an
+            hour. Pass None to disable it.
+        dtypes : bool, optional
+            Whether to convert the columns of the returned DataFrames to the
+            dtypes of `SCHEMAS` (categoricals, datetimes and nullable numbers)
+            instead of the dtypes inferred by pandas, which are mostly
+            `object`. Default is False.
+        flatten : bool | Iterable[str], optional
+            Whether to expand nested objects into one column per sub-field
+            (e.g., `address` into `address_street`, `address_city`, ...) as
+            pages are received. True flattens the fields in `NESTED_FIELDS`;
+            an iterable gives the field names to flatten. Default is False.
+        json_decoder : str | Callable[[bytes], Any], optional
+            The JSON library used to parse response bodies directly from
+            bytes ("orjson", "msgspec" or "json"), or a parsing function.
+            Default is None, which uses orjson or msgspec when installed and
+            the standard library otherwise.
+        output : str, optional
+            The default result format of the methods returning tabular data:
+            "pandas" (`pandas.DataFrame`), "arrow" (`pyarrow.Table`), "polars"
+            (`polars.DataFrame`), "records" (list of `Permit`, `Contractor` or
+            `Resident` records, or of dicts for other data) or "list" (list of
+            dicts). Arrow and Polars results are built from the columns
+            without going through pandas. Can be overridden per call.
+            Default is "pandas".
+        mirror : LocalMirror, optional
+            A local SQLite copy of the permits, contractors and residents,
+            loaded by passing `mirror.permits`, `mirror.contractors` or
+            `mirror.residents` as the `sink` of a search, and read with
+            `query`. Default is None.
+        coalesce : bool, optional
+            Whether identical requests (same URL and parameters) made
+            concurrently share a single network call and parsed response,
+            which is then shared by the callers (threads of a web service or
+            of `max_workers`) and must not be modified. Default is False.
+        page_size : int | AdaptivePageSize | str | None, optional
+            The page size of paginated requests that do not set `size`:
+            "adaptive" uses an `AdaptivePageSize`, starting at the maximum of
+            100 items per page and backing off when pages get slow or large;
+            an `AdaptivePageSize` instance sets its thresholds; an integer
+            fixes the size; None uses the server default. The page sizes used
+            are logged with the statistics of each request.
+            Default is "adaptive".
         **session_kwargs : dict, optional
             Keyword arguments passed to the `requests.Session` constructor.
+
+        Raises
+        ------
+        AssertionError
+            If `max_workers` is lower than 1, `output` is invalid
+            or `page_size` is not between 1 and 100.
         """
+        assert max_workers >= 1, "max_workers must be greater than or equal to 1"
+        self._configure(
+            base_url, logger or logging.getLogger(__name__), rate_limit, retry, timeout, cache,
+            release_check_interval, reference_cache, dtypes, flatten, json_decoder, output, mirror, page_size,
+        )
+        self.max_workers: int = max_workers
+        self.pool: PoolConfig = pool or PoolConfig()
         self.session: requests.Session = requests.Session(**session_kwargs)
         self.session.headers['X-API-Key'] = api_key or os.getenv('SHOVELS_API_KEY')
-        self.base_url: str = base_url or os.getenv('SHOVELS_API_URL') or self.BASE_URL
-        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self._adapter: PoolStatsAdapter = PoolStatsAdapter(
+            pool_connections=self.pool.pool_connections or 10,
+            pool_maxsize=self.pool.maxsize(max_workers),
+            pool_block=self.pool.pool_block,
+        )
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        if not self.pool.keep_alive:
+            self.session.headers['Connection'] = 'close'
+        self.single_flight: SingleFlight | None = SingleFlight() if coalesce else None
+        self._release_lock = threading.Lock()
+        # arguments needed to rebuild an equivalent client in a worker process
+        self._client_config: dict = {
+            "api_key": self.session.headers['X-API-Key'],
+            "base_url": self.base_url,
+            "logger": self.logger,
+            "max_workers": max_workers,
+            "rate_limit": self.rate_limiter,
+            "retry": self.retry,
+            "timeout": timeout,
+            "pool": self.pool,
+            "cache": cache,
+            "release_check_interval": release_check_interval,
+            "dtypes": dtypes,
+            "flatten": self.flatten,
+            "json_decoder": json_decoder,
+            "output": output,
+            "mirror": mirror,
+            "coalesce": coalesce,
+            "page_size": self.page_size,
+        }
+
+    def pool_stats(self) -> dict:
+        """Return usage statistics of the HTTP connection pools.
+
+        Returns
+        -------
+        dict
+            A dictionary with the number of `requests` sent, of
+            `connections_created` to send them, of `connections_reused`
+            (requests sent over an existing connection), of
+            `idle_connections` currently open in the pools and of
+            `requests_coalesced` into an identical request in flight.
+        """
+        stats = {**self._adapter.counters}
+        stats["connections_reused"] = max(stats["requests"] - stats["connections_created"], 0)
+        stats["idle_connections"] = self._adapter.idle_connections()
+        stats["requests_coalesced"] = self.single_flight.coalesced if self.single_flight is not None else 0
+        return stats
 
     def _make_request(
         self,
@@ -112,6 +266,14 @@ class ShovelsAPI:
     ) -> dict | None:
         """Make an HTTP GET request to the Shovels API.
 
+        If the client has a `cache`, cached responses are returned without
+        a network call. With `coalesce`, a request identical to one in
+        flight (without extra keyword arguments) waits for its response.
+        Requests wait for the client's rate limiter. Transient failures
+        (connection errors, timeouts, HTTP 429 and 5xx) are retried with the
+        same parameters according to the client's `RetryPolicy`, after the
+        delay requested by the server or an exponential backoff delay.
+
         Parameters
         ----------
         url : str
@@ -126,16 +288,124 @@ class ShovelsAPI:
         dict | None
             The JSON response from the Shovels API as a dictionary.
             Returns None if the request fails.
+
+        Raises
+        ------
+        requests.RequestException
+            If the request still raises a connection error or a timeout
+            after the last retry.
         """
-        response = self.session.get(url, params=params, **kwargs)
+        if self.single_flight is not None and not kwargs:
+            return self.single_flight.do(DiskCache.make_key(url, params), self._send_request, url, params)
+        return self._send_request(url, params, **kwargs)
+
+    def _send_request(
+        self,
+        url: str,
+        params: dict | None = None,
+        **kwargs
+    ) -> dict | None:
+        """Make an HTTP GET request, without coalescing. See `_make_request`."""
+        cache_key = None
+        if self.cache is not None and url != f"{self.base_url}/meta/release":
+            self._refresh_cache_release()
+            cache_key = DiskCache.make_key(url, params)
+            body = self.cache.get(cache_key)
+            if body is not None:
+                self.logger.debug(f"Cache hit for {url}")
+                return self.decode_json(body)
+        kwargs.setdefault("timeout", self.timeout)
+        max_retries = self.retry.max_retries
+        for attempt in range(max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                tic = time.perf_counter()
+                response = self.session.get(url, params=params, **kwargs)
+                elapsed = time.perf_counter() - tic
+            except RETRYABLE_EXCEPTIONS as e:
+                if attempt == max_retries:
+                    raise
+                delay = self.retry.backoff(attempt)
+                self.logger.warning(f"Error fetching {url}: {e!r}, retrying in {delay:.1f}s ({attempt+1}/{max_retries})")
+                time.sleep(delay)
+                continue
+            paused = self.rate_limiter.update_from_headers(response.headers)
+            if not self.retry.is_retryable(response.status_code) or attempt == max_retries:
+                break
+            if paused is None:
+                delay = self.retry.backoff(attempt)
+                if response.status_code == 429:
+                    # hold back every request sharing the limiter, not just this one
+                    self.rate_limiter.pause(delay)
+                else:
+                    time.sleep(delay)
+            else:
+                delay = paused
+            self.logger.warning(f"Error fetching {url}: HTTP Error {response.status_code}, retrying in {delay:.1f}s ({attempt+1}/{max_retries})")
         if response.status_code != 200:
             self.logger.error(f"Error fetching {url}: HTTP Error {response.status_code}: {response.text}")
             return
-        result = response.json()
+        LAST_RESPONSE.set((elapsed, len(response.content)))
+        result = self.decode_json(response.content)
+        if cache_key is not None:
+            self.cache.set(cache_key, response.content)
         self.logger.debug(f"Number of items returned: {result.get('size', 0)}")
         return result
+
+    def _refresh_cache_release(self) -> None:
+        """Clear the cache if a new data release was published since the last check."""
+        with self._release_lock:
+            if time.time() - self._release_checked_at < self.release_check_interval:
+                return
+            self._release_checked_at = time.time()
+            url = f"{self.base_url}/meta/release"
+            try:
+                # sent past the reference cache, which may still hold the previous release
+                content = self._send_request(url)
+                release = datetime.date.fromisoformat(content["released_at"])
+            except Exception:
+                self.logger.warning("Could not fetch the data release date, keeping cached responses")
+                return
+            if self.reference_cache is not None:
+                self.reference_cache.set(DiskCache.make_key(url), content)
+            if self.cache.set_release(release.isoformat()):
+                self.logger.info(f"Data release {release}: cleared the response cache")
     
-    def _make_paginated_request(
+    def _make_reference_request(
+        self,
+        url: str,
+        params: dict | None = None
+    ) -> dict | None:
+        """Make a request whose response is memoized in `reference_cache`.
+
+        Failed requests are not memoized. The returned dictionary is a copy
+        of the memoized response, which can be modified.
+
+        Parameters
+        ----------
+        url : str
+            The URL to make the request to.
+        params : dict, optional
+            The parameters to pass to the request. Default is None.
+
+        Returns
+        -------
+        dict | None
+            The JSON response from the Shovels API as a dictionary.
+            Returns None if the request fails.
+        """
+        if self.reference_cache is None:
+            return self._make_request(url, params)
+        key = DiskCache.make_key(url, params)
+        content = self.reference_cache.get(key)
+        if content is MISSING:
+            content = self._make_request(url, params)
+            if content is not None:
+                self.reference_cache.set(key, content)
+        # callers get their own copy, so that modifying it does not alter the cache
+        return copy.deepcopy(content)
+
+    def _iter_pages(
         self,
         url: str,
         params: dict | None = None,
@@ -144,10 +414,11 @@ class ShovelsAPI:
         cursor: str | None = None,
         max_iterations: int | None = None,
         **kwargs
-    ) -> List[dict]:
-        """Make a paginated request to the Shovels API.
+    ) -> Iterator[dict]:
+        """Yield the pages of a paginated request to the Shovels API.
 
-        This method handles both cursor-based and page-based pagination.
+        This method handles both cursor-based and page-based pagination. Each
+        page is requested only once the previous one has been consumed.
 
         Parameters
         ----------
@@ -170,10 +441,10 @@ class ShovelsAPI:
         **kwargs : dict, optional
             Keyword arguments passed to the `_make_request` method.
 
-        Returns
-        -------
-        List[dict]
-            A list of all items fetched from the Shovels API across pages.
+        Yields
+        ------
+        dict
+            The JSON response for each page, with the page items under `items`.
 
         Raises
         ------
@@ -181,52 +452,217 @@ class ShovelsAPI:
             If `page` is not greater than or equal to 1 (if provided).
         AssertionError
             If `size` is not between 1 and 100 (if provided).
+        IncompleteResultsError
+            If a page cannot be fetched, after the pages before it were
+            yielded.
         """
-        assert page is None or page >= 1, "page must be greater than or equal to 1"
-        assert size is None or 1 <= size <= 100, "size must be between 1 and 100"
-        results: List[dict] = []
-        i = 0
-        _params = {**params} if params else {}
-        self.logger.info(f"Request params: {_params}" if _params else "No params")
-        tic = time.time()
-        while True:
-            try:
-                i += 1
-                if cursor:
-                    _params["cursor"] = cursor
-                if page:
-                    _params["page"] = page
-                if size:
-                    _params["size"] = size
-
-                self.logger.debug(f"Iteration {i}: Page {page}, Cursor {cursor}, Size {size}")
-                content = self._make_request(url, _params, **kwargs)
-                if content is None:  # request failed
+        chain = self._page_chain(params, page, size, cursor, max_iterations)
+        yield from self._iter_chain(url, chain, **kwargs)
+
+    def _iter_chain(self, url: str, chain: PageChain, **kwargs) -> Iterator[dict]:
+        """Yield the pages of the paginated request tracked by `chain`. See `_iter_pages`."""
+        try:
+            while True:
+                position = chain.position
+                params = chain.next_params()
+                try:
+                    content = self._make_request(url, params, **kwargs)
+                except Exception as e:
+                    stack_trace = traceback.format_exc()
+                    self.logger.error(f"Error fetching {position}")
+                    self.logger.error(stack_trace)
+                    raise IncompleteResultsError(f"Error fetching {url} at {position}: results are incomplete", {url: params}) from e
+                if content is None:  # request failed after all retries
+                    self.logger.error(f"Stopping at {position}: results are incomplete")
+                    raise IncompleteResultsError(f"Could not fetch {url} at {position}: results are incomplete", {url: params})
+                has_next = chain.advance(content)
+                yield content
+                if not has_next:
                     break
+        finally:
+            chain.log_stats()
+
+    def _make_paginated_request(
+        self,
+        url: str,
+        params: dict | None = None,
+        page: int | None = None,
+        size: int | None = None,
+        cursor: str | None = None,
+        max_iterations: int | None = None,
+        **kwargs
+    ) -> List[dict]:
+        """Make a paginated request to the Shovels API.
+
+        This method handles both cursor-based and page-based pagination.
+        See `_iter_pages` for parameter details.
+
+        Returns
+        -------
+        List[dict]
+            A list of all items fetched from the Shovels API across pages.
+        """
+        results: List[dict] = []
+        try:
+            for content in self._iter_pages(url, params, page, size, cursor, max_iterations, **kwargs):
                 results.extend(content.get("items", []))
-                if max_iterations is not None and i == max_iterations:
-                    break
-                if 'next_cursor' in content:
-                    if content["next_cursor"] is None:
-                        break
-                    cursor = content["next_cursor"]
-                elif 'next_page' in content:
-                    if content["next_page"] is None:
-                        break
-                    page = content["next_page"]
-                else:
-                    break
-            except Exception:
+        except IncompleteResultsError as e:
+            e.result = results
+            raise
+        return results
+
+    def _collect_paginated(
+        self,
+        url: str,
+        params: dict | None = None,
+        page: int | None = None,
+        size: int | None = None,
+        cursor: str | None = None,
+        max_iterations: int | None = None,
+        sink: ParquetSink | None = None,
+        partition: dict | None = None,
+        seen: SeenIds | None = None,
+        checkpoint: CheckpointStore | None = None,
+        resume: bool = False,
+        **kwargs
+    ) -> ColumnarBuilder:
+        """Make a paginated request, accumulating the items column by column.
+
+        If `sink` is given, each page is written to it as soon as it is
+        received instead, under the `partition` values (e.g.,
+        `{"geo_id": "CA"}`), and the returned builder is empty.
+        With `seen`, items already returned for another ID of the same
+        call are dropped as pages are received.
+        With `checkpoint`, every page is recorded with the position of the
+        next one. If `resume` is True, the checkpointed pages are restored
+        and the request continues from the next page, or is skipped if it
+        had completed; otherwise its checkpoint is reset.
+
+        See `_iter_pages` for parameter details.
+
+        Returns
+        -------
+        ColumnarBuilder
+            The items fetched from the Shovels API across pages.
+        """
+        collector = self._page_collector(url, params, sink, partition, seen, checkpoint, resume)
+        state = collector.restore(resume)
+        if state is not None:
+            if state["done"]:
+                return collector.builder
+            cursor = state["cursor"] or cursor
+            page = state["page"] or page
+            # page numbers are offsets in units of the page size of the interrupted run
+            if state["page"]:
+                size = state["size"] or size
+        chain = self._page_chain(params, page, size, cursor, max_iterations)
+        try:
+            for content in self._iter_chain(url, chain, **kwargs):
+                kept = collector.add(content)
+                files = None
+                if sink is not None:
+                    files = sink.write_files(kept, partition or {})
+                collector.save(content, chain.size, files)
+        except IncompleteResultsError as e:
+            e.result = collector.builder
+            raise
+        return collector.builder
+
+    def _fan_out(
+        self,
+        ids: List[str],
+        fetch: Callable[[str], Any],
+        description: str,
+        max_workers: int | None = None
+    ) -> list:
+        """Run `fetch` for every ID and collect the results.
+
+        IDs are fetched on a pool of `max_workers` threads. Results are
+        returned in the order of `ids`, regardless of completion order.
+        A failure for one ID is logged without affecting the others.
+
+        Parameters
+        ----------
+        ids : List[str]
+            The IDs to fetch.
+        fetch : Callable[[str], Any]
+            A function returning the result for a single ID
+            (e.g., a `ColumnarBuilder` or a list of items).
+        description : str
+            A description of the fetched data used in log messages
+            (e.g., "permits for geo_id").
+        max_workers : int, optional
+            The number of threads. Default is None, which uses the client's
+            `max_workers`.
+
+        Returns
+        -------
+        FanOutResults
+            The result of `fetch` for each ID, with the IDs whose fetch
+            failed in `failed`. The result of a failed ID is the partial
+            result of its `IncompleteResultsError`, or None.
+        """
+        max_workers = max_workers or self.max_workers
+        failed = {}
+
+        def _fetch_one(i: int, _id: str):
+            self.logger.info(f"Fetching {description}: {_id} ({i+1}/{len(ids)})")
+            try:
+                return fetch(_id)
+            except Exception as e:
                 stack_trace = traceback.format_exc()
-                idx_str = f"cursor {cursor}" if cursor else f"page {page}"
-                self.logger.error(f"Error fetching {idx_str}")
+                self.logger.error(f"Error fetching {description}: {_id}")
                 self.logger.error(stack_trace)
-                break
-        toc = time.time()
-        self.logger.info(f"Time to complete request: {elapsed_time_str(toc - tic)}")
-        self.logger.info(f"Total number of items returned: {len(results)}")
-        self.logger.info(f"Number of individual requests made: {i}")
-        return results
+                return self._fetch_failed(failed, _id, e)
+
+        self.logger.info('--------------------------------')
+        self.logger.info(f"Fetching {description} for {len(ids)} IDs: {ids}")
+        if max_workers == 1 or len(ids) <= 1:
+            chunks = [_fetch_one(i, _id) for i, _id in enumerate(ids)]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(ids))) as executor:
+                chunks = list(executor.map(_fetch_one, range(len(ids)), ids))
+        self.logger.info('--------------------------------')
+        return FanOutResults(chunks, failed)
+
+    def _collect_by_ids(
+        self,
+        url: str,
+        ids: Iterable[str] | str,
+        description: str,
+        **kwargs
+    ) -> tuple:
+        """Fetch items by ID from a by-ID endpoint, in chunks of `MAX_IDS_PER_REQUEST`.
+
+        Duplicate IDs are dropped before sending, chunks are fetched in
+        parallel (see `max_workers`) and items are returned in the order
+        of the first occurrence of their ID in `ids`.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the by-ID endpoint, taking the IDs as `id` parameters.
+        ids : Iterable[str] | str
+            A single ID (string) or an iterable of IDs of any length.
+        description : str
+            A description of the fetched data used in log messages
+            (e.g., "permits by ID").
+        **kwargs : dict, optional
+            Keyword arguments passed to the `_make_paginated_request` method.
+
+        Returns
+        -------
+        tuple
+            The items fetched from the Shovels API, in a `ColumnarBuilder`,
+            and the `FanOutResults` of the chunks.
+        """
+        unique_ids, chunks = self._id_chunks(ids)
+
+        def fetch(chunk: str) -> List[dict]:
+            return self._make_paginated_request(url, {"id": chunks[chunk]}, **kwargs)
+
+        results = self._fan_out(list(chunks), fetch, description)
+        return self._order_by_ids(unique_ids, results), results
 
     # region: location & residents
     def search_location(self, query: str, level: str) -> List[dict]:
@@ -240,6 +676,8 @@ class ShovelsAPI:
         - https://docs.shovels.ai/api-reference/cities/search-cities
         - https://docs.shovels.ai/api-reference/addresses/search-addresses
 
+        Results are memoized in the client's `reference_cache`.
+
         Parameters
         ----------
         query : str
@@ -256,7 +694,7 @@ class ShovelsAPI:
         """
         url = f"{self.base_url}/{level}/search"
         params = {"q": query}
-        content = self._make_request(url, params)
+        content = self._make_reference_request(url, params)
         if content is None:
             return []
         return content.get("items", [])
@@ -266,8 +704,10 @@ class ShovelsAPI:
         geo_ids: Iterable[str] | str,
         level: str,
         params: dict,
+        sink: ParquetSink | None = None,
+        output: str | None = None,
         **kwargs
-    ) -> pd.DataFrame:
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list | SinkManifest:
         """Get monthly metrics for specific locations by their Geo IDs.
 
         This method aggregates the following endpoints:
@@ -289,50 +729,58 @@ class ShovelsAPI:
             `metric_to` defaults to today if not provided.
             `property_type` and `tag` are required within this dictionary.
             Default is None.
+        sink : ParquetSink, optional
+            A sink that each page is written to as soon as it is received,
+            partitioned by `geo_id`, instead of building a DataFrame.
+            Default is None.
+        output : str, optional
+            The result format: "pandas" (DataFrame), "arrow" (`pyarrow.Table`),
+            "polars" (`polars.DataFrame`), "records" or "list" (list of
+            dicts). Default is None, which uses the client's `output`.
         **kwargs : dict, optional
             Keyword arguments passed to the `_make_paginated_request` method.
 
         Returns
         -------
-        pd.DataFrame
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list | SinkManifest
             A DataFrame containing the monthly metrics for the specified
             locations.
+            In the format given by `output`.
+            If `sink` is given, the manifest of the files written instead.
 
         Raises
         ------
         AssertionError
             If `property_type` or `tag` is not provided in the `params` argument.
         """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        if sink is not None:
+            sink.bind("metrics")
         if isinstance(geo_ids, str):
             geo_ids = [geo_ids]
-        results: List[dict] = []
         _params = {**params} if params else {}
-        _params["metric_from"] = _params.get("metric_from") or (datetime.date.today() - datetime.timedelta(days=180)).strftime("%Y-%m-%d")
-        _params["metric_to"] = _params.get("metric_to") or datetime.date.today().strftime("%Y-%m-%d")
+        _params = default_date_range(_params, "metric_from", "metric_to")
         assert "property_type" in _params, "property_type is required for monthly metrics"
         assert "tag" in _params, "tag is required for monthly metrics"
-        self.logger.info('--------------------------------')
-        self.logger.info(f"Fetching monthly metrics for {len(geo_ids)} geo IDs: {geo_ids}")
-        for i, geo_id in enumerate(geo_ids):
+
+        def fetch(geo_id: str) -> ColumnarBuilder:
             url = f"{self.base_url}/{level}/{geo_id}/metrics/monthly"
-            self.logger.info(f"Fetching monthly metrics for geo ID: {geo_id} ({i+1}/{len(geo_ids)})")
-            try:
-                results.extend(self._make_paginated_request(url, _params, **kwargs))
-            except Exception:
-                stack_trace = traceback.format_exc()
-                self.logger.error(f"Error fetching monthly metrics for location ID: {geo_id}")
-                self.logger.error(stack_trace)
-                continue
-        self.logger.info('--------------------------------')
-        return pd.DataFrame(results)
+            return self._collect_paginated(url, _params, sink=sink, partition={"geo_id": geo_id}, **kwargs)
+
+        builders = self._fan_out(list(geo_ids), fetch, "monthly metrics for geo ID")
+        if sink is not None:
+            return self._complete(builders, sink.manifest())
+        return self._complete(builders, self._build(ColumnarBuilder.concat(builders), "metrics", output))
 
     def get_location_current_metrics(
         self,
         geo_ids: Iterable[str] | str,
         level: str,
         params: dict,
+        sink: ParquetSink | None = None,
+        output: str | None = None,
         **kwargs
-    ) -> pd.DataFrame:
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list | SinkManifest:
         """Get current metrics for specific locations by their Geo IDs.
 
         This method aggregates the following endpoints:
@@ -352,40 +800,47 @@ class ShovelsAPI:
             A dictionary of parameters to filter the metrics.
             `property_type` and `tag` are required within this dictionary.
             Default is None.
+        sink : ParquetSink, optional
+            A sink that each page is written to as soon as it is received,
+            partitioned by `geo_id`, instead of building a DataFrame.
+            Default is None.
+        output : str, optional
+            The result format: "pandas" (DataFrame), "arrow" (`pyarrow.Table`),
+            "polars" (`polars.DataFrame`), "records" or "list" (list of
+            dicts). Default is None, which uses the client's `output`.
         **kwargs : dict, optional
             Keyword arguments passed to the `_make_paginated_request` method.
 
         Returns
         -------
-        pd.DataFrame
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list | SinkManifest
             A DataFrame containing the current metrics for the specified
             locations.
+            In the format given by `output`.
+            If `sink` is given, the manifest of the files written instead.
 
         Raises
         ------
         AssertionError
             If `property_type` or `tag` is not provided in the `params` argument.
         """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        if sink is not None:
+            sink.bind("metrics")
         if isinstance(geo_ids, str):
             geo_ids = [geo_ids]
-        results: List[dict] = []
         _params = {**params} if params else {}
         assert "property_type" in _params, "property_type is required for current metrics"
         assert "tag" in _params, "tag is required for current metrics"
-        self.logger.info('--------------------------------')
-        self.logger.info(f"Fetching current metrics for {len(geo_ids)} geo IDs: {geo_ids}")
-        for i, geo_id in enumerate(geo_ids):
+
+        def fetch(geo_id: str) -> ColumnarBuilder:
             url = f"{self.base_url}/{level}/{geo_id}/metrics/current"
-            self.logger.info(f"Fetching current metrics for geo ID: {geo_id} ({i+1}/{len(geo_ids)})")
-            try:
-                results.extend(self._make_paginated_request(url, _params, **kwargs))
-            except Exception:
-                stack_trace = traceback.format_exc()
-                self.logger.error(f"Error fetching current metrics for geo ID: {geo_id}")
-                self.logger.error(stack_trace)
-                continue
-        self.logger.info('--------------------------------')
-        return pd.DataFrame(results)
+            return self._collect_paginated(url, _params, sink=sink, partition={"geo_id": geo_id}, **kwargs)
+
+        builders = self._fan_out(list(geo_ids), fetch, "current metrics for geo ID")
+        if sink is not None:
+            return self._complete(builders, sink.manifest())
+        return self._complete(builders, self._build(ColumnarBuilder.concat(builders), "metrics", output))
 
     def get_location_details(
         self,
@@ -420,27 +875,23 @@ class ShovelsAPI:
         assert level != 'addresses', 'For addresses, use the get_residents method.'
         if isinstance(geo_ids, str):
             geo_ids = [geo_ids]
-        results: List[dict] = []
-        self.logger.info('--------------------------------')
-        self.logger.info(f"Fetching details for {len(geo_ids)} geo IDs: {geo_ids}")
         url = f"{self.base_url}/{level}"
-        for i, geo_id in enumerate(geo_ids):
-            self.logger.info(f"Fetching details for geo ID: {geo_id} ({i+1}/{len(geo_ids)})")
-            try:
-                results.extend(self._make_paginated_request(url, {"geo_id": geo_id}, **kwargs))
-            except Exception:
-                stack_trace = traceback.format_exc()
-                self.logger.error(f"Error fetching details for geo ID: {geo_id}")
-                self.logger.error(stack_trace)
-                continue
-        self.logger.info('--------------------------------')
-        return results
+
+        def fetch(geo_id: str) -> List[dict]:
+            return self._make_paginated_request(url, {"geo_id": geo_id}, **kwargs)
+
+        chunks = self._fan_out(list(geo_ids), fetch, "details for geo ID")
+        return self._complete(chunks, [item for chunk in chunks if chunk for item in chunk])
 
     def get_residents(
         self,
         geo_ids: Iterable[str] | str,
+        sink: ParquetSink | None = None,
+        checkpoint: CheckpointStore | None = None,
+        resume: bool = False,
+        output: str | None = None,
         **kwargs
-    ) -> pd.DataFrame:
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list | SinkManifest:
         """Fetch residents for given geographical IDs (typically address IDs).
 
         Refer to the official Shovels API documentation for detailed
@@ -451,31 +902,49 @@ class ShovelsAPI:
         ----------
         geo_ids : Iterable[str] | str
             A single Geo ID (string) or an iterable of Geo IDs to fetch residents for.
+        sink : ParquetSink, optional
+            A sink that each page is written to as soon as it is received,
+            partitioned by `geo_id`, instead of building a DataFrame.
+            Default is None.
+        checkpoint : CheckpointStore, optional
+            A store recording the progress of each geo ID, page by page, so
+            that an interrupted call can be resumed. Default is None.
+        resume : bool, optional
+            Whether to resume from `checkpoint`: completed geo IDs are
+            restored without any request and in-flight ones continue from
+            their next page. If False, the checkpoints of the call are reset.
+            A warning is logged if no earlier run of the call is checkpointed.
+            Default is False.
+        output : str, optional
+            The result format: "pandas" (DataFrame), "arrow" (`pyarrow.Table`),
+            "polars" (`polars.DataFrame`), "records" (list of `Resident`
+            records) or "list" (list of dicts). Default is None, which uses
+            the client's `output`.
         **kwargs : dict, optional
             Keyword arguments passed to the `_make_paginated_request` method.
 
         Returns
         -------
-        pd.DataFrame
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list | SinkManifest
             A DataFrame containing resident data for all specified geo_ids.
+            In the format given by `output`.
+            If `sink` is given, the manifest of the files written instead.
         """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        if sink is not None:
+            sink.bind("residents")
+        self._resolve_call(f"{self.base_url}/addresses/{{geo_id}}/residents", None, {}, checkpoint, resume)
         if isinstance(geo_ids, str):
             geo_ids = [geo_ids]
-        results: List[dict] = []
-        self.logger.info('--------------------------------')
-        self.logger.info(f'Starting to fetch residents for {len(geo_ids)} geo_ids')
-        for i, geo_id in enumerate(geo_ids):
+
+        def fetch(geo_id: str) -> ColumnarBuilder:
             url = f"{self.base_url}/addresses/{geo_id}/residents"
-            self.logger.info(f'Fetching residents for geo_id: {geo_id} ({i+1}/{len(geo_ids)})')
-            try:
-                results.extend(self._make_paginated_request(url, None, **kwargs))
-            except Exception:
-                stack_trace = traceback.format_exc()
-                self.logger.error(f"Failed to fetch residents for geo_id: {geo_id}")
-                self.logger.error(stack_trace)
-                continue
-        self.logger.info('--------------------------------')
-        return pd.DataFrame(results)
+            return self._collect_paginated(url, None, sink=sink, checkpoint=checkpoint, resume=resume, partition={"geo_id": geo_id}, **kwargs)
+
+        builders = self._fan_out(list(geo_ids), fetch, "residents for geo_id")
+        if sink is not None:
+            return self._complete(builders, sink.manifest())
+        return self._complete(builders, self._build(ColumnarBuilder.concat(builders), "residents", output))
     # endregion: location & residents
 
     # region: contractor
@@ -483,8 +952,13 @@ class ShovelsAPI:
         self,
         geo_ids: Iterable[str] | str | None = None,
         params: dict | None = None,
+        dedupe: bool | str = False,
+        sink: ParquetSink | None = None,
+        checkpoint: CheckpointStore | None = None,
+        resume: bool = False,
+        output: str | None = None,
         **kwargs
-    ) -> pd.DataFrame:
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list | SinkManifest:
         """Search for contractors based on specified criteria.
 
         Refer to the official Shovels API documentation for detailed
@@ -501,45 +975,73 @@ class ShovelsAPI:
             filters like `permit_from`, `permit_to`, `tag_id`, etc.
             The `permit_from` and `permit_to` fields will default to the last
             180 days and today respectively if not provided.
+        dedupe : bool | str, optional
+            Whether to drop items (by `id`) already returned for another
+            geo ID, as pages are received, e.g. when searching a state
+            and its counties. "merge" also lists
+            all the geo_ids each item was returned for in a `query_geo_ids`
+            column; it cannot be used with a `sink`. Default is False.
+        sink : ParquetSink, optional
+            A sink that each page is written to as soon as it is received,
+            partitioned by `geo_id`, instead of building a DataFrame.
+            Default is None.
+        checkpoint : CheckpointStore, optional
+            A store recording the progress of each geo ID, page by page, so
+            that an interrupted call can be resumed. Default is None.
+        resume : bool, optional
+            Whether to resume from `checkpoint`: completed geo IDs are
+            restored without any request and in-flight ones continue from
+            their next page. If False, the checkpoints of the call are reset.
+            The date range defaulted by the interrupted run is reused, and a
+            warning is logged if no earlier run of the call is checkpointed.
+            Default is False.
+        output : str, optional
+            The result format: "pandas" (DataFrame), "arrow" (`pyarrow.Table`),
+            "polars" (`polars.DataFrame`), "records" (list of `Contractor`
+            records) or "list" (list of dicts). Default is None, which uses
+            the client's `output`.
         **kwargs : dict, optional
             Keyword arguments passed to the `_make_paginated_request` method.
 
         Returns
         -------
-        pd.DataFrame
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list | SinkManifest
             A DataFrame containing the search results with contractor data.
             An empty DataFrame is returned if no contractors are found or
             an error occurs during the process for all geo_ids.
+            In the format given by `output`.
+            If `sink` is given, the manifest of the files written instead.
         """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        if sink is not None:
+            sink.bind("contractors")
+        assert not (dedupe == "merge" and sink is not None), "dedupe='merge' cannot be used with a sink"
+        seen = self._seen_ids(dedupe, "geo_id")
         url = f"{self.base_url}/contractors/search"
         if geo_ids is None:
             geo_ids = US_STATES
         if isinstance(geo_ids, str):
             geo_ids = [geo_ids]
         _params = {**params} if params else {}
-        _params["permit_from"] = _params.get("permit_from") or (datetime.date.today() - datetime.timedelta(days=180)).strftime("%Y-%m-%d")
-        _params["permit_to"] = _params.get("permit_to") or datetime.date.today().strftime("%Y-%m-%d")
-        self.logger.info('--------------------------------')
-        self.logger.info(f"Fetching contractors for {len(geo_ids)} geo_ids: {geo_ids}")
-        results: List[dict] = []
-        for i, geo_id in enumerate(geo_ids):
-            self.logger.info(f"Fetching contractors for geo_id: {geo_id} ({i+1}/{len(geo_ids)})")
-            try:
-                _params["geo_id"] = geo_id
-                results.extend(self._make_paginated_request(url, _params, **kwargs))
-            except Exception:
-                stack_trace = traceback.format_exc()
-                self.logger.error(f"Error fetching geo_id {geo_id}")
-                self.logger.error(stack_trace)
-                continue
-        self.logger.info('--------------------------------')
-        return pd.DataFrame(results)
+        _params = default_date_range(_params, "permit_from", "permit_to")
+        _params = self._resolve_call(url, params, _params, checkpoint, resume)
+
+        def fetch(geo_id: str) -> ColumnarBuilder:
+            return self._collect_paginated(url, {**_params, "geo_id": geo_id}, sink=sink, checkpoint=checkpoint, resume=resume, partition={"geo_id": geo_id}, seen=seen, **kwargs)
+
+        builders = self._fan_out(list(geo_ids), fetch, "contractors for geo_id")
+        if seen is not None:
+            self.logger.info(f"Dropped {seen.dropped} duplicate items")
+        if sink is not None:
+            return self._complete(builders, sink.manifest())
+        return self._complete(builders, self._build(ColumnarBuilder.concat(builders), "contractors", output))
     
     def get_contractors_by_id(
         self,
-        contractor_ids: List[str] | str,
+        contractor_ids: Iterable[str] | str,
+        output: str | None = None,
         **kwargs
-    ) -> pd.DataFrame:
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list:
         """Retrieve detailed information for specific contractors by their IDs.
 
         Refer to the official Shovels API documentation for detailed
@@ -548,34 +1050,41 @@ class ShovelsAPI:
 
         Parameters
         ----------
-        contractor_ids : List[str] | str
-            A single contractor ID (string) or a list of contractor IDs to fetch.
-            If a list is provided, its length must be less than or equal to 50.
+        contractor_ids : Iterable[str] | str
+            A single contractor ID (string) or an iterable of contractor IDs to
+            fetch, of any length. Duplicates are dropped and the IDs are sent in
+            chunks of `MAX_IDS_PER_REQUEST`, fetched in parallel
+            (see `max_workers`).
+        output : str, optional
+            The result format: "pandas" (DataFrame), "arrow" (`pyarrow.Table`),
+            "polars" (`polars.DataFrame`), "records" (list of `Contractor`
+            records) or "list" (list of dicts). Default is None, which uses
+            the client's `output`.
         **kwargs : dict, optional
             Keyword arguments passed to the `_make_paginated_request` method.
 
         Returns
         -------
-        pd.DataFrame
-            A DataFrame containing the data for the specified contractor IDs.
-
-        Raises
-        ------
-        AssertionError
-            If `contractor_ids` is a list with length greater than 50.
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list
+            A DataFrame containing the data for the specified contractor IDs,
+            in the order of `contractor_ids`.
+            In the format given by `output`.
         """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
         url = f"{self.base_url}/contractors"
-        if isinstance(contractor_ids, list):
-            assert len(contractor_ids) <= 50, "length of contractor_ids must be less than or equal to 50"
-        params = {"id": contractor_ids}
-        content = self._make_paginated_request(url, params, **kwargs)
-        return pd.DataFrame(content)
+        builder, results = self._collect_by_ids(url, contractor_ids, "contractors by ID", **kwargs)
+        return self._complete(results, self._build(builder, "contractors", output))
 
     def get_permits_by_contractor_id(
         self,
         contractor_ids: Iterable[str] | str,
+        dedupe: bool | str = False,
+        sink: ParquetSink | None = None,
+        checkpoint: CheckpointStore | None = None,
+        resume: bool = False,
+        output: str | None = None,
         **kwargs
-    ) -> pd.DataFrame:
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list | SinkManifest:
         """Fetch permits associated with given contractor IDs.
 
         Refer to the official Shovels API documentation for detailed
@@ -586,38 +1095,67 @@ class ShovelsAPI:
         ----------
         contractor_ids : Iterable[str] | str
             A single contractor ID (string) or an iterable of contractor IDs to fetch permits for.
+        dedupe : bool | str, optional
+            Whether to drop items (by `id`) already returned for another
+            contractor ID, as pages are received. "merge" also lists
+            all the contractor_ids each item was returned for in a `query_contractor_ids`
+            column; it cannot be used with a `sink`. Default is False.
+        sink : ParquetSink, optional
+            A sink that each page is written to as soon as it is received,
+            partitioned by `contractor_id`, instead of building a DataFrame.
+            Default is None.
+        checkpoint : CheckpointStore, optional
+            A store recording the progress of each contractor ID, page by page, so
+            that an interrupted call can be resumed. Default is None.
+        resume : bool, optional
+            Whether to resume from `checkpoint`: completed contractor IDs are
+            restored without any request and in-flight ones continue from
+            their next page. If False, the checkpoints of the call are reset.
+            A warning is logged if no earlier run of the call is checkpointed.
+            Default is False.
+        output : str, optional
+            The result format: "pandas" (DataFrame), "arrow" (`pyarrow.Table`),
+            "polars" (`polars.DataFrame`), "records" (list of `Permit`
+            records) or "list" (list of dicts). Default is None, which uses
+            the client's `output`.
         **kwargs : dict, optional
             Keyword arguments passed to the `_make_paginated_request` method.
 
         Returns
         -------
-        pd.DataFrame
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list | SinkManifest
             A DataFrame containing permit data for all specified contractor IDs.
+            In the format given by `output`.
+            If `sink` is given, the manifest of the files written instead.
         """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        if sink is not None:
+            sink.bind("permits")
+        assert not (dedupe == "merge" and sink is not None), "dedupe='merge' cannot be used with a sink"
+        seen = self._seen_ids(dedupe, "contractor_id")
+        self._resolve_call(f"{self.base_url}/contractors/{{contractor_id}}/permits", None, {}, checkpoint, resume)
         if isinstance(contractor_ids, str):
             contractor_ids = [contractor_ids]
-        results: List[dict] = []
-        self.logger.info('--------------------------------')
-        self.logger.info(f'Starting to fetch permits for {len(contractor_ids)} contractors')
-        for i, cid in enumerate(contractor_ids):
+
+        def fetch(cid: str) -> ColumnarBuilder:
             url = f"{self.base_url}/contractors/{cid}/permits"
-            self.logger.info(f'Fetching permits for contractor ID: {cid} ({i+1}/{len(contractor_ids)})')
-            try:
-                results.extend(self._make_paginated_request(url, None, **kwargs))
-            except Exception as e:
-                stack_trace = traceback.format_exc()
-                self.logger.error(f"Failed to fetch permits for contractor ID: {cid}")
-                self.logger.error(stack_trace)
-                continue
-        self.logger.info('--------------------------------')
-        return pd.DataFrame(results)
+            return self._collect_paginated(url, None, sink=sink, checkpoint=checkpoint, resume=resume, partition={"contractor_id": cid}, seen=seen, **kwargs)
+
+        builders = self._fan_out(list(contractor_ids), fetch, "permits for contractor ID")
+        if seen is not None:
+            self.logger.info(f"Dropped {seen.dropped} duplicate items")
+        if sink is not None:
+            return self._complete(builders, sink.manifest())
+        return self._complete(builders, self._build(ColumnarBuilder.concat(builders), "permits", output))
     
     def get_filtered_metrics_by_contractor_id(
         self,
         contractor_ids: List[str] | str,
         params: dict,
+        sink: ParquetSink | None = None,
+        output: str | None = None,
         **kwargs
-    ) -> pd.DataFrame:
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list | SinkManifest:
         """Get monthly filtered metrics for specific contractors by their IDs.
 
         Refer to the official Shovels API documentation for detailed
@@ -635,48 +1173,56 @@ class ShovelsAPI:
             `metric_to` defaults to today if not provided.
             `property_type` and `tag` are required within this dictionary.
             Default is None.
+        sink : ParquetSink, optional
+            A sink that each page is written to as soon as it is received,
+            partitioned by `contractor_id`, instead of building a DataFrame.
+            Default is None.
+        output : str, optional
+            The result format: "pandas" (DataFrame), "arrow" (`pyarrow.Table`),
+            "polars" (`polars.DataFrame`), "records" or "list" (list of
+            dicts). Default is None, which uses the client's `output`.
         **kwargs : dict, optional
             Keyword arguments passed to the `_make_paginated_request` method.
 
         Returns
         -------
-        pd.DataFrame
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list | SinkManifest
             A DataFrame containing the filtered metrics for the specified
             contractor IDs.
+            In the format given by `output`.
+            If `sink` is given, the manifest of the files written instead.
 
         Raises
         ------
         AssertionError
             If `property_type` or `tag` is not provided in the `params` argument.
         """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        if sink is not None:
+            sink.bind("metrics")
         if isinstance(contractor_ids, str):
             contractor_ids = [contractor_ids]
         _params = {**params} if params else {}
-        _params["metric_from"] = _params.get("metric_from") or (datetime.date.today() - datetime.timedelta(days=180)).strftime("%Y-%m-%d")
-        _params["metric_to"] = _params.get("metric_to") or datetime.date.today().strftime("%Y-%m-%d")
+        _params = default_date_range(_params, "metric_from", "metric_to")
         assert "property_type" in _params, "property_type is required for filtered metrics"
         assert "tag" in _params, "tag is required for filtered metrics"
-        results: List[dict] = []
-        self.logger.info('--------------------------------')
-        self.logger.info(f"Fetching metrics for {len(contractor_ids)} contractor IDs: {contractor_ids}")
-        for i, contractor_id in enumerate(contractor_ids):
+
+        def fetch(contractor_id: str) -> ColumnarBuilder:
             url = f"{self.base_url}/contractors/{contractor_id}/metrics"
-            self.logger.info(f"Fetching metrics for contractor ID: {contractor_id} ({i+1}/{len(contractor_ids)})")
-            try:
-                results.extend(self._make_paginated_request(url, _params, **kwargs))
-            except Exception:
-                stack_trace = traceback.format_exc()
-                self.logger.error(f"Error fetching metrics for contractor ID: {contractor_id}")
-                self.logger.error(stack_trace)
-                continue
-        self.logger.info('--------------------------------')
-        return pd.DataFrame(results)
+            return self._collect_paginated(url, _params, sink=sink, partition={"contractor_id": contractor_id}, **kwargs)
+
+        builders = self._fan_out(list(contractor_ids), fetch, "metrics for contractor ID")
+        if sink is not None:
+            return self._complete(builders, sink.manifest())
+        return self._complete(builders, self._build(ColumnarBuilder.concat(builders), "metrics", output))
 
     def list_contractor_employees(
         self,
         contractor_ids: List[str] | str,
+        sink: ParquetSink | None = None,
+        output: str | None = None,
         **kwargs
-    ) -> pd.DataFrame:
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list | SinkManifest:
         """List employees for specific contractors by their IDs.
 
         Refer to the official Shovels API documentation for detailed
@@ -687,32 +1233,39 @@ class ShovelsAPI:
         ----------
         contractor_ids : List[str] | str
             A single contractor ID (string) or a list of contractor IDs to list employees for.
+        sink : ParquetSink, optional
+            A sink that each page is written to as soon as it is received,
+            partitioned by `contractor_id`, instead of building a DataFrame.
+            Default is None.
+        output : str, optional
+            The result format: "pandas" (DataFrame), "arrow" (`pyarrow.Table`),
+            "polars" (`polars.DataFrame`), "records" or "list" (list of
+            dicts). Default is None, which uses the client's `output`.
         **kwargs : dict, optional
             Keyword arguments passed to the `_make_paginated_request` method.
 
         Returns
         -------
-        pd.DataFrame
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list | SinkManifest
             A DataFrame containing employee data for the specified
             contractor IDs.
+            In the format given by `output`.
+            If `sink` is given, the manifest of the files written instead.
         """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        if sink is not None:
+            sink.bind("employees")
         if isinstance(contractor_ids, str):
             contractor_ids = [contractor_ids]
-        results: List[dict] = []
-        self.logger.info('--------------------------------')
-        self.logger.info(f"Fetching employees for {len(contractor_ids)} contractor IDs: {contractor_ids}")
-        for i, contractor_id in enumerate(contractor_ids):
+
+        def fetch(contractor_id: str) -> ColumnarBuilder:
             url = f"{self.base_url}/contractors/{contractor_id}/employees"
-            self.logger.info(f"Fetching employees for contractor ID: {contractor_id} ({i+1}/{len(contractor_ids)})")
-            try:
-                results.extend(self._make_paginated_request(url, None, **kwargs))
-            except Exception:
-                stack_trace = traceback.format_exc()
-                self.logger.error(f"Error fetching employees for contractor ID: {contractor_id}")
-                self.logger.error(stack_trace)
-                continue
-        self.logger.info('--------------------------------')
-        return pd.DataFrame(results)
+            return self._collect_paginated(url, None, sink=sink, partition={"contractor_id": contractor_id}, **kwargs)
+
+        builders = self._fan_out(list(contractor_ids), fetch, "employees for contractor ID")
+        if sink is not None:
+            return self._complete(builders, sink.manifest())
+        return self._complete(builders, self._build(ColumnarBuilder.concat(builders), "employees", output))
     # endregion: contractor
 
     # region: permit
@@ -720,8 +1273,14 @@ class ShovelsAPI:
         self,
         geo_ids: Iterable[str] | str | None = None,
         params: dict | None = None,
+        split_windows: str | None = None,
+        dedupe: bool | str = False,
+        sink: ParquetSink | None = None,
+        checkpoint: CheckpointStore | None = None,
+        resume: bool = False,
+        output: str | None = None,
         **kwargs
-    ) -> pd.DataFrame:
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list | SinkManifest:
         """Search for permits based on specified criteria.
 
         Refer to the official Shovels API documentation for detailed
@@ -739,45 +1298,99 @@ class ShovelsAPI:
             `valuation_min`, `valuation_max`, etc.
             The `permit_from` and `permit_to` fields will default to the last
             180 days and today respectively if not provided.
+        split_windows : str, optional
+            Splits the `permit_from`/`permit_to` range of each geo ID into
+            sub-windows that are fetched in parallel, on `max_workers` threads
+            but at least 4, which speeds up large single-geo searches whose
+            cursor chain would otherwise be fetched one page at a time.
+            Permits returned by more than one window are deduplicated by `id`,
+            unless they are written to a `sink`.
+            Options: "monthly", "weekly", "equal" (4 windows of equal length
+            per thread). The windows are set before any request, whatever the
+            number of permits in each: a dense window is fetched as a single
+            cursor chain and is not split any further.
+            Default is None, which does not split the range.
+        dedupe : bool | str, optional
+            Whether to drop items (by `id`) already returned for another
+            geo ID, as pages are received, e.g. when searching a state
+            and its counties. "merge" also lists
+            all the geo_ids each item was returned for in a `query_geo_ids`
+            column; it cannot be used with a `sink`. Default is False.
+        sink : ParquetSink, optional
+            A sink that each page is written to as soon as it is received,
+            partitioned by `geo_id`, instead of building a DataFrame.
+            Default is None.
+        checkpoint : CheckpointStore, optional
+            A store recording the progress of each geo ID, page by page, so
+            that an interrupted call can be resumed. Default is None.
+        resume : bool, optional
+            Whether to resume from `checkpoint`: completed geo IDs are
+            restored without any request and in-flight ones continue from
+            their next page. If False, the checkpoints of the call are reset.
+            The date range defaulted by the interrupted run is reused, and a
+            warning is logged if no earlier run of the call is checkpointed.
+            Default is False.
+        output : str, optional
+            The result format: "pandas" (DataFrame), "arrow" (`pyarrow.Table`),
+            "polars" (`polars.DataFrame`), "records" (list of `Permit`
+            records) or "list" (list of dicts). Default is None, which uses
+            the client's `output`.
         **kwargs : dict, optional
             Keyword arguments passed to the `_make_paginated_request` method.
 
         Returns
         -------
-        pd.DataFrame
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list | SinkManifest
             A DataFrame containing the search results with permit data.
             An empty DataFrame is returned if no permits are found or
             an error occurs during the process for all geo_ids.
+            In the format given by `output`.
+            If `sink` is given, the manifest of the files written instead.
         """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        if sink is not None:
+            sink.bind("permits")
+        assert not (dedupe == "merge" and sink is not None), "dedupe='merge' cannot be used with a sink"
+        seen = self._seen_ids(dedupe, "geo_id")
         url = f"{self.base_url}/permits/search"
         if geo_ids is None:
             geo_ids = US_STATES
         if isinstance(geo_ids, str):
             geo_ids = [geo_ids]
         _params = {**params} if params else {}
-        _params["permit_from"] = _params.get("permit_from") or (datetime.date.today() - datetime.timedelta(days=180)).strftime("%Y-%m-%d")
-        _params["permit_to"] = _params.get("permit_to") or datetime.date.today().strftime("%Y-%m-%d")
-        self.logger.info('--------------------------------')
-        self.logger.info(f"Fetching permits for {len(geo_ids)} geo_ids: {geo_ids}")
-        results: List[dict] = []
-        for i, geo_id in enumerate(geo_ids):
-            self.logger.info(f"Fetching permits for geo_id: {geo_id} ({i+1}/{len(geo_ids)})")
-            try:
-                _params["geo_id"] = geo_id
-                results.extend(self._make_paginated_request(url, _params, **kwargs))
-            except Exception:
-                stack_trace = traceback.format_exc()
-                self.logger.error(f"Error fetching geo_id {geo_id}")
-                self.logger.error(stack_trace)
-                continue
-        self.logger.info('--------------------------------')
-        return pd.DataFrame(results)
+        _params = default_date_range(_params, "permit_from", "permit_to")
+        _params = self._resolve_call(url, params, _params, checkpoint, resume)
+        if split_windows is not None:
+            window_workers = max(self.max_workers, WINDOW_WORKERS)
+            tasks = self._window_tasks(list(geo_ids), _params, split_windows, window_workers * 4)
+
+            def fetch_window(task: str) -> ColumnarBuilder:
+                geo_id, window_params = tasks[task]
+                return self._collect_paginated(url, window_params, sink=sink, checkpoint=checkpoint, resume=resume, partition={"geo_id": geo_id}, seen=seen, **kwargs)
+
+            builders = self._fan_out(list(tasks), fetch_window, "permits for geo_id and window", window_workers)
+            if seen is not None:
+                self.logger.info(f"Dropped {seen.dropped} duplicate items")
+            if sink is not None:
+                return self._complete(builders, sink.manifest())
+            return self._complete(builders, self._build(self._stitch_windows(tasks, builders), "permits", output))
+
+        def fetch(geo_id: str) -> ColumnarBuilder:
+            return self._collect_paginated(url, {**_params, "geo_id": geo_id}, sink=sink, checkpoint=checkpoint, resume=resume, partition={"geo_id": geo_id}, seen=seen, **kwargs)
+
+        builders = self._fan_out(list(geo_ids), fetch, "permits for geo_id")
+        if seen is not None:
+            self.logger.info(f"Dropped {seen.dropped} duplicate items")
+        if sink is not None:
+            return self._complete(builders, sink.manifest())
+        return self._complete(builders, self._build(ColumnarBuilder.concat(builders), "permits", output))
 
     def get_permits_by_id(
         self,
-        permit_ids: List[str] | str,
+        permit_ids: Iterable[str] | str,
+        output: str | None = None,
         **kwargs
-    ) -> pd.DataFrame:
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list:
         """Retrieve detailed information for specific permits by their IDs.
 
         Refer to the official Shovels API documentation for detailed
@@ -786,35 +1399,429 @@ class ShovelsAPI:
 
         Parameters
         ----------
-        permit_ids : List[str] | str
-            A single permit ID (string) or a list of permit IDs to fetch.
+        permit_ids : Iterable[str] | str
+            A single permit ID (string) or an iterable of permit IDs to fetch,
+            of any length. Duplicates are dropped and the IDs are sent in
+            chunks of `MAX_IDS_PER_REQUEST`, fetched in parallel
+            (see `max_workers`).
+        output : str, optional
+            The result format: "pandas" (DataFrame), "arrow" (`pyarrow.Table`),
+            "polars" (`polars.DataFrame`), "records" (list of `Permit`
+            records) or "list" (list of dicts). Default is None, which uses
+            the client's `output`.
         **kwargs : dict, optional
             Keyword arguments passed to the `_make_paginated_request` method.
 
         Returns
         -------
-        pd.DataFrame
-            A DataFrame containing the data for the specified permit IDs.
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list
+            A DataFrame containing the data for the specified permit IDs,
+            in the order of `permit_ids`.
+            In the format given by `output`.
         """
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
         url = f"{self.base_url}/permits"
-        params = {"id": permit_ids}
-        content = self._make_paginated_request(url, params, **kwargs)
-        return pd.DataFrame(content)
+        builder, results = self._collect_by_ids(url, permit_ids, "permits by ID", **kwargs)
+        return self._complete(results, self._build(builder, "permits", output))
+
+    def sync_permits(
+        self,
+        store: SyncStore,
+        geo_ids: Iterable[str] | str | None = None,
+        params: dict | None = None,
+        lookback_days: int = 7,
+        **kwargs
+    ) -> SyncResult:
+        """Incrementally sync permits into a local store.
+
+        For each geo ID, only the permits filed since the watermark recorded
+        in `store` for the same search filters (minus `lookback_days`) are
+        fetched, then upserted into `store` page by page. The watermark is
+        only moved forward once every page of a geo ID has been fetched.
+        Geo IDs never synced before use the `permit_from`/`permit_to` window
+        of `params`. Geo IDs are synced in parallel (see `max_workers`).
+
+        Parameters
+        ----------
+        store : SyncStore
+            The local store holding the permits and watermarks.
+        geo_ids : Iterable[str] | str | None, optional
+            A single Geo ID (string) or an iterable of Geo IDs to sync.
+            If None, all US states (defined in `US_STATES`) are synced.
+            Default is None.
+        params : dict, optional
+            A dictionary of parameters for the search (see `search_permits`).
+            Each distinct set of filters has its own watermarks. The
+            `permit_from` and `permit_to` fields will default to the last
+            180 days and today respectively if not provided.
+        lookback_days : int, optional
+            The number of days before the watermark that are fetched again,
+            to pick up permits published late. Default is 7.
+        **kwargs : dict, optional
+            Keyword arguments passed to the `_iter_pages` method.
+
+        Returns
+        -------
+        SyncResult
+            The windows queried, the number of permits fetched, the new
+            watermarks and the geo IDs whose sync failed. Load the synced
+            permits with `store.to_frame()`.
+        """
+        url = f"{self.base_url}/permits/search"
+        if geo_ids is None:
+            geo_ids = US_STATES
+        if isinstance(geo_ids, str):
+            geo_ids = [geo_ids]
+        geo_ids = list(geo_ids)
+        _params = {**params} if params else {}
+        _params = default_date_range(_params, "permit_from", "permit_to")
+        result = SyncResult()
+
+        def sync(geo_id: str) -> bool:
+            state = self._start_sync(store, geo_id, _params, lookback_days, result)
+            for content in self._iter_pages(url, state["params"], **kwargs):
+                latest = store.upsert(geo_id, content.get("items", []))
+                self._sync_page(state, content, latest)
+            return self._finish_sync(store, geo_id, _params, state, result)
+
+        synced = self._fan_out(geo_ids, sync, "permit sync for geo_id")
+        return self._sync_summary(geo_ids, synced, result)
     # endregion: permit
 
+    # region: streaming
+    def _iter_fan_out(
+        self,
+        ids: List[str],
+        pages: Callable[[str], Iterator[dict]],
+        description: str
+    ) -> Iterator[dict]:
+        """Yield the pages returned by `pages` for every ID, one ID at a time.
+
+        A failure for one ID is logged without affecting the others, and
+        `IncompleteResultsError` is raised once all the IDs were streamed.
+
+        Parameters
+        ----------
+        ids : List[str]
+            The IDs to fetch.
+        pages : Callable[[str], Iterator[dict]]
+            A function returning the page iterator for a single ID.
+        description : str
+            A description of the fetched data used in log messages
+            (e.g., "permits for geo_id").
+
+        Yields
+        ------
+        dict
+            The JSON response for each page.
+        """
+        self.logger.info('--------------------------------')
+        self.logger.info(f"Streaming {description} for {len(ids)} IDs: {ids}")
+        failed = {}
+        for i, _id in enumerate(ids):
+            self.logger.info(f"Fetching {description}: {_id} ({i+1}/{len(ids)})")
+            try:
+                yield from pages(_id)
+            except Exception as e:
+                stack_trace = traceback.format_exc()
+                self.logger.error(f"Error fetching {description}: {_id}")
+                self.logger.error(stack_trace)
+                self._fetch_failed(failed, _id, e)
+                continue
+        self.logger.info('--------------------------------')
+        if failed:
+            raise IncompleteResultsError(f"Results are incomplete: fetching {len(failed)} of {len(ids)} IDs failed: {list(failed)}", failed)
+
+    def iter_pages(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+        **kwargs
+    ) -> Iterator[dict]:
+        """Lazily fetch the pages of any paginated endpoint.
+
+        Each page is requested only once the previous one has been consumed,
+        so memory usage does not grow with the number of pages.
+
+        Parameters
+        ----------
+        endpoint : str
+            The endpoint path relative to the base URL (e.g., "permits/search")
+            or a full URL.
+        params : dict, optional
+            The parameters to pass to the request. Default is None.
+        **kwargs : dict, optional
+            Keyword arguments passed to the `_iter_pages` method
+            (e.g., `size`, `max_iterations`).
+
+        Yields
+        ------
+        dict
+            The JSON response for each page, with the page items under `items`.
+        """
+        url = endpoint if endpoint.startswith(("http://", "https://")) else f"{self.base_url}/{endpoint.lstrip('/')}"
+        yield from self._iter_pages(url, params, **kwargs)
+
+    def iter_permits(
+        self,
+        geo_ids: Iterable[str] | str | None = None,
+        params: dict | None = None,
+        dedupe: bool = False,
+        **kwargs
+    ) -> Iterator[dict]:
+        """Lazily search for permits, yielding them as pages arrive.
+
+        Streaming counterpart of `search_permits`. Geo IDs are fetched one
+        after the other.
+
+        Parameters
+        ----------
+        geo_ids : Iterable[str] | str | None, optional
+            A single Geo ID (string) or an iterable of Geo IDs to search within.
+            If None, the search will be performed across all US states (defined
+            in `US_STATES`). Default is None.
+        params : dict, optional
+            A dictionary of parameters for the search. The `permit_from` and
+            `permit_to` fields will default to the last 180 days and today
+            respectively if not provided.
+        dedupe : bool, optional
+            Whether to skip items (by `id`) already yielded for another ID.
+            Default is False.
+        **kwargs : dict, optional
+            Keyword arguments passed to the `_iter_pages` method.
+
+        Yields
+        ------
+        dict
+            One permit at a time.
+        """
+        seen = SeenIds() if dedupe else None
+        url = f"{self.base_url}/permits/search"
+        if geo_ids is None:
+            geo_ids = US_STATES
+        if isinstance(geo_ids, str):
+            geo_ids = [geo_ids]
+        _params = {**params} if params else {}
+        _params = default_date_range(_params, "permit_from", "permit_to")
+
+        def pages(geo_id: str) -> Iterator[dict]:
+            return self._iter_pages(url, {**_params, "geo_id": geo_id}, **kwargs)
+
+        for content in self._iter_fan_out(list(geo_ids), pages, "permits for geo_id"):
+            items = content.get("items", [])
+            yield from (seen.filter(items) if seen is not None else items)
+
+    def iter_contractors(
+        self,
+        geo_ids: Iterable[str] | str | None = None,
+        params: dict | None = None,
+        dedupe: bool = False,
+        **kwargs
+    ) -> Iterator[dict]:
+        """Lazily search for contractors, yielding them as pages arrive.
+
+        Streaming counterpart of `search_contractors`. Geo IDs are fetched one
+        after the other.
+
+        Parameters
+        ----------
+        geo_ids : Iterable[str] | str | None, optional
+            A single Geo ID (string) or an iterable of Geo IDs to search within.
+            If None, the search will be performed across all US states (defined
+            in `US_STATES`). Default is None.
+        params : dict, optional
+            A dictionary of parameters for the search. The `permit_from` and
+            `permit_to` fields will default to the last 180 days and today
+            respectively if not provided.
+        dedupe : bool, optional
+            Whether to skip items (by `id`) already yielded for another ID.
+            Default is False.
+        **kwargs : dict, optional
+            Keyword arguments passed to the `_iter_pages` method.
+
+        Yields
+        ------
+        dict
+            One contractor at a time.
+        """
+        seen = SeenIds() if dedupe else None
+        url = f"{self.base_url}/contractors/search"
+        if geo_ids is None:
+            geo_ids = US_STATES
+        if isinstance(geo_ids, str):
+            geo_ids = [geo_ids]
+        _params = {**params} if params else {}
+        _params = default_date_range(_params, "permit_from", "permit_to")
+
+        def pages(geo_id: str) -> Iterator[dict]:
+            return self._iter_pages(url, {**_params, "geo_id": geo_id}, **kwargs)
+
+        for content in self._iter_fan_out(list(geo_ids), pages, "contractors for geo_id"):
+            items = content.get("items", [])
+            yield from (seen.filter(items) if seen is not None else items)
+
+    def iter_residents(
+        self,
+        geo_ids: Iterable[str] | str,
+        **kwargs
+    ) -> Iterator[dict]:
+        """Lazily fetch residents, yielding them as pages arrive.
+
+        Streaming counterpart of `get_residents`. Geo IDs are fetched one
+        after the other.
+
+        Parameters
+        ----------
+        geo_ids : Iterable[str] | str
+            A single Geo ID (string) or an iterable of Geo IDs to fetch residents for.
+        **kwargs : dict, optional
+            Keyword arguments passed to the `_iter_pages` method.
+
+        Yields
+        ------
+        dict
+            One resident at a time.
+        """
+        if isinstance(geo_ids, str):
+            geo_ids = [geo_ids]
+
+        def pages(geo_id: str) -> Iterator[dict]:
+            return self._iter_pages(f"{self.base_url}/addresses/{geo_id}/residents", None, **kwargs)
+
+        for content in self._iter_fan_out(list(geo_ids), pages, "residents for geo_id"):
+            yield from content.get("items", [])
+
+    def iter_permits_by_contractor_id(
+        self,
+        contractor_ids: Iterable[str] | str,
+        dedupe: bool = False,
+        **kwargs
+    ) -> Iterator[dict]:
+        """Lazily fetch the permits of given contractors, yielding them as pages arrive.
+
+        Streaming counterpart of `get_permits_by_contractor_id`. Contractor IDs
+        are fetched one after the other.
+
+        Parameters
+        ----------
+        contractor_ids : Iterable[str] | str
+            A single contractor ID (string) or an iterable of contractor IDs to fetch permits for.
+        dedupe : bool, optional
+            Whether to skip items (by `id`) already yielded for another ID.
+            Default is False.
+        **kwargs : dict, optional
+            Keyword arguments passed to the `_iter_pages` method.
+
+        Yields
+        ------
+        dict
+            One permit at a time.
+        """
+        seen = SeenIds() if dedupe else None
+        if isinstance(contractor_ids, str):
+            contractor_ids = [contractor_ids]
+
+        def pages(cid: str) -> Iterator[dict]:
+            return self._iter_pages(f"{self.base_url}/contractors/{cid}/permits", None, **kwargs)
+
+        for content in self._iter_fan_out(list(contractor_ids), pages, "permits for contractor ID"):
+            items = content.get("items", [])
+            yield from (seen.filter(items) if seen is not None else items)
+    # endregion: streaming
+
+    def harvest(
+        self,
+        method: str = "search_permits",
+        geo_ids: Iterable[str] | str | None = None,
+        params: dict | None = None,
+        concat: bool = True,
+        **kwargs
+    ) -> "pd.DataFrame | HarvestResult":
+        """Run `search_permits` or `search_contractors` on a pool of worker processes.
+
+        Each shard of geo IDs is fetched by a separate process with its own
+        client and written to a partition file. See `pyshovels.harvest.harvest`
+        for the sharding options.
+
+        Parameters
+        ----------
+        method : str, optional
+            The search method to run. Options: "search_permits",
+            "search_contractors". Default is "search_permits".
+        geo_ids : Iterable[str] | str | None, optional
+            The geo IDs to search within. If None, the search is performed
+            across all US states (defined in `US_STATES`). Default is None.
+        params : dict, optional
+            The search parameters, passed to `method` unchanged. Default is None.
+        concat : bool, optional
+            Whether to load the partition files into a single DataFrame. If
+            False, the `HarvestResult` handle is returned instead.
+            Default is True.
+        **kwargs : dict, optional
+            Keyword arguments passed to `pyshovels.harvest.harvest` (e.g.,
+            `output_dir`, `processes`, `geo_ids_per_shard`, `file_format`),
+            and from there to `method`.
+
+        Returns
+        -------
+        pd.DataFrame | HarvestResult
+            The concatenated results, or a handle to the partition files if
+            `concat` is False.
+        """
+        from .harvest import harvest
+        result = harvest(self, method, geo_ids, params, **kwargs)
+        return result.to_frame() if concat else result
+
+    def query(
+        self,
+        sql: str,
+        parameters: Sequence | dict = (),
+        output: str | None = None
+    ) -> pd.DataFrame | pa.Table | pl.DataFrame | list:
+        """Run a SQL query against the client's local mirror, without any request.
+
+        Parameters
+        ----------
+        sql : str
+            The SQLite query over the `permits`, `contractors` and
+            `residents` tables (see `LocalMirror`), e.g.
+            `SELECT * FROM permits WHERE geo_id = ? AND file_date >= ?`.
+        parameters : Sequence | dict, optional
+            The values of the `?` or `:name` placeholders of `sql`.
+        output : str, optional
+            The result format: "pandas" (DataFrame), "arrow" (`pyarrow.Table`),
+            "polars" (`polars.DataFrame`), "records" or "list" (list of dicts).
+            Default is None, which uses the client's `output`.
+
+        Returns
+        -------
+        pd.DataFrame | pyarrow.Table | polars.DataFrame | list
+            The rows of the result, in the format given by `output`.
+
+        Raises
+        ------
+        AssertionError
+            If the client has no `mirror`.
+        """
+        assert self.mirror is not None, "query requires a client created with a mirror"
+        assert output is None or output in OUTPUTS, f"output must be one of {OUTPUTS}"
+        return self._build_rows(self.mirror.query(sql, parameters), output)
+
     def get_tags(self) -> List[dict]:
         """Get all available permit tags.
 
         Refer to the official Shovels API documentation for detailed
         parameter options: https://docs.shovels.ai/api-reference/list/list-tags
 
+        Results are memoized in the client's `reference_cache`.
+
         Returns
         -------
         List[dict]
             A list of tag objects. Each object contains tag details.
         """
         url = f"{self.base_url}/list/tags"
-        content = self._make_request(url, params={"size": 100})
+        content = self._make_reference_request(url, params={"size": 100})
         return content["items"]
 
     def get_data_release_date(self) -> datetime.date:
@@ -823,11 +1830,13 @@ class ShovelsAPI:
         Refer to the official Shovels API documentation for detailed
         parameter options: https://docs.shovels.ai/api-reference/meta/get-meta-release
 
+        Results are memoized in the client's `reference_cache`.
+
         Returns
         -------
         datetime.date
             The data release date.
         """
         url = f"{self.base_url}/meta/release"
-        response = self._make_request(url)
+        response = self._make_reference_request(url)
         return datetime.date.fromisoformat(response["released_at"])
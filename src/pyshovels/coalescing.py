@@ -0,0 +1,126 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+__all__ = [
+    "SingleFlight",
+    "AsyncSingleFlight",
+]
+
+class _Call:
+    """An in-flight call of a `SingleFlight`, awaited by the duplicate callers."""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+class SingleFlight:
+    """
+    Thread-safe coalescing of identical concurrent calls.
+
+    While a call for a key is in flight, other threads calling `do` with the
+    same key wait for it and receive its result (or exception) instead of
+    running the function again. Nothing is kept once the call returns, so a
+    later call runs the function again. Callers share the returned object,
+    which must not be modified.
+    """
+
+    def __init__(self):
+        self.coalesced: int = 0
+        self._calls: dict = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run `fn(*args)`, or wait for the call in flight for `key`.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key identifying identical calls.
+        fn : Callable[..., Any]
+            The function to run.
+        *args : Any
+            The arguments of `fn`.
+
+        Returns
+        -------
+        Any
+            The result of the call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+class AsyncSingleFlight:
+    """
+    Coalescing of identical concurrent coroutine calls on an event loop.
+
+    The asynchronous counterpart of `SingleFlight`: tasks awaiting `do`
+    with the key of an in-flight call await its result instead of running
+    the coroutine function again.
+    """
+
+    def __init__(self):
+        self.coalesced: int = 0
+        self._calls: dict = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Await `fn(*args)`, or the call in flight for `key`.
+
+        See `SingleFlight.do` for parameter details. If the task running the
+        call is cancelled, the tasks waiting for it are cancelled as well.
+
+        Returns
+        -------
+        Any
+            The result of the call.
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # a cancelled waiter must not cancel the shared call
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn(*args)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # mark the exception as retrieved when no other task awaits it
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._calls[key]
+        return result
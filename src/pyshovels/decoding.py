@@ -0,0 +1,58 @@
+import json
+from typing import Any, Callable
+
+__all__ = [
+    "JSON_DECODERS",
+    "get_json_decoder",
+]
+
+# decoders tried in order when none is specified
+JSON_DECODERS = ("orjson", "msgspec", "json")
+
+def _load(name: str) -> Callable[[bytes], Any]:
+    """Return the `bytes -> object` function of a JSON library, or raise ImportError."""
+    if name == "orjson":
+        import orjson
+        return orjson.loads
+    if name == "msgspec":
+        import msgspec
+        return msgspec.json.Decoder().decode
+    return json.loads
+
+def get_json_decoder(decoder: str | Callable[[bytes], Any] | None = None) -> Callable[[bytes], Any]:
+    """
+    Returns a function parsing JSON directly from response bytes.
+
+    Parsing the raw bytes skips the `bytes -> str` decoding done by
+    `requests.Response.json`, and `orjson` or `msgspec` parse several times
+    faster than the standard library.
+
+    Parameters
+    ----------
+    decoder : str | Callable[[bytes], Any], optional
+        The JSON library to use ("orjson", "msgspec" or "json"), or a function
+        taking the response bytes. Default is None, which uses the first
+        library of `JSON_DECODERS` that is installed.
+
+    Returns
+    -------
+    Callable[[bytes], Any]
+        The decoding function.
+
+    Raises
+    ------
+    ImportError
+        If the requested library is not installed.
+    AssertionError
+        If `decoder` is not a known library name.
+    """
+    if callable(decoder):
+        return decoder
+    if decoder is not None:
+        assert decoder in JSON_DECODERS, f"json_decoder must be one of {JSON_DECODERS} or a callable"
+        return _load(decoder)
+    for name in JSON_DECODERS:
+        try:
+            return _load(name)
+        except ImportError:
+            continue
@@ -0,0 +1,438 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import TYPE_CHECKING, Hashable, Iterable, List
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+__all__ = [
+    "ColumnarBuilder",
+    "SeenIds",
+]
+
+def to_series(values: list, dtype: str | None = None) -> pd.Series:
+    """
+    Converts a column of API values to a Series of the given dtype.
+
+    Parameters
+    ----------
+    values : list
+        The column values. None marks a missing value.
+    dtype : str, optional
+        One of "category", "datetime" (ISO 8601 dates), "string", "boolean",
+        "Int64" and "Float64". Values that cannot be converted become
+        missing. Default is None, which lets pandas infer the dtype.
+
+    Returns
+    -------
+    pd.Series
+        The converted column. Columns holding lists or dicts are never
+        converted.
+    """
+    import pandas as pd
+
+    if dtype is None or any(isinstance(value, (list, dict)) for value in values):
+        return pd.Series(values)
+    if dtype == "datetime":
+        return pd.Series(pd.to_datetime(values, errors="coerce", format="ISO8601"))
+    if dtype in ("Int64", "Float64"):
+        numbers = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+        try:
+            return numbers.astype(dtype)
+        except (TypeError, ValueError):  # non-integral values in an integer column
+            return numbers.astype("Float64")
+    if dtype == "boolean":
+        return pd.Series([value if isinstance(value, bool) else pd.NA for value in values], dtype=dtype)
+    return pd.Series(values, dtype=dtype)
+
+def to_arrow_array(values: list, dtype: str | None = None):
+    """
+    Converts a column of API values to a `pyarrow.Array` of the given dtype.
+
+    See `to_series` for the supported dtypes. Columns mixing incompatible
+    types are converted to strings.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    try:
+        array = pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        array = pa.array([None if value is None else str(value) for value in values], pa.string())
+    if dtype is None or pa.types.is_nested(array.type):
+        return array
+    try:
+        if dtype == "category":
+            return pc.dictionary_encode(array)
+        if dtype == "datetime":
+            return pc.cast(array, pa.timestamp("us"))
+        types = {"string": pa.string(), "boolean": pa.bool_(), "Int64": pa.int64(), "Float64": pa.float64()}
+        return pc.cast(array, types[dtype])
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return array
+
+def to_polars_series(name: str, values: list, dtype: str | None = None):
+    """
+    Converts a column of API values to a `polars.Series` of the given dtype.
+
+    See `to_series` for the supported dtypes.
+    """
+    import polars as pl
+
+    series = pl.Series(name, values, strict=False)
+    if dtype is None or series.dtype in (pl.List, pl.Struct, pl.Object):
+        return series
+    if dtype == "datetime":
+        if series.dtype == pl.String:
+            return series.str.to_datetime(strict=False)
+        return series
+    types = {"category": pl.Categorical, "string": pl.String, "boolean": pl.Boolean, "Int64": pl.Int64, "Float64": pl.Float64}
+    return series.cast(types[dtype], strict=False)
+
+class ColumnarBuilder:
+    """
+    Accumulates API items column by column.
+
+    Items are appended a page at a time into one list per field, so the
+    per-item dictionaries can be released as soon as their page has been
+    consumed. Fields missing from an item are filled with None, and columns
+    are ordered by first appearance, as with `pd.DataFrame(items)`.
+    """
+
+    def __init__(self, flatten: Iterable[str] | None = None, sep: str = "_"):
+        """Initialize the builder.
+
+        Parameters
+        ----------
+        flatten : Iterable[str], optional
+            The fields holding nested objects (e.g., "address") to expand
+            into one column per sub-field, named `<field><sep><sub-field>`,
+            as pages are appended. Nested objects within them are expanded
+            recursively. Default is None, which keeps them as dict values.
+        sep : str, optional
+            The separator of flattened column names. Default is "_".
+        """
+        self.columns: dict = {}
+        self.n_rows: int = 0
+        self.flatten: frozenset = frozenset(flatten or ())
+        self.sep: str = sep
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def extend(self, items: List[dict]) -> None:
+        """Append a page of items.
+
+        Parameters
+        ----------
+        items : List[dict]
+            The items to append.
+        """
+        if not items:
+            return
+        page = {}
+        for key in dict.fromkeys(key for item in items for key in item):
+            values = [item.get(key) for item in items]
+            if key in self.flatten:
+                self._flatten_into(page, key, values)
+            else:
+                page[key] = values
+        for key in page:
+            if key not in self.columns:
+                self.columns[key] = [None] * self.n_rows
+        for key, column in self.columns.items():
+            values = page.get(key)
+            column.extend(values if values is not None else [None] * len(items))
+        self.n_rows += len(items)
+
+    def _flatten_into(self, page: dict, prefix: str, values: list) -> None:
+        """Expand a column of nested objects into one column per sub-field of `page`."""
+        sub_keys = dict.fromkeys(key for value in values if isinstance(value, dict) for key in value)
+        if not sub_keys and any(value is not None for value in values):
+            page[prefix] = values  # not nested in this page
+            return
+        for sub_key in sub_keys:
+            sub_values = [value.get(sub_key) if isinstance(value, dict) else None for value in values]
+            name = f"{prefix}{self.sep}{sub_key}"
+            if any(isinstance(value, dict) for value in sub_values):
+                self._flatten_into(page, name, sub_values)
+            else:
+                page[name] = sub_values
+
+    def dedupe(self, key: str = "id") -> int:
+        """Drop rows whose `key` value was already seen, keeping the first one.
+
+        Rows without a `key` value are always kept.
+
+        Parameters
+        ----------
+        key : str, optional
+            The column identifying an item. Default is "id".
+
+        Returns
+        -------
+        int
+            The number of rows dropped.
+        """
+        ids = self.columns.get(key)
+        if ids is None:
+            return 0
+        seen = set()
+        keep = []
+        for i, item_id in enumerate(ids):
+            if item_id is None or item_id not in seen:
+                seen.add(item_id)
+                keep.append(i)
+        dropped = self.n_rows - len(keep)
+        if dropped:
+            for name, column in self.columns.items():
+                self.columns[name] = [column[i] for i in keep]
+            self.n_rows = len(keep)
+        return dropped
+
+    @classmethod
+    def concat(cls, builders: Iterable["ColumnarBuilder"]) -> "ColumnarBuilder":
+        """Concatenate builders in order, emptying them as they are consumed.
+
+        Parameters
+        ----------
+        builders : Iterable[ColumnarBuilder]
+            The builders to concatenate. None entries (e.g., fetches that
+            failed) are skipped.
+
+        Returns
+        -------
+        ColumnarBuilder
+            A builder holding the rows of all `builders`, flattening the
+            fields they flatten.
+        """
+        result = cls()
+        for builder in builders:
+            if builder is None:
+                continue
+            # keep the flattened fields, which `to_records` groups back
+            result.flatten |= builder.flatten
+            result.sep = builder.sep
+            if not builder.n_rows:
+                continue
+            for key in builder.columns:
+                if key not in result.columns:
+                    result.columns[key] = [None] * result.n_rows
+            for key, column in result.columns.items():
+                part = builder.columns.pop(key, None)
+                column.extend(part if part is not None else [None] * builder.n_rows)
+            result.n_rows += builder.n_rows
+            builder.columns, builder.n_rows = {}, 0
+        return result
+
+    def to_dicts(self) -> List[dict]:
+        """Build one dictionary per row from the accumulated columns, emptying the builder.
+
+        Fields missing from an item are None in its dictionary.
+        """
+        names = list(self.columns)
+        columns = [self.columns.pop(name) for name in names]
+        self.n_rows = 0
+        return [dict(zip(names, row)) for row in zip(*columns)]
+
+    def to_arrow(self, schema: dict | None = None):
+        """Build a `pyarrow.Table` from the accumulated columns, emptying the builder.
+
+        Columns are converted one at a time without going through pandas.
+        Requires `pyarrow`.
+
+        Parameters
+        ----------
+        schema : dict, optional
+            The dtypes of the columns, by name (see `to_series`). Categories
+            are dictionary-encoded. Default is None, which lets `pyarrow`
+            infer all types.
+
+        Returns
+        -------
+        pyarrow.Table
+            A table with one row per item.
+        """
+        import pyarrow as pa
+
+        arrays = {}
+        for key in list(self.columns):
+            arrays[key] = to_arrow_array(self.columns.pop(key), (schema or {}).get(key))
+        self.n_rows = 0
+        return pa.table(arrays)
+
+    def to_polars(self, schema: dict | None = None):
+        """Build a `polars.DataFrame` from the accumulated columns, emptying the builder.
+
+        Columns are converted one at a time without going through pandas.
+        Requires `polars`.
+
+        Parameters
+        ----------
+        schema : dict, optional
+            The dtypes of the columns, by name (see `to_series`). Default is
+            None, which lets `polars` infer all types.
+
+        Returns
+        -------
+        polars.DataFrame
+            A DataFrame with one row per item.
+        """
+        import polars as pl
+
+        series = []
+        for key in list(self.columns):
+            series.append(to_polars_series(key, self.columns.pop(key), (schema or {}).get(key)))
+        self.n_rows = 0
+        return pl.DataFrame(series)
+
+    def to_records(self, record_cls: type) -> list:
+        """Build one record per row from the accumulated columns, emptying the builder.
+
+        Flattened columns (e.g., `address_city`) are grouped back into their
+        nested object, so that records have the same fields whether or not
+        the builder flattens them.
+
+        Parameters
+        ----------
+        record_cls : type
+            The record class (e.g., `Permit`), called with the fields of a
+            row as keyword arguments.
+
+        Returns
+        -------
+        list
+            The records, in row order.
+        """
+        nested = {
+            field: [name for name in self.columns if name.startswith(f"{field}{self.sep}")]
+            for field in self.flatten
+        }
+        names = list(self.columns)
+        columns = [self.columns.pop(name) for name in names]
+        self.n_rows = 0
+        records = []
+        for row in zip(*columns):
+            values = dict(zip(names, row))
+            for field, sub_names in nested.items():
+                if not sub_names:
+                    continue
+                sub_values = {name[len(field) + len(self.sep):]: values.pop(name) for name in sub_names}
+                if any(value is not None for value in sub_values.values()):
+                    values[field] = sub_values
+            records.append(record_cls(**values))
+        return records
+
+    def to_frame(self, schema: dict | None = None) -> pd.DataFrame:
+        """Build a DataFrame from the accumulated columns, emptying the builder.
+
+        Each column list is converted and released in turn, so the rows are
+        never held twice as Python lists. `pandas` is only imported here, so
+        that importing `pyshovels` stays fast.
+
+        Parameters
+        ----------
+        schema : dict, optional
+            The dtypes of the columns, by name (see `to_series` and
+            `SCHEMAS`). Default is None, which lets pandas infer all dtypes.
+
+        Returns
+        -------
+        pd.DataFrame
+            A DataFrame with one row per item.
+        """
+        import pandas as pd
+
+        if not self.n_rows:
+            return pd.DataFrame()
+        data = {}
+        for key in list(self.columns):
+            data[key] = to_series(self.columns.pop(key), (schema or {}).get(key))
+        self.n_rows = 0
+        return pd.DataFrame(data, copy=False)
+
+class SeenIds:
+    """
+    Thread-safe filter dropping items whose `id` was already seen.
+
+    Used to deduplicate the items of a fan-out across overlapping IDs (e.g.,
+    a state and its counties) while pages are received. Only a 128-bit
+    BLAKE2 digest of each ID and its type is kept, so the filter stays
+    small for millions of items, IDs of different types (e.g., `1` and
+    `"1"`, or `1` and `True`) are never confused, and the probability of
+    two different IDs colliding is negligible (below 1 in 10^24 for
+    10 million IDs).
+
+    With `merge_column`, a copy of the first occurrence of an item is kept
+    and given a list of all the groups (e.g., geo IDs) it was returned for,
+    which keeps growing as later duplicates are dropped.
+    """
+
+    def __init__(self, key: str = "id", merge_column: str | None = None):
+        """Initialize the filter.
+
+        Parameters
+        ----------
+        key : str, optional
+            The item field identifying an item. Default is "id".
+        merge_column : str, optional
+            The name of the column listing the groups each item was returned
+            for. Default is None, which drops duplicates without recording
+            their groups.
+        """
+        self.key: str = key
+        self.merge_column: str | None = merge_column
+        self.dropped: int = 0
+        self._seen: set = set()
+        self._groups: dict = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._groups) if self.merge_column else len(self._seen)
+
+    @staticmethod
+    def digest(item_id) -> bytes:
+        """Return the 128-bit digest identifying `item_id` and its type."""
+        return hashlib.blake2b(f"{type(item_id).__qualname__}:{item_id!r}".encode(), digest_size=16).digest()
+
+    def filter(self, items: List[dict], group: Hashable = None) -> List[dict]:
+        """Return the items of a page that were not seen before.
+
+        Parameters
+        ----------
+        items : List[dict]
+            The items of the page. Items without a `key` value are always kept.
+        group : Hashable, optional
+            The group the page was returned for, recorded in `merge_column`.
+
+        Returns
+        -------
+        List[dict]
+            The new items, in their original order. With `merge_column`,
+            shallow copies of the items holding their groups; `items` are
+            never modified.
+        """
+        kept = []
+        with self._lock:
+            for item in items:
+                item_id = item.get(self.key)
+                if item_id is None:
+                    kept.append(item)
+                    continue
+                digest = self.digest(item_id)
+                if self.merge_column is None:
+                    if digest not in self._seen:
+                        self._seen.add(digest)
+                        kept.append(item)
+                    continue
+                groups = self._groups.get(digest)
+                if groups is None:
+                    groups = self._groups[digest] = [group]
+                    # items may be shared with a cache or other callers, so they are copied
+                    kept.append({**item, self.merge_column: groups})
+                elif group not in groups:
+                    groups.append(group)
+            self.dropped += len(items) - len(kept)
+        return kept
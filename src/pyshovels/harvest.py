@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import logging
+import traceback
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, List
+from pathlib import Path
+
+from .base import US_STATES, elapsed_time_str
+from .client import ShovelsAPI
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+__all__ = [
+    "HARVEST_METHODS",
+    "HarvestResult",
+    "harvest",
+]
+
+HARVEST_METHODS = ("search_permits", "search_contractors")
+
+FILE_SUFFIXES = {
+    "pickle": ".pkl",
+    "parquet": ".parquet",
+}
+
+@dataclass
+class HarvestResult:
+    """
+    Handle to the partition files written by a sharded harvest.
+
+    Attributes
+    ----------
+    output_dir : Path
+        The directory containing the partition files.
+    file_format : str
+        The format of the partition files ("pickle" or "parquet").
+    files : List[Path]
+        The partition files written, in shard order.
+    failed_shards : List[List[str]]
+        The geo IDs of the shards whose worker process failed.
+    """
+    output_dir: Path
+    file_format: str
+    files: List[Path] = field(default_factory=list)
+    failed_shards: List[List[str]] = field(default_factory=list)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Concatenate all partition files into a single DataFrame.
+
+        Returns
+        -------
+        pd.DataFrame
+            The harvested data. An empty DataFrame is returned if no
+            partition files were written.
+        """
+        import pandas as pd
+
+        read = pd.read_parquet if self.file_format == "parquet" else pd.read_pickle
+        frames = [read(path) for path in self.files]
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+# configuration of the client built by each worker process, set by `_init_worker`
+_worker_client_config: dict = {}
+
+def _init_worker(client_config: dict) -> None:
+    """
+    Store the client configuration in a new worker process.
+
+    The configuration is handed over on process creation rather than with
+    each task, so that a shared `RateLimiter` can be inherited by the worker.
+    """
+    global _worker_client_config
+    _worker_client_config = client_config
+
+def _harvest_shard(
+    method: str,
+    geo_ids: List[str],
+    params: dict | None,
+    path: Path,
+    file_format: str,
+    kwargs: dict
+) -> Path:
+    """
+    Fetch one shard in a worker process and write it to `path`.
+
+    The worker builds its own `ShovelsAPI` client, and therefore its own HTTP
+    session, from the configuration received by `_init_worker`.
+    """
+    client = ShovelsAPI(**_worker_client_config)
+    frame = getattr(client, method)(geo_ids, params, **{**kwargs, "output": "pandas"})
+    if file_format == "parquet":
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_pickle(path)
+    return path
+
+def harvest(
+    client: ShovelsAPI,
+    method: str = "search_permits",
+    geo_ids: Iterable[str] | str | None = None,
+    params: dict | None = None,
+    output_dir: str | Path | None = None,
+    processes: int | None = None,
+    geo_ids_per_shard: int = 1,
+    file_format: str = "pickle",
+    **kwargs
+) -> HarvestResult:
+    """
+    Run a search across many geo IDs on a pool of worker processes.
+
+    The geo IDs are split into shards of `geo_ids_per_shard` IDs. Each shard is
+    fetched by a worker process with its own `ShovelsAPI` client, which
+    decodes the responses, builds the DataFrame and writes it to a partition
+    file in `output_dir`. This spreads the CPU-bound work over several cores.
+
+    Parameters
+    ----------
+    client : ShovelsAPI
+        The client whose configuration (API key, base URL, logger name,
+        `max_workers` and rate limiting) is replicated in each worker process.
+        A `RateLimiter` created with `shared=True` is shared by all workers.
+    method : str, optional
+        The search method to run. Options: "search_permits",
+        "search_contractors". Default is "search_permits".
+    geo_ids : Iterable[str] | str | None, optional
+        The geo IDs to search within. If None, the search is performed across
+        all US states (defined in `US_STATES`). Default is None.
+    params : dict, optional
+        The search parameters, passed to `method` unchanged. Default is None.
+    output_dir : str | Path, optional
+        The directory to write the partition files to. It is created if it
+        does not exist. Default is None, which uses a new temporary directory.
+    processes : int, optional
+        The number of worker processes. Default is None, which uses the
+        number of CPUs.
+    geo_ids_per_shard : int, optional
+        The number of geo IDs handled by each worker task. Default is 1.
+    file_format : str, optional
+        The format of the partition files. Options: "pickle", "parquet"
+        (requires `pyarrow`). Default is "pickle".
+    **kwargs : dict, optional
+        Keyword arguments passed to `method`.
+
+    Returns
+    -------
+    HarvestResult
+        A handle to the partition files. Call `to_frame` to load them as a
+        single DataFrame.
+
+    Raises
+    ------
+    AssertionError
+        If `method`, `file_format` or `geo_ids_per_shard` is invalid.
+    """
+    assert method in HARVEST_METHODS, f"method must be one of {HARVEST_METHODS}"
+    assert file_format in FILE_SUFFIXES, f"file_format must be one of {tuple(FILE_SUFFIXES)}"
+    assert geo_ids_per_shard >= 1, "geo_ids_per_shard must be greater than or equal to 1"
+    if geo_ids is None:
+        geo_ids = US_STATES
+    if isinstance(geo_ids, str):
+        geo_ids = [geo_ids]
+    geo_ids = list(geo_ids)
+    shards = [geo_ids[i:i + geo_ids_per_shard] for i in range(0, len(geo_ids), geo_ids_per_shard)]
+    output_dir = Path(output_dir or tempfile.mkdtemp(prefix="pyshovels-harvest-"))
+    output_dir.mkdir(parents=True, exist_ok=True)
+    result = HarvestResult(output_dir=output_dir, file_format=file_format)
+    logger: logging.Logger = client.logger
+
+    logger.info('--------------------------------')
+    logger.info(f"Harvesting {method} for {len(geo_ids)} geo_ids in {len(shards)} shards into {output_dir}")
+    tic = time.time()
+    paths = [
+        output_dir / f"part-{i:05d}-{'_'.join(shard)}{FILE_SUFFIXES[file_format]}"
+        for i, shard in enumerate(shards)
+    ]
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_worker,
+        initargs=(client._client_config,)
+    ) as executor:
+        futures = {
+            executor.submit(_harvest_shard, method, shard, params, path, file_format, kwargs): i
+            for i, (shard, path) in enumerate(zip(shards, paths))
+        }
+        written = {}
+        failed = []
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                written[i] = future.result()
+                logger.info(f"Finished shard {shards[i]} ({len(written) + len(failed)}/{len(shards)})")
+            except Exception:
+                stack_trace = traceback.format_exc()
+                logger.error(f"Error harvesting shard {shards[i]}")
+                logger.error(stack_trace)
+                failed.append(i)
+    result.files = [written[i] for i in sorted(written)]
+    result.failed_shards = [shards[i] for i in sorted(failed)]
+    toc = time.time()
+    logger.info(f"Time to complete harvest: {elapsed_time_str(toc - tic)}")
+    logger.info('--------------------------------')
+    return result
@@ -0,0 +1,259 @@
+import json
+import threading
+from pathlib import Path
+from typing import List, Sequence
+
+from .cache import connect_sqlite
+from .schemas import SCHEMAS
+from .sinks import SinkManifest
+
+__all__ = [
+    "LocalMirror",
+    "MirrorTable",
+]
+
+# SQLite column type of each `SCHEMAS` dtype; dates are stored as ISO text
+SQL_TYPES = {
+    "category": "TEXT",
+    "string": "TEXT",
+    "datetime": "TEXT",
+    "boolean": "INTEGER",
+    "Int64": "INTEGER",
+    "Float64": "REAL",
+}
+
+# identifying columns, conflict key and indexed columns of each mirrored table
+TABLES = {
+    "permits": {
+        "columns": ("id", "geo_id", "contractor_id", "number"),
+        "key": ("id",),
+        "indexes": ("geo_id", "contractor_id", "file_date", "issue_date"),
+    },
+    "contractors": {
+        "columns": ("id", "geo_id", "name", "biz_name", "license"),
+        "key": ("id",),
+        "indexes": ("geo_id", "name"),
+    },
+    "residents": {
+        "columns": ("geo_id", "name"),
+        "key": ("geo_id", "name"),
+        "indexes": (),
+    },
+}
+
+class MirrorTable:
+    """
+    Sink loading pages of API items into a table of a `LocalMirror`.
+
+    Pass it as the `sink` of a fan-out method (e.g.,
+    `client.search_permits(["CA"], params, sink=mirror.permits)`) to load
+    each page as soon as it is received. Items are upserted by their key:
+    loading the same items again replaces them.
+    """
+
+    def __init__(self, mirror: "LocalMirror", name: str):
+        self.mirror: LocalMirror = mirror
+        self.name: str = name
+        spec = TABLES[name]
+        schema_columns = [column for column in SCHEMAS[name] if column not in spec["columns"]]
+        self.columns: tuple = (*spec["columns"], *schema_columns)
+        self.key: tuple = spec["key"]
+        self._lock = threading.Lock()
+        self._manifest = SinkManifest(root=mirror.path)
+
+    def bind(self, entity: str) -> None:
+        """Check that the client method the table is passed to returns its entity.
+
+        Raises
+        ------
+        AssertionError
+            If `entity` is not the entity of the table.
+        """
+        assert entity == self.name, f"the {self.name} table of a LocalMirror cannot hold {entity}"
+
+    def _create(self, connection) -> None:
+        schema = SCHEMAS[self.name]
+        definitions = [f"{column} {SQL_TYPES.get(schema.get(column), 'TEXT')}" for column in self.columns]
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.name} ("
+            f"{', '.join(definitions)}, item TEXT NOT NULL, PRIMARY KEY ({', '.join(self.key)}))"
+        )
+        for column in TABLES[self.name]["indexes"]:
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {self.name}_{column} ON {self.name} ({column})")
+
+    def _row(self, item: dict, partition: dict) -> tuple:
+        address = item.get("address") if isinstance(item.get("address"), dict) else {}
+        values = []
+        for column in self.columns:
+            if column in item:
+                value = item[column]
+            elif column in partition:
+                value = partition[column]
+            elif column.startswith("address_"):
+                value = address.get(column[len("address_"):])
+            else:
+                value = None
+            if isinstance(value, (list, dict)):
+                value = json.dumps(value, default=str)
+            values.append(value)
+        values.append(json.dumps(item, default=str))
+        return tuple(values)
+
+    def write(self, items: List[dict], partition: dict) -> int:
+        """Upsert a page of items. See `write_files` for parameter details.
+
+        Returns
+        -------
+        int
+            The number of rows written.
+        """
+        self.write_files(items, partition)
+        return len(items)
+
+    def write_files(self, items: List[dict], partition: dict) -> List[dict]:
+        """Upsert a page of items and return the manifest entry of the page.
+
+        Parameters
+        ----------
+        items : List[dict]
+            The items of the page.
+        partition : dict
+            The ID the page was fetched for, e.g. `{"geo_id": "CA"}`, stored
+            in the matching column when the items do not have it.
+
+        Returns
+        -------
+        List[dict]
+            The manifest entry of the page (see `SinkManifest.files`), whose
+            `path` is the mirror file.
+        """
+        columns = (*self.columns, "item")
+        # identifying columns keep their value when an item is loaded again without it
+        # (e.g., the geo_id of a permit loaded by contractor_id after a search)
+        identifying = TABLES[self.name]["columns"]
+        updates = ", ".join(
+            f"{column} = COALESCE(excluded.{column}, {self.name}.{column})" if column in identifying else f"{column} = excluded.{column}"
+            for column in columns if column not in self.key
+        )
+        rows = [self._row(item, partition) for item in items]
+        connection = self.mirror._connection()
+        # a single transaction per page instead of one per row
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                f"INSERT INTO {self.name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT ({', '.join(self.key)}) DO UPDATE SET {updates}",
+                rows,
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        entries = [{"path": self.mirror.path, "partition": {"table": self.name, **partition}, "rows": len(items)}]
+        self.restore(entries)
+        return entries
+
+    def restore(self, files: List[dict]) -> None:
+        """Add a page loaded by an earlier run to the manifest.
+
+        Used when a checkpointed call is resumed, so that the manifest also
+        counts the pages loaded before the interruption.
+
+        Parameters
+        ----------
+        files : List[dict]
+            The manifest entries of the page (see `write_files`).
+        """
+        with self._lock:
+            self._manifest.files.extend(files)
+            self._manifest.rows += sum(entry["rows"] for entry in files)
+            self._manifest.pages += 1
+
+    def manifest(self) -> SinkManifest:
+        """Return the summary of the pages loaded so far."""
+        with self._lock:
+            return SinkManifest(
+                root=self._manifest.root,
+                files=list(self._manifest.files),
+                rows=self._manifest.rows,
+                pages=self._manifest.pages,
+            )
+
+    def count(self) -> int:
+        """Return the number of rows of the table."""
+        return self.mirror._connection().execute(f"SELECT COUNT(*) FROM {self.name}").fetchone()[0]
+
+class LocalMirror:
+    """
+    Local SQLite copy of permits, contractors and residents for offline queries.
+
+    The mirror has one table per entity (`permits`, `contractors` and
+    `residents`), filled through the sinks `mirror.permits`,
+    `mirror.contractors` and `mirror.residents`. Tables have a column per
+    field of `SCHEMAS` (nested addresses as `address_*` columns), the ID the
+    items were fetched for (`geo_id`, or `contractor_id` for permits), and
+    the full item as JSON in `item`, readable with `json_extract`. Permits
+    are indexed by `id`, `geo_id`, `contractor_id`, `file_date` and
+    `issue_date`, and contractors by `id`, `geo_id` and `name`, so that
+    joins and filters run in milliseconds. The file can also be attached by
+    DuckDB (`ATTACH 'mirror.db' (TYPE sqlite)`).
+    """
+
+    def __init__(self, path: str | Path):
+        """Initialize the mirror.
+
+        Parameters
+        ----------
+        path : str | Path
+            The path to the SQLite database file. It is created if it does
+            not exist.
+        """
+        self.path: Path = Path(path)
+        self._local = threading.local()
+        self.permits: MirrorTable = MirrorTable(self, "permits")
+        self.contractors: MirrorTable = MirrorTable(self, "contractors")
+        self.residents: MirrorTable = MirrorTable(self, "residents")
+        connection = self._connection()
+        for table in self.tables():
+            table._create(connection)
+
+    def __reduce__(self):
+        return (LocalMirror, (self.path,))
+
+    def _connection(self):
+        """Return the connection of the calling thread, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = connect_sqlite(self.path)
+            self._local.connection = connection
+        return connection
+
+    def tables(self) -> List[MirrorTable]:
+        """Return the tables of the mirror."""
+        return [self.permits, self.contractors, self.residents]
+
+    def query(self, sql: str, parameters: Sequence | dict = ()) -> List[dict]:
+        """Run a SQL query against the mirror.
+
+        Parameters
+        ----------
+        sql : str
+            The SQLite query, e.g. `SELECT c.name, COUNT(*) FROM permits p
+            JOIN contractors c ON c.id = p.contractor_id GROUP BY c.name`.
+        parameters : Sequence | dict, optional
+            The values of the `?` or `:name` placeholders of `sql`.
+
+        Returns
+        -------
+        List[dict]
+            One dictionary per row, keyed by column name.
+        """
+        cursor = self._connection().execute(sql, parameters)
+        if cursor.description is None:
+            return []
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def analyze(self) -> None:
+        """Refresh the statistics used by the query planner, e.g. after a large load."""
+        self._connection().execute("ANALYZE")
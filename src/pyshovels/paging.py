@@ -0,0 +1,139 @@
+import threading
+from contextvars import ContextVar
+from typing import Any
+
+__all__ = [
+    "AdaptivePageSize",
+    "IncompleteResultsError",
+    "MAX_PAGE_SIZE",
+]
+
+# largest `size` accepted by the paginated endpoints
+MAX_PAGE_SIZE = 100
+
+# (seconds, bytes) of the last response received over the network by the
+# current thread or task, read by the pagination loops after each request
+LAST_RESPONSE: ContextVar = ContextVar("pyshovels_last_response", default=None)
+
+class IncompleteResultsError(Exception):
+    """
+    Raised when a paginated request stops before its last page.
+
+    A page is given up on once its retries are exhausted (or on an error
+    that is not retried, such as HTTP 400), so the results of the call miss
+    that page and the following ones. Methods fetching several IDs raise it
+    once every other ID has been fetched.
+
+    Attributes
+    ----------
+    failed : dict
+        The parameters of the page that could not be fetched (with its
+        `cursor` or `page`), by ID (e.g., geo ID), or by URL for a single
+        request. The value is None if the ID failed on another error.
+    result : Any
+        The results fetched before the failure, in the format the call
+        returns (e.g., a DataFrame or a `SinkManifest`), or None.
+    """
+
+    def __init__(self, message: str, failed: dict, result: Any = None):
+        super().__init__(message)
+        self.failed: dict = failed
+        self.result: Any = result
+
+    def __reduce__(self):
+        return (IncompleteResultsError, (self.args[0], self.failed, self.result))
+
+class AdaptivePageSize:
+    """
+    Page size adapting to the latency and payload of the responses.
+
+    Paginated requests start at the largest page size, which needs the
+    fewest round trips. When a page takes longer than `max_latency` or is
+    larger than `max_bytes`, the size is halved (down to `min_size`); after
+    `recover_after` consecutive pages well under both thresholds, it grows
+    back by a quarter. The size is shared by all the requests of a client,
+    so a long harvest settles on it once. Only cursor-based chains change
+    size between pages: page-based chains keep the size of their first page,
+    since page numbers are offsets in units of the page size.
+    """
+
+    def __init__(
+        self,
+        max_size: int = MAX_PAGE_SIZE,
+        min_size: int = 10,
+        max_latency: float = 5.0,
+        max_bytes: int = 4 * 1024 ** 2,
+        recover_after: int = 5
+    ):
+        """Initialize the page size.
+
+        Parameters
+        ----------
+        max_size : int, optional
+            The initial and largest page size. Default is 100.
+        min_size : int, optional
+            The smallest page size. Default is 10.
+        max_latency : float, optional
+            The response time, in seconds, above which the size is halved.
+            Default is 5.
+        max_bytes : int, optional
+            The response body size, in bytes, above which the size is halved.
+            Default is 4 MiB.
+        recover_after : int, optional
+            The number of consecutive fast and small pages (under half of
+            both thresholds) after which the size grows back. Default is 5.
+
+        Raises
+        ------
+        AssertionError
+            If the sizes are not between 1 and `MAX_PAGE_SIZE`, or
+            `min_size` is greater than `max_size`.
+        """
+        assert 1 <= min_size <= max_size <= MAX_PAGE_SIZE, f"sizes must satisfy 1 <= min_size <= max_size <= {MAX_PAGE_SIZE}"
+        self.max_size: int = max_size
+        self.min_size: int = min_size
+        self.max_latency: float = max_latency
+        self.max_bytes: int = max_bytes
+        self.recover_after: int = recover_after
+        self.size: int = max_size
+        self.backoffs: int = 0
+        self._fast_pages = 0
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        return (AdaptivePageSize, (self.max_size, self.min_size, self.max_latency, self.max_bytes, self.recover_after))
+
+    def update(self, seconds: float, n_bytes: int) -> int:
+        """Adjust the size after a response and return the new size.
+
+        Parameters
+        ----------
+        seconds : float
+            The time taken by the response.
+        n_bytes : int
+            The size of the response body.
+
+        Returns
+        -------
+        int
+            The page size to use for the next request.
+        """
+        with self._lock:
+            if seconds > self.max_latency or n_bytes > self.max_bytes:
+                self._fast_pages = 0
+                if self.size > self.min_size:
+                    self.size = max(self.size // 2, self.min_size)
+                    self.backoffs += 1
+            elif seconds < self.max_latency / 2 and n_bytes < self.max_bytes / 2:
+                self._fast_pages += 1
+                if self._fast_pages >= self.recover_after and self.size < self.max_size:
+                    self._fast_pages = 0
+                    self.size = min(self.size + max(self.size // 4, 1), self.max_size)
+            else:
+                self._fast_pages = 0
+            return self.size
+
+    def stats(self) -> dict:
+        """Return the current page `size` and the number of `backoffs` so far."""
+        with self._lock:
+            return {"size": self.size, "backoffs": self.backoffs}
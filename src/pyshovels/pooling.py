@@ -0,0 +1,95 @@
+import threading
+from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
+
+__all__ = [
+    "PoolConfig",
+    "PoolStatsAdapter",
+]
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """
+    HTTP connection pool configuration.
+
+    Unset sizes follow the concurrency of the client (`max_workers` for
+    `ShovelsAPI`, `max_concurrency` for `AsyncShovelsAPI`), so that every
+    worker can hold a connection open instead of opening a new one, and
+    repeating the TLS handshake, for each request.
+
+    Attributes
+    ----------
+    pool_connections : int, optional
+        The number of per-host pools to keep. Default is None, which uses 10.
+    pool_maxsize : int, optional
+        The maximum number of connections kept open per host.
+        Default is None, which uses the client's concurrency (at least 10).
+    pool_block : bool
+        Whether to wait for a free connection when `pool_maxsize` connections
+        are in use, instead of opening an extra connection that is discarded
+        after the request. Default is False.
+    keep_alive : bool
+        Whether to reuse connections between requests. Default is True.
+    keepalive_timeout : float
+        The number of seconds an idle connection is kept open. Only used by
+        `AsyncShovelsAPI`; `requests` keeps connections until the server
+        closes them. Default is 15.
+    """
+    pool_connections: int | None = None
+    pool_maxsize: int | None = None
+    pool_block: bool = False
+    keep_alive: bool = True
+    keepalive_timeout: float = 15.0
+
+    def maxsize(self, concurrency: int) -> int:
+        """Return the number of connections per host for a given concurrency."""
+        return self.pool_maxsize or max(concurrency, 10)
+
+class PoolStatsAdapter(HTTPAdapter):
+    """
+    `requests` transport adapter that counts requests and new connections.
+
+    Every time a pooled connection opens a socket (a new connection, or a
+    reconnection after the server closed an idle one) it is counted as
+    created, so `requests - connections_created` is the number of requests
+    that reused an open connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._counters_lock = threading.Lock()
+        self.counters: dict = {"requests": 0, "connections_created": 0}
+        super().__init__(*args, **kwargs)
+
+    def _increment(self, counter: str) -> None:
+        with self._counters_lock:
+            self.counters[counter] += 1
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        adapter = self
+
+        def counting_pool_cls(pool_cls):
+            class CountingConnection(pool_cls.ConnectionCls):
+                def connect(self):
+                    adapter._increment("connections_created")
+                    return super().connect()
+            return type(pool_cls.__name__, (pool_cls,), {"ConnectionCls": CountingConnection})
+
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: counting_pool_cls(pool_cls)
+            for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    def send(self, request, **kwargs):
+        self._increment("requests")
+        return super().send(request, **kwargs)
+
+    def idle_connections(self) -> int:
+        """Return the number of open connections waiting in the pools."""
+        idle = 0
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None and pool.pool is not None:
+                idle += sum(conn is not None and conn.sock is not None for conn in list(pool.pool.queue))
+        return idle
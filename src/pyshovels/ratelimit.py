@@ -0,0 +1,180 @@
+import asyncio
+import email.utils
+import multiprocessing
+import threading
+import time
+from typing import Mapping
+
+__all__ = [
+    "RateLimiter",
+]
+
+# indexes into the limiter state array
+_TAT = 0            # theoretical arrival time of the next request
+_BLOCKED_UNTIL = 1  # no request may start before this time
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parses a `Retry-After` header value into a number of seconds.
+
+    Parameters
+    ----------
+    value : str, optional
+        The header value, either a number of seconds or an HTTP date.
+
+    Returns
+    -------
+    float | None
+        The number of seconds to wait, or None if the value cannot be parsed.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+class RateLimiter:
+    """
+    Token bucket rate limiter shared by every request of a client.
+
+    The limiter caps the request rate at `rate` requests per second, allowing
+    bursts of up to `burst` requests. It also pauses all requests when the
+    server asks for it through `Retry-After` or rate-limit headers.
+
+    The limiter is thread-safe. Pass `shared=True` to also share it with
+    worker processes (e.g., the ones started by `ShovelsAPI.harvest`);
+    otherwise each process gets its own independent bucket.
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: int = 1,
+        shared: bool = False
+    ):
+        """Initialize the rate limiter.
+
+        Parameters
+        ----------
+        rate : float, optional
+            The maximum number of requests per second. Default is None,
+            which does not cap the request rate and only honors the pauses
+            requested by the server.
+        burst : int, optional
+            The number of requests that may be sent back to back before the
+            rate cap applies. Default is 1.
+        shared : bool, optional
+            Whether to keep the limiter state in shared memory so that it
+            can be used by several processes. Default is False.
+
+        Raises
+        ------
+        AssertionError
+            If `rate` is not positive or `burst` is lower than 1.
+        """
+        assert rate is None or rate > 0, "rate must be greater than 0"
+        assert burst >= 1, "burst must be greater than or equal to 1"
+        self.rate: float | None = rate
+        self.burst: int = burst
+        self.shared: bool = shared
+        if shared:
+            self._lock = multiprocessing.Lock()
+            self._state = multiprocessing.Array('d', 2, lock=False)
+        else:
+            self._lock = threading.Lock()
+            self._state = [0.0, 0.0]
+
+    def __reduce__(self):
+        if self.shared:
+            # shared state can only be handed to a child process on creation
+            return (self._rebuild, (self.rate, self.burst, self._lock, self._state))
+        return (RateLimiter, (self.rate, self.burst))
+
+    @classmethod
+    def _rebuild(cls, rate, burst, lock, state) -> "RateLimiter":
+        limiter = cls.__new__(cls)
+        limiter.rate, limiter.burst, limiter.shared = rate, burst, True
+        limiter._lock, limiter._state = lock, state
+        return limiter
+
+    def reserve(self) -> float:
+        """Reserve a slot for one request.
+
+        Returns
+        -------
+        float
+            The number of seconds to wait before sending the request.
+        """
+        with self._lock:
+            now = time.time()
+            blocked_until = self._state[_BLOCKED_UNTIL]
+            if self.rate is None:
+                return max(blocked_until - now, 0.0)
+            interval = 1 / self.rate
+            tat = max(self._state[_TAT], now, blocked_until)
+            wait = max(tat - now - (self.burst - 1) * interval, blocked_until - now, 0.0)
+            self._state[_TAT] = tat + interval
+            return wait
+
+    def acquire(self) -> None:
+        """Block the calling thread until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait, without blocking the event loop, until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for the next `seconds` seconds.
+
+        Parameters
+        ----------
+        seconds : float
+            The number of seconds to pause for.
+        """
+        with self._lock:
+            self._state[_BLOCKED_UNTIL] = max(self._state[_BLOCKED_UNTIL], time.time() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> float | None:
+        """Pause the limiter as requested by response headers.
+
+        Honors `Retry-After`, and pauses until the quota window resets when
+        `X-RateLimit-Remaining` (or `RateLimit-Remaining`) reaches 0. The reset
+        time is read from `X-RateLimit-Reset` (or `RateLimit-Reset`), either as
+        a number of seconds or as a Unix timestamp.
+
+        Parameters
+        ----------
+        headers : Mapping[str, str]
+            The response headers (case-insensitive mapping).
+
+        Returns
+        -------
+        float | None
+            The number of seconds the limiter was paused for, or None if the
+            headers did not request a pause.
+        """
+        seconds = parse_retry_after(headers.get("Retry-After"))
+        remaining = headers.get("X-RateLimit-Remaining", headers.get("RateLimit-Remaining"))
+        reset = headers.get("X-RateLimit-Reset", headers.get("RateLimit-Reset"))
+        if seconds is None and remaining is not None and reset is not None:
+            try:
+                if float(remaining) <= 0:
+                    reset = float(reset)
+                    # large values are Unix timestamps rather than durations
+                    seconds = max(reset - time.time(), 0.0) if reset > 1e9 else reset
+            except ValueError:
+                pass
+        if seconds:
+            self.pause(seconds)
+        return seconds
@@ -0,0 +1,97 @@
+from typing import Any
+
+__all__ = [
+    "Record",
+    "Permit",
+    "Contractor",
+    "Resident",
+    "RECORD_TYPES",
+]
+
+class Record:
+    """
+    Compact, attribute-based record of an API item.
+
+    Records use `__slots__` instead of a per-instance `__dict__`, which makes
+    them several times smaller than the item dictionaries. Fields known to the
+    record class are attributes (None when missing from the item); any other
+    field is kept in the `extra` dictionary, which is None when there are none.
+    """
+    __slots__ = ("extra",)
+    # names of the known fields, in declaration order, set for each subclass
+    _fields: tuple = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        names = []
+        for klass in reversed(cls.__mro__):
+            names.extend(name for name in klass.__dict__.get("__slots__", ()) if name != "extra")
+        cls._fields = tuple(names)
+
+    def __init__(self, **values: Any):
+        for name in self._fields:
+            setattr(self, name, values.pop(name, None))
+        self.extra: dict | None = values or None
+
+    @classmethod
+    def fields(cls) -> tuple:
+        """Return the names of the known fields, in declaration order."""
+        return cls._fields
+
+    @classmethod
+    def from_dict(cls, item: dict) -> "Record":
+        """Build a record from an API item."""
+        return cls(**item)
+
+    def to_dict(self) -> dict:
+        """Return the record as an API item dictionary."""
+        item = {name: getattr(self, name) for name in self._fields}
+        if self.extra:
+            item.update(self.extra)
+        return item
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r})"
+
+class Permit(Record):
+    """A building permit, as returned by the permit endpoints."""
+    __slots__ = (
+        "id", "number", "description", "jurisdiction", "job_value", "fees",
+        "type", "subtype", "status", "file_date", "issue_date", "final_date",
+        "start_date", "end_date", "total_duration", "approval_duration",
+        "construction_duration", "inspection_pass_rate", "property_type",
+        "tags", "contractor_id", "address",
+    )
+
+class Contractor(Record):
+    """A contractor, as returned by the contractor endpoints."""
+    __slots__ = (
+        "id", "name", "biz_name", "classification", "primary_industry",
+        "license", "phone", "email", "website", "revenue", "employee_count",
+        "permit_count", "avg_job_value", "total_job_value",
+        "avg_construction_duration", "avg_inspection_pass_rate",
+        "status_tally", "tag_tally", "address",
+    )
+
+class Resident(Record):
+    """A resident of an address, as returned by the residents endpoint."""
+    __slots__ = (
+        "name", "personal_emails", "phone", "gender", "age_range",
+        "is_married", "has_children", "income_range", "net_worth",
+        "is_homeowner", "address",
+    )
+
+    def __repr__(self) -> str:
+        return f"Resident(name={self.name!r})"
+
+# record class of each entity returned with `output="records"`
+RECORD_TYPES = {
+    "permits": Permit,
+    "contractors": Contractor,
+    "residents": Resident,
+}
@@ -0,0 +1,61 @@
+import random
+from dataclasses import dataclass
+
+__all__ = [
+    "RetryPolicy",
+]
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry policy for transient request failures.
+
+    Failed requests are retried with exponential backoff and full jitter: the
+    n-th retry waits a random delay between 0 and
+    `min(backoff_max, backoff_factor * 2 ** n)` seconds, unless the server
+    specifies a delay through the `Retry-After` header.
+
+    Attributes
+    ----------
+    max_retries : int
+        The maximum number of retries per request. Default is 5.
+    backoff_factor : float
+        The base delay in seconds. Default is 0.5.
+    backoff_max : float
+        The maximum delay in seconds. Default is 60.
+    jitter : bool
+        Whether to randomize the delays, which spreads out the retries of
+        concurrent requests. Default is True.
+    retry_statuses : frozenset
+        The HTTP status codes that are retried.
+        Default is 429, 500, 502, 503 and 504.
+    """
+    max_retries: int = 5
+    backoff_factor: float = 0.5
+    backoff_max: float = 60.0
+    jitter: bool = True
+    retry_statuses: frozenset = frozenset({429, 500, 502, 503, 504})
+
+    def __post_init__(self):
+        assert self.max_retries >= 0, "max_retries must be greater than or equal to 0"
+        assert self.backoff_factor >= 0, "backoff_factor must be greater than or equal to 0"
+
+    def is_retryable(self, status_code: int) -> bool:
+        """Whether a response with `status_code` should be retried."""
+        return status_code in self.retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay in seconds before retry number `attempt` (from 0).
+
+        Parameters
+        ----------
+        attempt : int
+            The number of retries already made for the request.
+
+        Returns
+        -------
+        float
+            The delay in seconds.
+        """
+        delay = min(self.backoff_max, self.backoff_factor * 2 ** attempt)
+        return random.uniform(0, delay) if self.jitter else delay
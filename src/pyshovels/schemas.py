@@ -0,0 +1,95 @@
+__all__ = [
+    "PERMIT_SCHEMA",
+    "CONTRACTOR_SCHEMA",
+    "RESIDENT_SCHEMA",
+    "METRICS_SCHEMA",
+    "SCHEMAS",
+    "NESTED_FIELDS",
+]
+
+# fields holding nested objects, expanded into columns with `flatten=True`
+NESTED_FIELDS = ("address",)
+
+# Column dtypes applied by `ColumnarBuilder.to_frame`. Supported dtypes are
+# "category", "datetime", "string", "boolean", "Int64" and "Float64"; columns
+# that are missing from a frame are ignored, and columns without a dtype keep
+# the one inferred by pandas. Flattened `address` columns are included.
+
+ADDRESS_SCHEMA = {
+    "address_city": "category",
+    "address_county": "category",
+    "address_state": "category",
+    "address_zip_code": "category",
+    "address_jurisdiction": "category",
+}
+
+PERMIT_SCHEMA = {
+    "status": "category",
+    "type": "category",
+    "subtype": "category",
+    "property_type": "category",
+    "jurisdiction": "category",
+    "state": "category",
+    "file_date": "datetime",
+    "issue_date": "datetime",
+    "final_date": "datetime",
+    "start_date": "datetime",
+    "end_date": "datetime",
+    "job_value": "Float64",
+    "fees": "Float64",
+    "total_duration": "Int64",
+    "approval_duration": "Int64",
+    "construction_duration": "Int64",
+    "inspection_pass_rate": "Float64",
+    **ADDRESS_SCHEMA,
+}
+
+CONTRACTOR_SCHEMA = {
+    "classification": "category",
+    "primary_industry": "category",
+    "status": "category",
+    "state": "category",
+    "license_issue_date": "datetime",
+    "license_exp_date": "datetime",
+    "first_seen_date": "datetime",
+    "revenue": "Float64",
+    "employee_count": "Int64",
+    "permit_count": "Int64",
+    "avg_job_value": "Float64",
+    "total_job_value": "Float64",
+    "avg_construction_duration": "Float64",
+    "avg_inspection_pass_rate": "Float64",
+    **ADDRESS_SCHEMA,
+}
+
+RESIDENT_SCHEMA = {
+    "gender": "category",
+    "age_range": "category",
+    "income_range": "category",
+    "net_worth": "category",
+    "state": "category",
+    "is_married": "boolean",
+    "has_children": "boolean",
+    "is_homeowner": "boolean",
+    **ADDRESS_SCHEMA,
+}
+
+METRICS_SCHEMA = {
+    "property_type": "category",
+    "tag": "category",
+    "date": "datetime",
+    "permit_count": "Int64",
+    "contractor_count": "Int64",
+    "total_job_value": "Float64",
+    "avg_job_value": "Float64",
+    "avg_construction_duration": "Float64",
+    "avg_approval_duration": "Float64",
+    "avg_inspection_pass_rate": "Float64",
+}
+
+SCHEMAS = {
+    "permits": PERMIT_SCHEMA,
+    "contractors": CONTRACTOR_SCHEMA,
+    "residents": RESIDENT_SCHEMA,
+    "metrics": METRICS_SCHEMA,
+}
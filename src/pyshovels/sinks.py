@@ -0,0 +1,328 @@
+import datetime
+import json
+import threading
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+from .records import RECORD_TYPES
+from .schemas import NESTED_FIELDS, SCHEMAS
+
+__all__ = [
+    "ParquetSink",
+    "SinkManifest",
+]
+
+# partition value used by Hive, Spark and DuckDB for missing values
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# Parquet column type of each `SCHEMAS` dtype; other columns are written as strings
+ARROW_TYPES = {
+    "category": "string",
+    "string": "string",
+    "datetime": "timestamp[us]",
+    "boolean": "bool",
+    "Int64": "int64",
+    "Float64": "double",
+}
+
+# column holding, as JSON, the fields of an item that are not in the schema
+EXTRA_COLUMN = "extra"
+
+# field partitioning the items of each entity by month with `date_field="auto"`
+DATE_FIELDS = {"permits": "file_date"}
+
+def to_parquet_value(value, dtype: str | None):
+    """
+    Converts an API value to the Python value of its Parquet column.
+
+    Values that cannot be converted to the column type become missing.
+    Lists and objects are written as JSON strings.
+
+    Parameters
+    ----------
+    value : Any
+        The API value.
+    dtype : str, optional
+        The `SCHEMAS` dtype of the column. Default is None, which writes
+        the value as a string.
+
+    Returns
+    -------
+    Any
+        The converted value.
+    """
+    if value is None:
+        return None
+    try:
+        if dtype == "datetime":
+            return datetime.datetime.fromisoformat(str(value)).replace(tzinfo=None)
+        if dtype == "boolean":
+            return value if isinstance(value, bool) else None
+        if dtype == "Int64":
+            return int(value) if not isinstance(value, bool) else None
+        if dtype == "Float64":
+            return float(value) if not isinstance(value, bool) else None
+    except (TypeError, ValueError):
+        return None
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, default=str)
+
+@dataclass
+class SinkManifest:
+    """
+    Summary of the files written by a `ParquetSink`.
+
+    Attributes
+    ----------
+    root : Path
+        The root directory of the dataset.
+    files : List[dict]
+        One entry per file written, with its `path`, its `partition` values
+        and its number of `rows`, in write order.
+    rows : int
+        The total number of rows written.
+    pages : int
+        The number of pages written.
+    """
+    root: Path
+    files: List[dict] = field(default_factory=list)
+    rows: int = 0
+    pages: int = 0
+
+    @property
+    def partitions(self) -> List[dict]:
+        """The distinct partitions written, in order of first write."""
+        seen = {}
+        for entry in self.files:
+            seen.setdefault(tuple(entry["partition"].items()), entry["partition"])
+        return list(seen.values())
+
+class ParquetSink:
+    """
+    Writes pages of API items into a Hive-partitioned Parquet dataset.
+
+    Each page is written as soon as it is received, to files laid out as
+    `root/geo_id=CA/month=2025-04/part-<run>-<n>.parquet`, so the items never
+    accumulate in memory. The partition columns are encoded in the paths and
+    are not stored in the files, as expected by Spark, DuckDB
+    (`read_parquet(..., hive_partitioning=true)`) and `pyarrow.dataset`.
+
+    Every file is written with the same explicit schema, so the dataset can
+    be read as a whole without schema unification: the fields of the
+    `entity` records (see `RECORD_TYPES`) typed after `SCHEMAS`, nested
+    objects and fields without a dtype as strings (JSON for lists and
+    objects), and any other field of an item as JSON in an `extra` column.
+    Values that do not match the type of their column are written as missing.
+
+    The client methods set the entity of the sink they are given (e.g.,
+    "contractors" for `search_contractors`), so a sink holds the items of a
+    single entity: passing it to a method returning another one fails.
+
+    Requires `pyarrow`. A sink is thread-safe and can be passed to several
+    calls; every call appends to the same manifest.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        date_field: str | None = "auto",
+        compression: str = "snappy",
+        entity: str | None = None
+    ):
+        """Initialize the sink.
+
+        Parameters
+        ----------
+        root : str | Path
+            The root directory of the dataset. It is created if it does not
+            exist.
+        date_field : str, optional
+            The item field, holding an ISO date, whose year and month are used
+            for the `month` partition. Default is "auto", which uses the
+            filing date (`file_date`) of permits and no `month` partition for
+            other entities. If None, files are only partitioned by ID. Items
+            without a date go to the `month=__HIVE_DEFAULT_PARTITION__`
+            partition.
+        compression : str, optional
+            The Parquet compression codec. Default is "snappy".
+        entity : str, optional
+            The kind of items written (e.g., "permits", "contractors" or
+            "residents"), setting the columns of the files for the entities
+            of `SCHEMAS`. Default is None, which takes the entity of the
+            first client method the sink is passed to (see `bind`). Without
+            an entity, or for an entity without a schema, the columns are the
+            fields of the first page written, as strings.
+
+        Raises
+        ------
+        ImportError
+            If `pyarrow` is not installed.
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("ParquetSink requires pyarrow: pip install pyarrow")
+        self.root: Path = Path(root)
+        self.date_field: str | None = date_field
+        self.compression: str = compression
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._run_id = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._n_files = 0
+        self._manifest = SinkManifest(root=self.root)
+        self.entity: str | None = None
+        # dtype of each column, by name; without a schema, set by the first page
+        self.columns: dict | None = None
+        if entity is not None:
+            self.bind(entity)
+
+    def bind(self, entity: str) -> None:
+        """Set the entity of the items written, unless it is already set.
+
+        Called by the client methods with the entity they return, before
+        any page is written.
+
+        Parameters
+        ----------
+        entity : str
+            The kind of items written (e.g., "permits").
+
+        Raises
+        ------
+        AssertionError
+            If the sink already holds another entity.
+        """
+        with self._lock:
+            if self.entity is not None:
+                assert entity == self.entity, f"this ParquetSink holds {self.entity}, not {entity}"
+                return
+            self.entity = entity
+            if self.date_field == "auto":
+                self.date_field = DATE_FIELDS.get(entity)
+            if self.columns is None and entity in SCHEMAS:
+                self.columns = self._entity_columns(entity)
+
+    @staticmethod
+    def _entity_columns(entity: str) -> dict:
+        schema = SCHEMAS[entity]
+        record_cls = RECORD_TYPES.get(entity)
+        names = list(record_cls.fields()) if record_cls else []
+        # flattened sub-fields (e.g., address_city) stay in their nested object
+        nested = tuple(f"{field}_" for field in NESTED_FIELDS)
+        names.extend(name for name in schema if name not in names and not name.startswith(nested))
+        return {name: schema.get(name) for name in names}
+
+    def _table(self, rows: List[dict], partition: dict):
+        import pyarrow as pa
+
+        columns = {name: dtype for name, dtype in self.columns.items() if name not in partition and name != EXTRA_COLUMN}
+        schema = pa.schema([(name, pa.type_for_alias(ARROW_TYPES.get(dtype, "string"))) for name, dtype in columns.items()])
+        schema = schema.append(pa.field(EXTRA_COLUMN, pa.string()))
+        values = {name: [to_parquet_value(row.get(name), dtype) for row in rows] for name, dtype in columns.items()}
+        extras = []
+        for row in rows:
+            extra = {key: value for key, value in row.items() if key not in columns and key not in partition}
+            extras.append(json.dumps(extra, default=str) if extra else None)
+        values[EXTRA_COLUMN] = extras
+        return pa.table(values, schema=schema)
+
+    def _month(self, item: dict) -> str:
+        value = item.get(self.date_field)
+        if not value:
+            return NULL_PARTITION
+        return str(value)[:7]
+
+    def write(self, items: List[dict], partition: dict) -> int:
+        """Write a page of items. See `write_files` for parameter details.
+
+        Returns
+        -------
+        int
+            The number of rows written.
+        """
+        self.write_files(items, partition)
+        return len(items)
+
+    def write_files(self, items: List[dict], partition: dict) -> List[dict]:
+        """Write a page of items and return the files written.
+
+        Parameters
+        ----------
+        items : List[dict]
+            The items of the page.
+        partition : dict
+            The partition values shared by all items, e.g. `{"geo_id": "CA"}`.
+            The `month` partition is added per item from `date_field`.
+
+        Returns
+        -------
+        List[dict]
+            The manifest entries of the files written (see
+            `SinkManifest.files`), one per `month` partition of the page.
+        """
+        import pyarrow.parquet as pq
+
+        with self._lock:
+            if self.date_field == "auto":
+                self.date_field = None
+            if self.columns is None and items:
+                self.columns = {name: None for item in items for name in item}
+        groups = {}
+        if self.date_field is None:
+            groups[None] = items
+        else:
+            for item in items:
+                groups.setdefault(self._month(item), []).append(item)
+
+        entries = []
+        for month, rows in groups.items():
+            if not rows:
+                continue
+            values = {**partition} if month is None else {**partition, "month": month}
+            directory = self.root.joinpath(*(f"{key}={value}" for key, value in values.items()))
+            directory.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                self._n_files += 1
+                path = directory / f"part-{self._run_id}-{self._n_files:06d}.parquet"
+            pq.write_table(self._table(rows, partition), path, compression=self.compression)
+            entries.append({"path": path, "partition": values, "rows": len(rows)})
+
+        with self._lock:
+            self._manifest.files.extend(entries)
+            self._manifest.rows += len(items)
+            self._manifest.pages += 1
+        return entries
+
+    def restore(self, files: List[dict]) -> None:
+        """Add the files of a page written by an earlier run to the manifest.
+
+        Used when a checkpointed call is resumed, so that the manifest also
+        lists the files written before the interruption. Files already in
+        the manifest are not added again.
+
+        Parameters
+        ----------
+        files : List[dict]
+            The manifest entries of the files of the page (see `write_files`).
+        """
+        with self._lock:
+            known = {entry["path"] for entry in self._manifest.files}
+            new = [entry for entry in files if entry["path"] not in known]
+            if not new:
+                return
+            self._manifest.files.extend(new)
+            self._manifest.rows += sum(entry["rows"] for entry in new)
+            self._manifest.pages += 1
+
+    def manifest(self) -> SinkManifest:
+        """Return the manifest of the files written so far."""
+        with self._lock:
+            return SinkManifest(
+                root=self._manifest.root,
+                files=list(self._manifest.files),
+                rows=self._manifest.rows,
+                pages=self._manifest.pages,
+            )
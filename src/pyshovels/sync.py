@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import datetime
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, List
+
+from .cache import DiskCache, connect_sqlite
+from .frames import ColumnarBuilder
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+__all__ = [
+    "SyncResult",
+    "SyncStore",
+]
+
+# search parameters defining the date window rather than the filter set
+WINDOW_PARAMS = ("permit_from", "permit_to", "geo_id", "cursor", "page", "size")
+
+@dataclass
+class SyncResult:
+    """
+    Summary of an incremental permit sync.
+
+    Attributes
+    ----------
+    items : dict
+        The number of permits fetched and upserted, by geo ID.
+    windows : dict
+        The `(permit_from, permit_to)` window queried, by geo ID.
+    watermarks : dict
+        The watermark (latest `file_date` synced) after the sync, by geo ID.
+    failed : List[str]
+        The geo IDs whose sync did not complete. Their watermark is left
+        unchanged, so the next sync fetches their window again.
+    """
+    items: dict = field(default_factory=dict)
+    windows: dict = field(default_factory=dict)
+    watermarks: dict = field(default_factory=dict)
+    failed: List[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        """The total number of permits fetched."""
+        return sum(self.items.values())
+
+class SyncStore:
+    """
+    Local SQLite dataset of permits kept up to date incrementally.
+
+    Permits are stored once per (geo ID, permit ID) and replaced when fetched
+    again. For each geo ID and set of search filters, the store keeps a
+    high-watermark: the latest `file_date` synced. `ShovelsAPI.sync_permits`
+    only queries permits filed from the watermark onward, so a daily refresh
+    downloads about a day of permits per geo instead of the whole history.
+    The database can be shared by several threads and processes.
+    """
+
+    def __init__(self, path: str | Path):
+        """Initialize the store.
+
+        Parameters
+        ----------
+        path : str | Path
+            The path to the SQLite database file. It is created if it does
+            not exist.
+        """
+        self.path: Path = Path(path)
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS permits ("
+            "geo_id TEXT NOT NULL, id TEXT NOT NULL, file_date TEXT, item TEXT NOT NULL, "
+            "synced_at REAL NOT NULL, PRIMARY KEY (geo_id, id))"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS permits_file_date ON permits (geo_id, file_date)")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks ("
+            "geo_id TEXT NOT NULL, filter_key TEXT NOT NULL, filters TEXT NOT NULL, "
+            "watermark TEXT, synced_at REAL NOT NULL, PRIMARY KEY (geo_id, filter_key))"
+        )
+
+    def __reduce__(self):
+        return (SyncStore, (self.path,))
+
+    def _connection(self):
+        """Return the connection of the calling thread, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = connect_sqlite(self.path)
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def filters(params: dict | None) -> dict:
+        """Return the search parameters that define a filter set, without the date window."""
+        return {key: value for key, value in (params or {}).items() if key not in WINDOW_PARAMS and value is not None}
+
+    @staticmethod
+    def filter_key(params: dict | None) -> str:
+        """Return the key of the filter set of `params` (see `filters`)."""
+        return DiskCache.make_key("permits/search", SyncStore.filters(params))
+
+    def get_watermark(self, geo_id: str, params: dict | None = None) -> str | None:
+        """Return the watermark of `geo_id` for the filters of `params`, or None if never synced."""
+        row = self._connection().execute(
+            "SELECT watermark FROM watermarks WHERE geo_id = ? AND filter_key = ?",
+            (geo_id, self.filter_key(params)),
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, geo_id: str, params: dict | None, watermark: str | None) -> None:
+        """Record the watermark of `geo_id` for the filters of `params`."""
+        self._connection().execute(
+            "INSERT OR REPLACE INTO watermarks (geo_id, filter_key, filters, watermark, synced_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (geo_id, self.filter_key(params), json.dumps(self.filters(params), default=str), watermark, time.time()),
+        )
+
+    def window(
+        self,
+        geo_id: str,
+        params: dict,
+        lookback_days: int = 7
+    ) -> tuple:
+        """Return the `(permit_from, permit_to)` window to query for `geo_id`.
+
+        Parameters
+        ----------
+        geo_id : str
+            The geo ID to sync.
+        params : dict
+            The search parameters, with `permit_from` and `permit_to` set.
+            They are used as is if the geo ID was never synced.
+        lookback_days : int, optional
+            The number of days before the watermark that are fetched again,
+            to pick up permits published late. Default is 7.
+
+        Returns
+        -------
+        tuple
+            The ISO start and end dates of the window.
+        """
+        watermark = self.get_watermark(geo_id, params)
+        if watermark is None:
+            return params["permit_from"], params["permit_to"]
+        start = datetime.date.fromisoformat(watermark[:10]) - datetime.timedelta(days=lookback_days)
+        return max(start.isoformat(), params["permit_from"]), params["permit_to"]
+
+    def upsert(self, geo_id: str, items: List[dict]) -> str | None:
+        """Insert or replace the permits of a page.
+
+        Parameters
+        ----------
+        geo_id : str
+            The geo ID the permits were fetched for.
+        items : List[dict]
+            The permits. Permits without an `id` are skipped.
+
+        Returns
+        -------
+        str | None
+            The latest `file_date` of the permits, or None if none has one.
+        """
+        now = time.time()
+        rows = [
+            (geo_id, str(item["id"]), item.get("file_date"), json.dumps(item, default=str), now)
+            for item in items
+            if item.get("id") is not None
+        ]
+        self._connection().executemany(
+            "INSERT INTO permits (geo_id, id, file_date, item, synced_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (geo_id, id) DO UPDATE SET "
+            "file_date = excluded.file_date, item = excluded.item, synced_at = excluded.synced_at",
+            rows,
+        )
+        return max((row[2] for row in rows if row[2]), default=None)
+
+    def count(self, geo_ids: Iterable[str] | str | None = None) -> int:
+        """Return the number of stored permits, optionally for some geo IDs only."""
+        where, args = self._where(geo_ids)
+        return self._connection().execute(f"SELECT COUNT(*) FROM permits{where}", args).fetchone()[0]
+
+    def iter_items(self, geo_ids: Iterable[str] | str | None = None) -> Iterator[dict]:
+        """Yield the stored permits, optionally for some geo IDs only.
+
+        Parameters
+        ----------
+        geo_ids : Iterable[str] | str, optional
+            The geo IDs to read. Default is None, which reads all of them.
+
+        Yields
+        ------
+        dict
+            One permit at a time, ordered by geo ID and `file_date`.
+        """
+        where, args = self._where(geo_ids)
+        cursor = self._connection().execute(f"SELECT item FROM permits{where} ORDER BY geo_id, file_date", args)
+        for (item,) in cursor:
+            yield json.loads(item)
+
+    def to_frame(self, geo_ids: Iterable[str] | str | None = None) -> pd.DataFrame:
+        """Load the stored permits into a DataFrame, optionally for some geo IDs only."""
+        builder = ColumnarBuilder()
+        page = []
+        for item in self.iter_items(geo_ids):
+            page.append(item)
+            if len(page) == 1000:
+                builder.extend(page)
+                page = []
+        builder.extend(page)
+        return builder.to_frame()
+
+    @staticmethod
+    def _where(geo_ids: Iterable[str] | str | None) -> tuple:
+        if geo_ids is None:
+            return "", ()
+        if isinstance(geo_ids, str):
+            geo_ids = [geo_ids]
+        geo_ids = list(geo_ids)
+        return f" WHERE geo_id IN ({', '.join('?' * len(geo_ids))})", tuple(geo_ids)
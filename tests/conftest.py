@@ -0,0 +1,130 @@
+"""Local fake of the Shovels API served over HTTP for the client tests."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from pyshovels import RetryPolicy, ShovelsAPI
+
+PARAMS = {"permit_from": "2025-01-01", "permit_to": "2025-12-31"}
+
+def make_items(key: str, n: int) -> list:
+    """Items of a geo or contractor ID: `n` permits spread over the 12 months of 2025."""
+    return [
+        {
+            "id": f"P{key}{i:05d}",
+            "file_date": f"2025-{i % 12 + 1:02d}-15",
+            "status": "active",
+            "fees": None if i % 2 else 12.5,
+            "tags": ["solar"],
+            "address": {"street": "Main", "city": "Springfield", "state": key, "zip_code": "90001"},
+            "contractor_id": f"C{i % 20}",
+        }
+        for i in range(n)
+    ]
+
+class FakeShovels(ThreadingHTTPServer):
+    """
+    HTTP server answering like the Shovels API.
+
+    Searches return `n_items` permits per geo ID, paginated with a cursor
+    (an offset) or with `page`, 50 items per page by default, and the data
+    release date is `release`. Every request is recorded in `requests`,
+    `delay` slows every response down and `fail_when(path, query)` returns
+    a status code to fail a request with (or None).
+    """
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.n_items = 250
+        self.release = "2025-05-01"
+        self.delay = 0.0
+        self.fail_when = lambda path, query: None
+        self.requests = []
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v2"
+
+    def count(self, path: str | None = None) -> int:
+        """Return the number of requests received, optionally for a path only."""
+        with self.lock:
+            return sum(1 for request_path, _ in self.requests if path is None or request_path == path)
+
+class Handler(BaseHTTPRequestHandler):
+    server: FakeShovels
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, content, status: int = 200, headers: dict | None = None):
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def paginate(self, query: dict, items: list):
+        size = int(query.get("size", ["50"])[0])
+        if "page" in query:
+            page = int(query["page"][0])
+            chunk = items[(page - 1) * size:page * size]
+            next_page = page + 1 if page * size < len(items) else None
+            return self.send_json({"items": chunk, "size": len(chunk), "next_page": next_page})
+        start = int(query.get("cursor", ["0"])[0])
+        chunk = items[start:start + size]
+        next_cursor = str(start + size) if start + size < len(items) else None
+        self.send_json({"items": chunk, "size": len(chunk), "next_cursor": next_cursor})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path, query = url.path, parse_qs(url.query)
+        with self.server.lock:
+            self.server.requests.append((path, query))
+        status = self.server.fail_when(path, query)
+        if status is not None:
+            return self.send_json({"detail": "fail"}, status, {"Retry-After": "0"})
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        parts = path.strip("/").split("/")[1:]
+        if parts in (["permits", "search"], ["contractors", "search"]):
+            items = make_items(query.get("geo_id", ["XX"])[0], self.server.n_items)
+            start, end = query.get("permit_from", [""])[0], query.get("permit_to", ["9999"])[0]
+            return self.paginate(query, [item for item in items if start <= item["file_date"] <= end])
+        if parts in (["permits"], ["contractors"]):
+            # returned in reverse order to check that results are put back in input order
+            return self.paginate(query, [{"id": _id, "name": f"n{_id}"} for _id in reversed(query.get("id", []))])
+        if len(parts) == 3 and parts[0] in ("contractors", "addresses"):
+            return self.paginate(query, make_items(parts[1], 30))
+        if parts == ["meta", "release"]:
+            return self.send_json({"released_at": self.server.release})
+        if parts == ["list", "tags"]:
+            return self.send_json({"items": [{"id": "solar"}], "size": 1})
+        if len(parts) == 2 and parts[1] == "search":
+            return self.send_json({"items": [{"geo_id": query["q"][0], "name": query["q"][0]}], "size": 1})
+        self.send_json({"detail": "not found"}, 404)
+
+@pytest.fixture
+def server():
+    fake = FakeShovels()
+    thread = threading.Thread(target=fake.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield fake
+    fake.shutdown()
+    fake.server_close()
+
+@pytest.fixture
+def fast_retry() -> RetryPolicy:
+    return RetryPolicy(max_retries=3, backoff_factor=0.01, jitter=False)
+
+@pytest.fixture
+def client(server, fast_retry) -> ShovelsAPI:
+    return ShovelsAPI("key", server.base_url, retry=fast_retry, page_size=None)
@@ -0,0 +1,40 @@
+from pyshovels import DiskCache, ShovelsAPI
+
+from conftest import PARAMS
+
+def test_new_release_clears_the_cache(server, fast_retry, tmp_path):
+    cache = DiskCache(tmp_path / "cache.db")
+    client = ShovelsAPI("key", server.base_url, retry=fast_retry, cache=cache, release_check_interval=0, page_size=None)
+    client.get_data_release_date()  # memoized in the reference cache
+    client.search_permits("CA", PARAMS)
+    client.search_permits("CA", PARAMS)
+    assert server.count("/v2/permits/search") == 5
+
+    server.release = "2025-06-01"
+    client.search_permits("CA", PARAMS)
+    assert server.count("/v2/permits/search") == 10
+    assert client.get_data_release_date().isoformat() == "2025-06-01"
+
+def test_repeated_requests_hit_the_cache(server, fast_retry, tmp_path):
+    cache = DiskCache(tmp_path / "cache.db")
+    client = ShovelsAPI("key", server.base_url, retry=fast_retry, cache=cache, page_size=None)
+    first = client.search_permits("CA", PARAMS)
+    # a new client, as in a new process, with the parameters in another order
+    client = ShovelsAPI("key", server.base_url, retry=fast_retry, cache=cache, page_size=None)
+    second = client.search_permits("CA", dict(reversed(PARAMS.items())))
+    assert server.count("/v2/permits/search") == 5
+    assert second.equals(first)
+    assert cache.stats()["entries"] == 5
+
+def test_expired_and_invalidated_entries_are_dropped(tmp_path):
+    cache = DiskCache(tmp_path / "cache.db", ttl=None)
+    key = DiskCache.make_key("https://api/permits", {"geo_id": "CA"})
+    assert cache.set_release("2025-05-01")
+    cache.set(key, b"body")
+    assert cache.get(key) == b"body"
+    assert not cache.set_release("2025-05-01") and cache.get(key) == b"body"
+    assert cache.set_release("2025-06-01") and cache.get(key) is None
+
+    cache = DiskCache(tmp_path / "cache.db", ttl=0)
+    cache.set(key, b"body")
+    assert cache.get(key) is None and cache.stats()["entries"] == 0
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+
+import pytest
+
+import pyshovels.client
+from pyshovels import AdaptivePageSize, AsyncShovelsAPI, CheckpointStore, IncompleteResultsError, ParquetSink, RetryPolicy, ShovelsAPI
+
+from conftest import PARAMS
+
+def crash_after(offset: int):
+    """Return a `fail_when` failing every page of geo ID "TX" from the `offset` cursor on."""
+    def fail_when(path, query):
+        if query.get("geo_id") == ["TX"] and int(query.get("cursor", ["0"])[0]) >= offset:
+            return 500
+        return None
+    return fail_when
+
+@pytest.fixture
+def no_retry_client(server) -> ShovelsAPI:
+    return ShovelsAPI("key", server.base_url, retry=RetryPolicy(max_retries=0), page_size=None)
+
+def test_resume_skips_completed_and_continues_in_flight(server, no_retry_client, tmp_path):
+    checkpoint = CheckpointStore(tmp_path / "checkpoint.db")
+    server.fail_when = crash_after(150)
+    with pytest.raises(IncompleteResultsError) as error:
+        no_retry_client.search_permits(["CA", "TX"], PARAMS, checkpoint=checkpoint)
+    assert len(error.value.result) == 250 + 150
+    assert error.value.failed["TX"]["cursor"] == "150"
+    assert checkpoint.stats() == {"done": 1, "in_flight": 1, "pages": 8, "rows": 400}
+
+    server.fail_when = lambda path, query: None
+    server.requests.clear()
+    df = no_retry_client.search_permits(["CA", "TX", "NY"], PARAMS, checkpoint=checkpoint, resume=True)
+    assert len(df) == 750 and df["id"].is_unique
+    # TX continues at cursor 150 (2 pages) and NY is fetched in full (5 pages)
+    assert server.count() == 7
+    assert [query.get("cursor") for _, query in server.requests if query["geo_id"] == ["TX"]] == [["150"], ["200"]]
+
+def test_completed_call_is_restored_without_requests(server, client, tmp_path):
+    checkpoint = CheckpointStore(tmp_path / "checkpoint.db")
+    first = client.search_permits(["CA", "TX"], PARAMS, checkpoint=checkpoint)
+    server.requests.clear()
+    second = client.search_permits(["CA", "TX"], PARAMS, checkpoint=checkpoint, resume=True)
+    assert server.count() == 0
+    assert list(second["id"]) == list(first["id"])
+
+def test_without_resume_the_checkpoint_is_reset(server, client, tmp_path):
+    checkpoint = CheckpointStore(tmp_path / "checkpoint.db")
+    client.search_permits("CA", PARAMS, checkpoint=checkpoint)
+    server.requests.clear()
+    df = client.search_permits("CA", PARAMS, checkpoint=checkpoint)
+    assert len(df) == 250 and server.count() == 5
+    assert checkpoint.stats()["pages"] == 5
+
+def test_resume_with_dedupe_and_split_windows(server, no_retry_client, tmp_path):
+    checkpoint = CheckpointStore(tmp_path / "checkpoint.db")
+    no_retry_client.search_permits(["CA", "CA"], PARAMS, checkpoint=checkpoint, split_windows="monthly", dedupe=True)
+    server.requests.clear()
+    df = no_retry_client.search_permits(["CA", "CA"], PARAMS, checkpoint=checkpoint, split_windows="monthly", dedupe=True, resume=True)
+    assert server.count() == 0
+    assert len(df) == 250
+
+def test_resume_with_sink_only_fetches_missing_pages(server, no_retry_client, tmp_path):
+    pytest.importorskip("pyarrow")
+    checkpoint = CheckpointStore(tmp_path / "checkpoint.db")
+    sink = ParquetSink(tmp_path / "dataset")
+    server.fail_when = crash_after(100)
+    with pytest.raises(IncompleteResultsError):
+        no_retry_client.search_permits(["TX"], PARAMS, checkpoint=checkpoint, sink=sink)
+    server.fail_when = lambda path, query: None
+    # a new sink, as in a new process: the files of the interrupted run are listed too
+    sink = ParquetSink(tmp_path / "dataset")
+    manifest = no_retry_client.search_permits(["TX"], PARAMS, checkpoint=checkpoint, sink=sink, resume=True)
+    assert manifest.rows == 250 and manifest.pages == 5
+    assert sum(entry["rows"] for entry in manifest.files) == 250
+    assert {entry["path"] for entry in manifest.files} == set((tmp_path / "dataset").rglob("*.parquet"))
+
+def test_async_resume(server, tmp_path):
+    pytest.importorskip("aiohttp")
+    checkpoint = CheckpointStore(tmp_path / "checkpoint.db")
+
+    async def run(resume: bool):
+        async with AsyncShovelsAPI("key", server.base_url, retry=RetryPolicy(max_retries=0), page_size=None) as client:
+            return await client.search_permits(["CA", "TX"], PARAMS, checkpoint=checkpoint, resume=resume)
+    server.fail_when = crash_after(50)
+    with pytest.raises(IncompleteResultsError) as error:
+        asyncio.run(run(False))
+    assert len(error.value.result) == 300
+    server.fail_when = lambda path, query: None
+    server.requests.clear()
+    assert len(asyncio.run(run(True))) == 500
+    assert server.count() == 4
+
+def test_resume_requires_a_checkpoint(client):
+    with pytest.raises(AssertionError, match="resume requires a checkpoint"):
+        client.search_permits("CA", PARAMS, resume=True)
+
+def test_resume_reuses_the_default_date_range(server, no_retry_client, tmp_path, monkeypatch):
+    checkpoint = CheckpointStore(tmp_path / "checkpoint.db")
+    today = {"permit_from": "2025-01-01", "permit_to": "2025-12-31"}
+    monkeypatch.setattr(pyshovels.client, "default_date_range", lambda params, *keys: {**today, **params})
+    server.fail_when = crash_after(100)
+    with pytest.raises(IncompleteResultsError):
+        no_retry_client.search_permits("TX", checkpoint=checkpoint)
+
+    # resumed the next day: the default window has moved on by one day
+    today = {"permit_from": "2025-01-02", "permit_to": "2026-01-01"}
+    server.fail_when = lambda path, query: None
+    server.requests.clear()
+    df = no_retry_client.search_permits("TX", checkpoint=checkpoint, resume=True)
+    assert len(df) == 250 and df["id"].is_unique
+    assert [(query["permit_from"], query["cursor"]) for _, query in server.requests] == [
+        (["2025-01-01"], ["100"]), (["2025-01-01"], ["150"]), (["2025-01-01"], ["200"]),
+    ]
+
+def test_resume_without_a_matching_run_is_logged(server, client, tmp_path, caplog):
+    checkpoint = CheckpointStore(tmp_path / "checkpoint.db")
+    client.search_permits("CA", PARAMS, checkpoint=checkpoint)
+    with caplog.at_level(logging.WARNING):
+        df = client.search_permits("CA", {**PARAMS, "permit_to": "2025-06-30"}, checkpoint=checkpoint, resume=True)
+    assert len(df) == 126
+    assert "No checkpoint matches this call" in caplog.text
+
+def test_page_based_resume_keeps_the_page_size(server, tmp_path):
+    checkpoint = CheckpointStore(tmp_path / "checkpoint.db")
+    client = ShovelsAPI("key", server.base_url, retry=RetryPolicy(max_retries=0), page_size=AdaptivePageSize(max_size=20))
+    server.fail_when = lambda path, query: 500 if query.get("page") == ["2"] else None
+    with pytest.raises(IncompleteResultsError) as error:
+        client.get_residents("A1", page=1, checkpoint=checkpoint)
+    assert len(error.value.result) == 20
+    assert checkpoint.get(checkpoint.task_key(f"{server.base_url}/addresses/A1/residents"))["size"] == 20
+
+    # the shared page size backed off in the meantime
+    client.page_size.size = 10
+    server.fail_when = lambda path, query: None
+    server.requests.clear()
+    df = client.get_residents("A1", page=1, checkpoint=checkpoint, resume=True)
+    assert len(df) == 30 and df["id"].is_unique
+    assert [(query["page"], query["size"]) for _, query in server.requests] == [(["2"], ["20"])]
@@ -0,0 +1,112 @@
+"""Behavior shared by `ShovelsAPI` and `AsyncShovelsAPI`, checked on both clients."""
+import asyncio
+import time
+
+import pytest
+
+from pyshovels import AsyncShovelsAPI, Permit, ShovelsAPI, SyncStore
+
+from conftest import PARAMS
+
+@pytest.fixture(params=["sync", "async"])
+def call(request, server, fast_retry):
+    """Return a function calling a client method by name, on the sync or async client."""
+    def sync_call(method, *args, client_kwargs=None, **kwargs):
+        client = ShovelsAPI("key", server.base_url, retry=fast_retry, max_workers=4, page_size=None, **(client_kwargs or {}))
+        return getattr(client, method)(*args, **kwargs)
+
+    def async_call(method, *args, client_kwargs=None, **kwargs):
+        async def run():
+            async with AsyncShovelsAPI("key", server.base_url, retry=fast_retry, page_size=None, **(client_kwargs or {})) as client:
+                return await getattr(client, method)(*args, **kwargs)
+        return asyncio.run(run())
+
+    if request.param == "async":
+        pytest.importorskip("aiohttp")
+        return async_call
+    return sync_call
+
+def test_outputs(call):
+    assert call("search_permits", ["CA", "TX"], PARAMS).shape[0] == 500
+    records = call("search_permits", "CA", PARAMS, output="records")
+    assert isinstance(records[0], Permit) and records[0].address["state"] == "CA"
+    assert call("search_permits", "CA", PARAMS, output="list")[0]["id"] == "PCA00000"
+    pytest.importorskip("pyarrow")
+    assert call("search_permits", "CA", PARAMS, output="arrow").num_rows == 250
+
+def test_records_regroup_flattened_fields(call):
+    records = call("search_permits", "CA", PARAMS, output="records", client_kwargs={"flatten": True})
+    assert records[0].address == {"street": "Main", "city": "Springfield", "state": "CA", "zip_code": "90001"}
+    assert records[0].extra is None
+
+def test_dtypes_and_flatten(call):
+    df = call("search_permits", "CA", PARAMS, client_kwargs={"dtypes": True, "flatten": True})
+    assert str(df["file_date"].dtype).startswith("datetime64")
+    assert str(df["address_state"].dtype) == "category"
+
+def test_dedupe(call):
+    assert len(call("search_permits", ["CA", "TX", "CA"], PARAMS)) == 750
+    assert len(call("search_permits", ["CA", "TX", "CA"], PARAMS, dedupe=True)) == 500
+    merged = call("search_permits", ["CA", "CA"], PARAMS, dedupe="merge")
+    assert len(merged) == 250 and merged["query_geo_ids"].iloc[0] == ["CA"]
+
+def test_split_windows(call):
+    df = call("search_permits", ["CA", "TX"], PARAMS, split_windows="monthly")
+    assert len(df) == 500 and df["id"].is_unique
+    assert list(df["id"].str[1:3].unique()) == ["CA", "TX"]
+    df = call("search_permits", ["CA", "TX"], PARAMS, split_windows="equal")
+    assert len(df) == 500 and df["id"].is_unique
+    with pytest.raises(AssertionError):
+        call("search_permits", "CA", PARAMS, split_windows="adaptive")
+
+def test_split_windows_are_fetched_in_parallel_by_default(server, client):
+    # 12 monthly windows of a single page, on at least 4 threads with max_workers=1
+    server.delay = 0.1
+    start = time.perf_counter()
+    assert len(client.search_permits("CA", PARAMS, split_windows="monthly")) == 250
+    assert time.perf_counter() - start < 0.8
+
+def test_by_id_lookups_are_chunked_deduplicated_and_ordered(call, server):
+    ids = [f"X{i}" for i in range(120)] + ["X5"]
+    df = call("get_contractors_by_id", ids)
+    assert list(df["id"]) == ids[:-1]
+    assert server.count("/v2/contractors") == 3
+
+def test_sync_permits(call, tmp_path):
+    store = SyncStore(tmp_path / "sync.db")
+    first = call("sync_permits", store, ["CA", "TX"], PARAMS)
+    assert first.total == 500 and first.failed == []
+    assert first.watermarks == {"CA": "2025-12-15", "TX": "2025-12-15"}
+    second = call("sync_permits", store, ["CA", "TX"], PARAMS)
+    assert second.windows["CA"] == ("2025-12-08", "2025-12-31")
+    assert store.count() == 500
+
+def test_reference_lookups_return_copies(server, client):
+    tags = client.get_tags()
+    tags[0]["id"] = "changed"
+    tags.append({"id": "added"})
+    client.search_location("Miami", "cities")[0]["name"] = "changed"
+    assert client.get_tags() == [{"id": "solar"}]
+    assert client.search_location("Miami", "cities")[0]["name"] == "Miami"
+    assert server.count("/v2/list/tags") == 1
+
+def test_async_reference_lookups_return_copies(server, fast_retry):
+    pytest.importorskip("aiohttp")
+
+    async def run():
+        async with AsyncShovelsAPI("key", server.base_url, retry=fast_retry) as client:
+            (await client.get_tags())[0]["id"] = "changed"
+            (await client.search_location("Miami", "cities"))[0]["name"] = "changed"
+            return await client.get_tags(), await client.search_location("Miami", "cities")
+    tags, locations = asyncio.run(run())
+    assert tags == [{"id": "solar"}] and locations[0]["name"] == "Miami"
+    assert server.count("/v2/list/tags") == 1
+
+def test_iter_permits_streams_pages_as_they_arrive(server, client):
+    permits = client.iter_permits(["CA", "TX", "CA"], PARAMS, dedupe=True)
+    assert next(permits)["id"] == "PCA00000"
+    # only the first page is fetched until more items are requested
+    assert server.count("/v2/permits/search") == 1
+    rest = list(permits)
+    assert len(rest) == 499 and rest[-1]["id"] == "PTX00249"
+    assert server.count("/v2/permits/search") == 15
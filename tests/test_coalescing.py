@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pyshovels import AsyncShovelsAPI, AsyncSingleFlight, ShovelsAPI, SingleFlight
+
+def test_concurrent_identical_requests_share_one_call(server, fast_retry):
+    server.delay = 0.2
+    client = ShovelsAPI("key", server.base_url, retry=fast_retry, reference_cache=None, coalesce=True)
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: client.search_location("Austin", "cities"), range(8)))
+    assert all(result == results[0] for result in results)
+    assert server.count() == 1
+    assert client.pool_stats()["requests_coalesced"] == 7
+
+def test_different_requests_are_not_coalesced(server, fast_retry):
+    server.delay = 0.1
+    client = ShovelsAPI("key", server.base_url, retry=fast_retry, reference_cache=None, coalesce=True)
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(lambda q: client.search_location(q, "cities"), ["a", "b", "c", "d"]))
+    assert server.count() == 4
+
+def test_sequential_requests_are_not_coalesced(server, fast_retry):
+    client = ShovelsAPI("key", server.base_url, retry=fast_retry, reference_cache=None, coalesce=True)
+    client.search_location("Austin", "cities")
+    client.search_location("Austin", "cities")
+    assert server.count() == 2
+
+def test_coalescing_is_off_by_default(server, fast_retry):
+    server.delay = 0.1
+    client = ShovelsAPI("key", server.base_url, retry=fast_retry, reference_cache=None)
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(lambda _: client.search_location("Austin", "cities"), range(4)))
+    assert server.count() == 4
+
+def test_async_concurrent_identical_requests_share_one_call(server, fast_retry):
+    pytest.importorskip("aiohttp")
+    server.delay = 0.1
+
+    async def run():
+        async with AsyncShovelsAPI("key", server.base_url, retry=fast_retry, reference_cache=None, coalesce=True) as client:
+            results = await asyncio.gather(*(client.get_permits_by_contractor_id("C1", output="list") for _ in range(8)))
+            return results, client.pool_stats()
+    results, stats = asyncio.run(run())
+    assert all(len(result) == 30 for result in results)
+    assert server.count() == 1
+    assert stats["requests_coalesced"] == 7
+
+def test_single_flight_shares_exceptions():
+    flight = SingleFlight()
+    errors = []
+
+    def fail():
+        time.sleep(0.1)
+        raise ValueError("boom")
+
+    def call():
+        try:
+            flight.do("key", fail)
+        except ValueError as e:
+            errors.append(e)
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 4 and flight.coalesced == 3 and len(flight) == 0
+
+def test_async_single_flight_cancelled_leader_cancels_waiters():
+    async def run():
+        flight = AsyncSingleFlight()
+        leader = asyncio.create_task(flight.do("key", asyncio.sleep, 1))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(flight.do("key", asyncio.sleep, 1))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(leader, waiter, return_exceptions=True)
+        return results, len(flight)
+    results, in_flight = asyncio.run(run())
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert in_flight == 0
@@ -0,0 +1,24 @@
+from pyshovels import SCHEMAS, ColumnarBuilder, SeenIds
+
+def test_seen_ids_tell_types_apart():
+    seen = SeenIds()
+    items = [{"id": 1}, {"id": 1.0}, {"id": True}, {"id": "1"}, {"id": 1}, {"id": None}]
+    assert seen.filter(items) == items[:4] + items[5:]
+    assert seen.dropped == 1 and len(seen) == 4
+
+def test_seen_ids_merge_groups():
+    seen = SeenIds(merge_column="query_geo_ids")
+    page = [{"id": "P1"}, {"id": "P2"}]
+    first = seen.filter(page, "CA")
+    assert seen.filter([{"id": "P2"}, {"id": "P3"}], "TX") == [{"id": "P3", "query_geo_ids": ["TX"]}]
+    assert first[1]["query_geo_ids"] == ["CA", "TX"]
+    # the items of the page are left untouched
+    assert page == [{"id": "P1"}, {"id": "P2"}]
+
+def test_invalid_booleans_become_missing():
+    builder = ColumnarBuilder()
+    builder.extend([{"is_married": True}, {"is_married": "Y"}, {"is_married": None}, {"is_married": False}])
+    df = builder.to_frame(SCHEMAS["residents"])
+    assert str(df["is_married"].dtype) == "boolean"
+    assert df["is_married"].tolist()[::3] == [True, False]
+    assert df["is_married"].isna().tolist() == [False, True, True, False]
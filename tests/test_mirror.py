@@ -0,0 +1,35 @@
+import pytest
+
+from pyshovels import LocalMirror
+
+from conftest import PARAMS
+
+def test_mirror_tables_are_sinks_of_their_entity(server, client, tmp_path):
+    mirror = LocalMirror(tmp_path / "mirror.db")
+    manifest = client.search_permits(["CA"], PARAMS, sink=mirror.permits)
+    assert manifest.rows == 250 and mirror.permits.count() == 250
+    with pytest.raises(AssertionError, match="permits table of a LocalMirror cannot hold contractors"):
+        client.search_contractors(["CA"], PARAMS, sink=mirror.permits)
+
+def test_loading_items_again_updates_them_in_place(tmp_path):
+    mirror = LocalMirror(tmp_path / "mirror.db")
+    mirror.permits.write([{"id": "P1", "status": "active", "fees": 12.5}, {"id": "P2", "status": "active"}], {"geo_id": "CA"})
+    # loaded again by contractor, without the geo ID of the search
+    mirror.permits.write([{"id": "P1", "status": "final", "fees": 12.5}], {"contractor_id": "C1"})
+    assert mirror.permits.count() == 2
+    rows = mirror.query("SELECT id, geo_id, contractor_id, status, fees FROM permits ORDER BY id")
+    assert rows[0] == {"id": "P1", "geo_id": "CA", "contractor_id": "C1", "status": "final", "fees": 12.5}
+    assert rows[1]["status"] == "active" and rows[1]["contractor_id"] is None
+
+def test_query_joins_the_tables(server, client, tmp_path):
+    mirror = LocalMirror(tmp_path / "mirror.db")
+    client.search_permits(["CA", "TX"], PARAMS, sink=mirror.permits)
+    mirror.contractors.write([{"id": "C0", "name": "Acme"}, {"id": "C1", "name": "Bolt"}], {"geo_id": "CA"})
+    rows = mirror.query(
+        "SELECT c.name, COUNT(*) AS permits FROM permits p JOIN contractors c ON c.id = p.contractor_id "
+        "WHERE p.geo_id = :geo_id AND json_extract(p.item, '$.address.state') = :geo_id GROUP BY c.name ORDER BY c.name",
+        {"geo_id": "TX"},
+    )
+    # permit i goes to contractor C{i % 20}
+    assert rows == [{"name": "Acme", "permits": 13}, {"name": "Bolt", "permits": 13}]
+    assert mirror.query("DELETE FROM contractors") == []
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+
+import pytest
+
+from pyshovels import AdaptivePageSize, AsyncShovelsAPI, ShovelsAPI
+
+from conftest import PARAMS
+
+def sizes(server) -> list:
+    return [int(query["size"][0]) for _, query in server.requests if "size" in query]
+
+def test_adaptive_page_size_starts_at_the_maximum(server, fast_retry):
+    client = ShovelsAPI("key", server.base_url, retry=fast_retry)
+    df = client.search_permits("CA", PARAMS)
+    assert len(df) == 250 and df["id"].is_unique
+    assert sizes(server) == [100, 100, 100]
+
+def test_page_size_backs_off_on_slow_pages(server, fast_retry, caplog):
+    server.delay = 0.02
+    client = ShovelsAPI("key", server.base_url, retry=fast_retry, page_size=AdaptivePageSize(max_latency=0.01, min_size=20))
+    with caplog.at_level(logging.INFO, logger="pyshovels.client"):
+        df = client.search_permits("CA", PARAMS)
+    assert len(df) == 250 and df["id"].is_unique
+    assert sizes(server)[:4] == [100, 50, 25, 20]
+    assert client.page_size.stats() == {"size": 20, "backoffs": 3}
+    assert "Page size: 100 to 20 (min 20)" in caplog.text
+
+def test_page_size_backs_off_on_large_pages(server, fast_retry):
+    client = ShovelsAPI("key", server.base_url, retry=fast_retry, page_size=AdaptivePageSize(max_bytes=10_000))
+    assert len(client.search_permits("CA", PARAMS)) == 250
+    assert sizes(server)[0] == 100 and sizes(server)[1] < 100
+
+def test_page_size_recovers():
+    sizer = AdaptivePageSize(max_latency=1, recover_after=2)
+    sizer.update(2, 0)
+    assert sizer.size == 50
+    sizer.update(0.1, 0)
+    sizer.update(0.1, 0)
+    assert sizer.size == 62
+
+def test_page_based_chains_keep_their_size(server, fast_retry):
+    server.delay = 0.02
+    client = ShovelsAPI("key", server.base_url, retry=fast_retry, page_size=AdaptivePageSize(max_latency=0.01, max_size=20, min_size=10))
+    items = client.get_residents("A1", page=1, output="list")
+    assert len(items) == 30
+    assert sizes(server) == [20, 20]
+
+def test_fixed_and_server_default_page_sizes(server, client, fast_retry):
+    client.search_permits("CA", PARAMS)
+    assert sizes(server) == []
+    fixed = ShovelsAPI("key", server.base_url, retry=fast_retry, page_size=25)
+    assert len(fixed.search_permits("CA", PARAMS)) == 250
+    assert set(sizes(server)) == {25}
+
+def test_explicit_size_overrides_the_adaptive_size(server, fast_retry):
+    client = ShovelsAPI("key", server.base_url, retry=fast_retry)
+    client.search_permits("CA", PARAMS, size=10, max_iterations=2)
+    assert sizes(server) == [10, 10]
+
+def test_async_adaptive_page_size(server, fast_retry):
+    pytest.importorskip("aiohttp")
+    server.delay = 0.02
+
+    async def run():
+        async with AsyncShovelsAPI("key", server.base_url, retry=fast_retry, page_size=AdaptivePageSize(max_latency=0.01, min_size=20)) as client:
+            return await client.search_permits("CA", PARAMS), client.page_size.stats()
+    df, stats = asyncio.run(run())
+    assert len(df) == 250 and stats["size"] == 20
@@ -0,0 +1,38 @@
+import multiprocessing
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pyshovels import RateLimiter, ShovelsAPI
+
+from conftest import PARAMS
+
+def reserve_slots(limiter: RateLimiter, n: int) -> None:
+    for _ in range(n):
+        limiter.reserve()
+
+def test_clients_sharing_a_limiter_share_its_rate(server, fast_retry):
+    limiter = RateLimiter(rate=20)
+    clients = [ShovelsAPI("key", server.base_url, retry=fast_retry, rate_limit=limiter, page_size=None) for _ in range(2)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(2) as executor:
+        frames = list(executor.map(lambda client: client.search_permits("CA", PARAMS), clients))
+    # 10 requests at 20 per second in total, instead of 20 per second per client
+    assert time.perf_counter() - start >= 0.4
+    assert [len(df) for df in frames] == [250, 250]
+
+def test_header_pauses_hold_back_the_next_request(server, fast_retry):
+    limiter = RateLimiter()
+    client = ShovelsAPI("key", server.base_url, retry=fast_retry, rate_limit=limiter)
+    assert limiter.update_from_headers({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0.3"}) == 0.3
+    start = time.perf_counter()
+    client.get_tags()
+    assert time.perf_counter() - start >= 0.25
+
+def test_shared_limiter_is_shared_with_worker_processes():
+    limiter = RateLimiter(rate=10, shared=True)
+    process = multiprocessing.Process(target=reserve_slots, args=(limiter, 5))
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+    # the 5 slots reserved by the worker hold back the next request
+    assert limiter.reserve() > 0.2
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from pyshovels import AsyncShovelsAPI, IncompleteResultsError, RetryPolicy, ShovelsAPI
+
+from conftest import PARAMS
+
+def fail_first(n: int, status: int = 503):
+    """Return a `fail_when` failing the first `n` requests."""
+    state = {"left": n}
+
+    def fail_when(path, query):
+        if state["left"] > 0:
+            state["left"] -= 1
+            return status
+        return None
+    return fail_when
+
+def test_transient_failures_are_retried(server, client):
+    server.fail_when = fail_first(2)
+    df = client.search_permits("CA", PARAMS)
+    assert len(df) == 250
+    # 2 failed attempts, then the 5 pages of the chain
+    assert server.count() == 7
+
+def test_page_is_retried_mid_chain_without_restarting(server, client):
+    failed = set()
+
+    def fail_when(path, query):
+        cursor = query.get("cursor", [None])[0]
+        if cursor == "100" and cursor not in failed:
+            failed.add(cursor)
+            return 502
+        return None
+    server.fail_when = fail_when
+    df = client.search_permits("CA", PARAMS)
+    assert df["id"].is_unique and len(df) == 250
+    assert server.count() == 6
+
+def test_client_errors_are_not_retried(server, client):
+    server.fail_when = lambda path, query: 400
+    with pytest.raises(IncompleteResultsError) as error:
+        client.search_permits("CA", PARAMS)
+    assert len(error.value.result) == 0
+    assert server.count() == 1
+
+def test_retries_are_bounded(server, fast_retry):
+    server.fail_when = lambda path, query: 503
+    client = ShovelsAPI("key", server.base_url, retry=RetryPolicy(max_retries=2, backoff_factor=0.01), page_size=None)
+    with pytest.raises(IncompleteResultsError):
+        client.search_permits("CA", PARAMS)
+    assert server.count() == 3
+
+def test_async_client_retries(server, fast_retry):
+    pytest.importorskip("aiohttp")
+    server.fail_when = fail_first(2, 429)
+
+    async def run():
+        async with AsyncShovelsAPI("key", server.base_url, retry=fast_retry, page_size=None) as client:
+            return await client.search_permits("CA", PARAMS)
+    assert len(asyncio.run(run())) == 250
+    assert server.count() == 7
+
+def test_async_backoff_releases_the_concurrency_slot(server):
+    pytest.importorskip("aiohttp")
+    server.fail_when = lambda path, query: 503 if query.get("geo_id") == ["TX"] and len(server.requests) == 1 else None
+
+    async def run():
+        retry = RetryPolicy(max_retries=1, backoff_factor=0.5, jitter=False)
+        async with AsyncShovelsAPI("key", server.base_url, retry=retry, max_concurrency=1, page_size=None) as client:
+            # back off for 0.5s, instead of the 0s of the Retry-After header
+            client.rate_limiter.update_from_headers = lambda headers: None
+            return await client.search_permits(["TX", "CA"], PARAMS)
+    assert len(asyncio.run(run())) == 500
+    geo_ids = [query["geo_id"][0] for _, query in server.requests]
+    # CA is fetched while the first TX request waits to be retried
+    assert geo_ids[:7] == ["TX"] + ["CA"] * 5 + ["TX"]
+
+def test_exhausted_retries_raise_with_the_partial_results(server, client):
+    server.fail_when = lambda path, query: 503 if query.get("geo_id") == ["TX"] and query.get("cursor") == ["100"] else None
+    with pytest.raises(IncompleteResultsError) as error:
+        client.search_permits(["CA", "TX", "NY"], PARAMS)
+    # the other geo IDs are fetched in full, and TX up to the missing page
+    assert len(error.value.result) == 250 + 100 + 250
+    assert list(error.value.failed) == ["TX"]
+    assert error.value.failed["TX"]["cursor"] == "100"
+
+def test_streams_raise_once_the_other_ids_were_streamed(server, client):
+    server.fail_when = lambda path, query: 503 if query.get("geo_id") == ["CA"] and query.get("cursor") == ["50"] else None
+    items = []
+    with pytest.raises(IncompleteResultsError) as error:
+        for permit in client.iter_permits(["CA", "TX"], PARAMS):
+            items.append(permit)
+    assert len(items) == 50 + 250
+    assert list(error.value.failed) == ["CA"]
+
+def test_backoff_is_capped():
+    policy = RetryPolicy(backoff_factor=1, backoff_max=4, jitter=False)
+    assert [policy.backoff(attempt) for attempt in range(5)] == [1, 2, 4, 4, 4]
@@ -0,0 +1,50 @@
+import pytest
+
+from pyshovels import ParquetSink
+
+from conftest import PARAMS
+
+pa = pytest.importorskip("pyarrow")
+ds = pytest.importorskip("pyarrow.dataset")
+
+def read_dataset(root):
+    return ds.dataset(root, format="parquet", partitioning="hive").to_table()
+
+def test_files_share_one_schema(server, client, tmp_path):
+    # fees are null in every permit of the even months and set in the odd ones
+    sink = ParquetSink(tmp_path / "dataset")
+    manifest = client.search_permits(["CA", "TX"], PARAMS, sink=sink)
+    assert len(manifest.partitions) == 24
+    table = read_dataset(tmp_path / "dataset")
+    assert table.num_rows == 500
+    assert table.schema.field("fees").type == pa.float64()
+    assert table.schema.field("file_date").type == pa.timestamp("us")
+    assert table.schema.field("address").type == pa.string()
+    assert table["fees"].null_count == 250
+
+def test_partition_columns_are_not_stored(server, client, tmp_path):
+    sink = ParquetSink(tmp_path / "dataset", date_field=None)
+    client.get_permits_by_contractor_id(["C1", "C2"], sink=sink)
+    table = read_dataset(tmp_path / "dataset")
+    assert table.num_rows == 60
+    assert sorted(set(table["contractor_id"].to_pylist())) == ["C1", "C2"]
+
+def test_unknown_fields_go_to_extra(tmp_path):
+    sink = ParquetSink(tmp_path / "dataset", date_field=None, entity="permits")
+    sink.write([{"id": "P1", "fees": "n/a", "new_field": 1}, {"id": "P2", "fees": 3}], {"geo_id": "CA"})
+    table = read_dataset(tmp_path / "dataset")
+    assert table["fees"].to_pylist() == [None, 3.0]
+    assert table["extra"].to_pylist() == ['{"new_field": 1}', None]
+
+def test_sink_takes_the_entity_of_the_call(server, client, tmp_path):
+    sink = ParquetSink(tmp_path / "dataset")
+    manifest = client.search_contractors(["CA"], PARAMS, sink=sink)
+    # contractors are not partitioned by month
+    assert manifest.partitions == [{"geo_id": "CA"}]
+    table = read_dataset(tmp_path / "dataset")
+    assert table.num_rows == 250
+    assert table.schema.field("classification").type == pa.string()
+    assert table.schema.field("permit_count").type == pa.int64()
+    assert "file_date" in table["extra"][0].as_py()
+    with pytest.raises(AssertionError, match="holds contractors"):
+        client.search_permits(["CA"], PARAMS, sink=sink)